@@ -1,3 +1,4 @@
+from collections import deque
 import networkx as nx
 from networkx.classes.function import get_edge_attributes
 
@@ -29,6 +30,15 @@ class NegativeCycleException(Exception):
 
         super().__init__(f"Negative cycle composed of {self._cycle}")
 
+    @classmethod
+    def from_cycle(cls, cycle):
+        """
+        :param cycle: The nodes of a cycle already found, in the order of its edges
+        """
+        # Going around the cycle once is all build_cycle has to do
+        preds = {cycle[i]: cycle[i - 1] for i in range(len(cycle))}
+        return cls(cycle[-2] if len(cycle) > 1 else cycle[0], cycle[-1], preds)
+
     @property
     def cycle(self):
         return self._cycle
@@ -39,12 +49,13 @@ class NegativeCycleException(Exception):
         mod = len(cyc)
         return [(cyc[i], cyc[(i + 1) % mod]) for i in range(mod)]
 
-def bellman_ford(g, source):
+def bellman_ford(g, source, progress=None):
     """
     Computes all the shortest paths in a directed weighted graph with negative edge weights
     (but not negative cycles) between every node and some source node s.
     :param g: the graph to perform the algorithm on
     :param source: the source node to query in g
+    :param progress: optionally called with the fraction of relaxation passes done after each pass
     :return: None if a negative cycle exists. Otherwise returns a pair of dictionaries containing (1) the distances of each node from source (2) the predecessors of each node u in the shortest path from source to u.
     """
 
@@ -61,7 +72,7 @@ def bellman_ford(g, source):
 
     distance[source] = 0
 
-    for _ in range(n - 1):
+    for i in range(n - 1):
         for (u, v) in edges:
             w = edges[u, v]['weight']
             relax = distance[u] + w
@@ -71,6 +82,9 @@ def bellman_ford(g, source):
                 distance[v] = distance[u] + w
                 predecessor[v] = u
 
+        if progress is not None:
+            progress((i + 1) / (n - 1))
+
     # Detect negative cycle
     for (u, v) in edges:
         w = edges[u, v]['weight']
@@ -79,6 +93,117 @@ def bellman_ford(g, source):
 
     return distance, predecessor
 
+def bellman_ford_tarjan(g, source, progress=None):
+    """
+    Bellman-Ford with a FIFO queue and Tarjan's subtree disassembly. When the path to a node
+    gets shorter, the nodes below it in the shortest-path tree are taken out of the tree,
+    as the paths to them will get shorter too, and aren't scanned until they do. A negative
+    cycle shows up as a node getting a shorter path through one of its own descendants, so
+    it is found as soon as it forms instead of after n - 1 passes.
+    :param g: the graph to perform the algorithm on
+    :param source: the source node to query in g
+    :param progress: optionally called with the fraction of the n - 1 passes done after each pass
+    :return: The same pair of dictionaries as bellman_ford
+    :raises NegativeCycleException: If a negative cycle can be reached from source
+    """
+    # Nodes are numbered so everything is kept in lists instead of dictionaries
+    labels = list(g.nodes)
+    ids = {label: i for i, label in enumerate(labels)}
+    n = len(labels)
+
+    successors = [[] for _ in range(n)]
+    total = 0
+    for u, v, w in g.edges(data='weight'):
+        successors[ids[u]].append((ids[v], w))
+        total += abs(w)
+
+    inf = total + 1
+
+    distance = [inf * 2] * n
+    parent = [-1] * n
+
+    # The tree as a circular list of its nodes in preorder, starting at the source, and the
+    # depth of every node in it. Nodes outside of the tree have a depth of -1
+    following = [-1] * n
+    preceding = [-1] * n
+    depth = [-1] * n
+
+    s = ids[source]
+    distance[s] = 0
+    following[s] = preceding[s] = s
+    depth[s] = 0
+
+    queue = deque([s])
+    queued = [False] * n
+    queued[s] = True
+
+    # Scanning every node that was in the queue at the start of a pass finishes the pass
+    passes = 0
+    pass_left = 1
+
+    while len(queue) > 0:
+        u = queue.popleft()
+        queued[u] = False
+
+        if depth[u] >= 0:
+            du = distance[u]
+            for v, w in successors[u]:
+                relax = du + w
+                if relax >= distance[v]:
+                    continue
+
+                if depth[v] >= 0:
+                    if v == u:
+                        raise NegativeCycleException.from_cycle(_tree_cycle(u, v, parent, labels))
+
+                    # Take v's subtree out of the tree, the path to all of it just got shorter
+                    x = following[v]
+                    while depth[x] > depth[v]:
+                        if x == u:
+                            raise NegativeCycleException.from_cycle(_tree_cycle(u, v, parent, labels))
+
+                        depth[x] = -1
+                        x = following[x]
+
+                    following[preceding[v]] = x
+                    preceding[x] = preceding[v]
+
+                distance[v] = relax
+                parent[v] = u
+
+                # v goes right after u, as its child
+                depth[v] = depth[u] + 1
+                following[v] = following[u]
+                preceding[following[u]] = v
+                following[u] = v
+                preceding[v] = u
+
+                if not queued[v]:
+                    queued[v] = True
+                    queue.append(v)
+
+        pass_left -= 1
+        if pass_left == 0:
+            passes += 1
+            pass_left = len(queue)
+
+            if progress is not None and n > 1:
+                progress(min(passes / (n - 1), 1))
+
+    return ({labels[i]: distance[i] for i in range(n)},
+            {labels[i]: labels[parent[i]] if parent[i] >= 0 else None for i in range(n)})
+
+
+def _tree_cycle(u, v, parent, labels):
+    # u is v or below it in the tree, so following the parents up from u reaches v
+    cycle = [u]
+    while cycle[-1] != v:
+        cycle.append(parent[cycle[-1]])
+
+    cycle.reverse()
+    return tuple(labels[i] for i in cycle)
+
+
 if __name__ == '__main__':
     from random_graph import RandomGraphBuilder
     from visualize_runtime import measure_runtime, plot_results
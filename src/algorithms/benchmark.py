@@ -0,0 +1,376 @@
+"""
+Benchmark harness for the algorithms in this directory.
+
+Every algorithm is timed on a grid of graph sizes and edge densities. The graphs for a
+grid row are generated up front (in parallel) by RandomGraphBuilder.build_many, so
+generation time is recorded separately and never pollutes the algorithm timings.
+
+Example:
+    python src/algorithms/benchmark.py prims bellman_ford --sizes 10:1000:50 --densities 0.05,0.1 --output results.json
+
+Pass --save to also keep the run in the history that benchmark_history.py compares against.
+"""
+import argparse
+from dataclasses import dataclass, field
+import datetime
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import networkx as nx
+from typing import Any, Callable
+
+from bellman import bellman_ford
+from benchmark_history import ResultStore
+from girvan_newman import girvan_newman
+from max_clique import ramsey
+from prims import prims
+from random_graph import RandomGraphBuilder
+from shortest_paths import shortest_paths
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    algorithm: Callable[..., Any]
+    # Builds the graphs for a given edge density, the node count is set per graph
+    make_builder: Callable[[float], RandomGraphBuilder]
+    # The declared bound as a function of (num_nodes, num_edges), and how it is written on plots
+    complexity: Callable[[int, int], float]
+    complexity_label: str
+    default_sizes: range
+    # Extra positional arguments for the algorithm, chosen outside of the timed region
+    extra_args: Callable[[nx.Graph], tuple] = field(default=lambda g: ())
+    # Algorithms that modify their input get a fresh copy for every run
+    mutates: bool = False
+
+
+def _first_communities(g):
+    # girvan_newman is a generator, so nothing is computed until it is advanced
+    return next(girvan_newman(g))
+
+
+CASES = {
+    'prims': BenchmarkCase(
+        name='prims',
+        algorithm=prims,
+        make_builder=lambda p: RandomGraphBuilder().random_edges(p).connected().weighted(range(1, 100)),
+        complexity=lambda n, m: m * math.log(n),
+        complexity_label='$O(|E| \\log |V|)$',
+        default_sizes=range(10, 1000, 50),
+    ),
+    'bellman_ford': BenchmarkCase(
+        name='bellman_ford',
+        algorithm=bellman_ford,
+        # Non-negative weights so a random graph can never contain a negative cycle
+        make_builder=lambda p: RandomGraphBuilder().directed().random_edges(p).weighted(range(1, 100)),
+        complexity=lambda n, m: n * m,
+        complexity_label='$O(|V||E|)$',
+        default_sizes=range(10, 500, 50),
+        extra_args=lambda g: (min(g.nodes),),
+    ),
+    'shortest_paths': BenchmarkCase(
+        name='shortest_paths',
+        algorithm=shortest_paths,
+        # The same graphs as bellman_ford, which no weight below zero sends to Dijkstra's algorithm
+        make_builder=lambda p: RandomGraphBuilder().directed().random_edges(p).weighted(range(1, 100)),
+        complexity=lambda n, m: m * math.log(n),
+        complexity_label='$O(|E| \\log |V|)$',
+        default_sizes=range(10, 1000, 50),
+        extra_args=lambda g: (min(g.nodes),),
+    ),
+    'girvan_newman': BenchmarkCase(
+        name='girvan_newman',
+        algorithm=_first_communities,
+        make_builder=lambda p: RandomGraphBuilder().random_edges(p).connected(),
+        complexity=lambda n, m: n * m ** 2,
+        complexity_label='$O(|V||E|^2)$',
+        default_sizes=range(10, 150, 20),
+        mutates=True,
+    ),
+    'ramsey': BenchmarkCase(
+        name='ramsey',
+        algorithm=ramsey,
+        make_builder=lambda p: RandomGraphBuilder().random_edges(p),
+        complexity=lambda n, m: n * (n + m),
+        complexity_label='$O(|V|(|V| + |E|))$',
+        default_sizes=range(10, 1000, 50),
+    ),
+}
+
+
+def time_algorithm(case: BenchmarkCase, graph: nx.Graph, repeats: int = 5, warmup: int = 1) -> list[int]:
+    """
+    Time repeated runs of an algorithm on a single graph.
+    :param case: The algorithm to run
+    :param graph: The graph to run it on (copied before every run if the algorithm mutates its input)
+    :param repeats: The number of timed runs
+    :param warmup: The number of untimed runs made beforehand
+    :return: The duration of every timed run in nanoseconds
+    """
+    args = case.extra_args(graph)
+    samples = []
+
+    for i in range(warmup + repeats):
+        g = graph.copy() if case.mutates else graph
+
+        # Keep the garbage collector from firing in the middle of a measurement
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start_time = time.perf_counter_ns()
+            case.algorithm(g, *args)
+            elapsed = time.perf_counter_ns() - start_time
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        if i >= warmup:
+            samples.append(elapsed)
+
+    return samples
+
+
+def current_rss() -> int | None:
+    """
+    :return: The resident set size of this process in bytes, or None where it cannot be read
+    """
+    try:
+        # Linux exposes the current RSS (in pages) as the second field of statm
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # Elsewhere only the peak RSS is available, reported in kilobytes on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def profile_memory(case: BenchmarkCase, graph: nx.Graph) -> dict:
+    """
+    Run an algorithm once more with tracemalloc enabled. This is kept apart from the timed runs
+    since tracing every allocation slows Python down considerably.
+    :param case: The algorithm to run
+    :param graph: The graph to run it on
+    :return: A dictionary with the peak traced allocation and the RSS after the run
+    """
+    args = case.extra_args(graph)
+    g = graph.copy() if case.mutates else graph
+
+    gc.collect()
+    rss_before = current_rss()
+
+    tracemalloc.start()
+    try:
+        case.algorithm(g, *args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    rss_after = current_rss()
+
+    return {
+        'peak_alloc_bytes': peak,
+        'rss_bytes': rss_after,
+        'rss_delta_bytes': None if rss_after is None or rss_before is None else rss_after - rss_before,
+    }
+
+
+def graph_memory(compact) -> int:
+    """
+    :param compact: A CompactGraph
+    :return: The bytes allocated by the networkx representation of the graph
+    """
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        graph = compact.to_networkx()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del graph
+
+    return size
+
+
+def summarize(samples: list[int]) -> dict:
+    """
+    Reduce the timings of repeated runs to the statistics stored in the results.
+    :param samples: Durations in nanoseconds
+    :return: A dictionary of min, max, mean, median, quartiles and interquartile range
+    """
+    if len(samples) > 1:
+        q1, median, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    else:
+        q1 = median = q3 = samples[0]
+
+    return {
+        'min_ns': min(samples),
+        'max_ns': max(samples),
+        'mean_ns': statistics.fmean(samples),
+        'median_ns': median,
+        'q1_ns': q1,
+        'q3_ns': q3,
+        'iqr_ns': q3 - q1,
+    }
+
+
+def run_benchmark(case: BenchmarkCase, sizes=None, densities=(0.1,), repeats=5, warmup=1, workers=None, seed=None, memory=True) -> list[dict]:
+    """
+    Benchmark an algorithm over every combination of graph size and edge density.
+    :param case: The algorithm to benchmark
+    :param sizes: The numbers of nodes to test, defaults to the case's default_sizes
+    :param densities: The probabilities passed to random_edges
+    :param repeats: The number of timed runs per graph
+    :param warmup: The number of untimed runs per graph
+    :param workers: The number of processes used to generate the graphs
+    :param seed: Makes both the generated graphs and the algorithms' random choices reproducible
+    :param memory: Whether to also record allocations and RSS in an extra, untimed run
+    :return: One result dictionary per (size, density) pair
+    """
+    sizes = list(case.default_sizes if sizes is None else sizes)
+
+    rng = random.Random(seed)
+    results = []
+
+    for density in densities:
+        compact_graphs = case.make_builder(density).build_many(sizes, workers=workers, seed=rng.getrandbits(64))
+
+        for compact in compact_graphs:
+            start_time = time.perf_counter_ns()
+            graph = compact.to_networkx()
+            conversion_ns = time.perf_counter_ns() - start_time
+
+            # prims and ramsey pick random starting nodes
+            random.seed(rng.getrandbits(64))
+
+            samples = time_algorithm(case, graph, repeats, warmup)
+
+            result = {
+                'algorithm': case.name,
+                'nodes': graph.number_of_nodes(),
+                'edges': graph.number_of_edges(),
+                'density': density,
+                'generation_ns': compact.build_ns,
+                'conversion_ns': conversion_ns,
+                'samples_ns': samples,
+                **summarize(samples),
+            }
+
+            if memory:
+                graph_bytes = graph_memory(compact)
+
+                result.update(profile_memory(case, graph))
+                result['graph_bytes'] = graph_bytes
+                result['bytes_per_edge'] = graph_bytes / max(graph.number_of_edges(), 1)
+
+            results.append(result)
+
+    return results
+
+
+def make_document(results: list[dict], config: dict) -> dict:
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'networkx': nx.__version__,
+        'config': config,
+        'results': results,
+    }
+
+
+def write_results(path: str, document: dict):
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def _parse_sizes(text):
+    # Either start:stop:step like a range, or a comma separated list
+    if ':' in text:
+        return list(range(*map(int, text.split(':'))))
+
+    return [int(n) for n in text.split(',')]
+
+
+def _parse_densities(text):
+    return [float(p) for p in text.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the graph algorithms on random graphs.')
+    parser.add_argument('algorithms', nargs='*',
+                        help=f'Algorithms to benchmark out of {", ".join(CASES)} (default: all of them)')
+    parser.add_argument('--sizes', type=_parse_sizes,
+                        help='Node counts as start:stop:step or a comma separated list (default: per algorithm)')
+    parser.add_argument('--densities', type=_parse_densities, default=[0.1],
+                        help='Comma separated edge probabilities (default: 0.1)')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processes used to generate graphs (default: one per core)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='Skip the extra tracemalloc run that records memory usage')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--save', nargs='?', const='', metavar='NAME',
+                        help='Also store the run in the benchmark history, optionally under NAME')
+    args = parser.parse_args(argv)
+
+    names = args.algorithms or list(CASES)
+
+    unknown = [name for name in names if name not in CASES]
+    if len(unknown) > 0:
+        parser.error(f'unknown algorithms: {", ".join(unknown)}')
+
+    results = []
+    for name in names:
+        case = CASES[name]
+        case_results = run_benchmark(case, args.sizes, args.densities, args.repeats, args.warmup, args.workers, args.seed, args.memory)
+
+        for r in case_results:
+            print(f"{name:>14} V={r['nodes']:<6} E={r['edges']:<8} p={r['density']:<5} "
+                  f"median={r['median_ns'] / 1e6:10.3f}ms  iqr={r['iqr_ns'] / 1e6:8.3f}ms  "
+                  f"gen={r['generation_ns'] / 1e6:10.3f}ms", end='')
+
+            if args.memory:
+                print(f"  peak={r['peak_alloc_bytes'] / 2**20:8.2f}MiB  graph={r['bytes_per_edge']:7.1f}B/edge", end='')
+
+            print()
+
+        results.extend(case_results)
+
+    config = {
+        'algorithms': names,
+        'sizes': args.sizes,
+        'densities': args.densities,
+        'repeats': args.repeats,
+        'warmup': args.warmup,
+        'seed': args.seed,
+        'memory': args.memory,
+    }
+    document = make_document(results, config)
+    write_results(args.output, document)
+
+    print(f'Wrote {len(results)} results to {args.output}')
+
+    if args.save is not None:
+        name = ResultStore().save(document, args.save or None)
+        print(f'Saved the run to the benchmark history as {name}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
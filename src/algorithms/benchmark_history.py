@@ -0,0 +1,252 @@
+"""
+History of benchmark runs, and regression detection against a saved baseline.
+
+Runs are stored as the JSON documents written by benchmark.py, one file per run, under a
+local directory (.benchmarks by default). One of them can be marked as the baseline that
+later runs are compared against.
+
+Example:
+    python src/algorithms/benchmark.py --seed 0 --save before-change
+    python src/algorithms/benchmark_history.py baseline before-change
+    ...make a change...
+    python src/algorithms/benchmark.py --seed 0 --output after.json
+    python src/algorithms/benchmark_history.py compare after.json
+
+compare exits with status 1 when any algorithm got significantly slower.
+"""
+import argparse
+from dataclasses import dataclass
+import datetime
+import functools
+import json
+import math
+import os
+import sys
+
+
+DEFAULT_DIRECTORY = '.benchmarks'
+
+
+class ResultStore:
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self._directory = directory
+        self._runs = os.path.join(directory, 'runs')
+
+    def _path(self, name):
+        return os.path.join(self._runs, f'{name}.json')
+
+    def save(self, document: dict, name: str | None = None) -> str:
+        """
+        Add a run to the history.
+        :param document: A results document as written by benchmark.py
+        :param name: The name to store the run under, defaults to the current time
+        :return: The name the run was stored under
+        """
+        if name is None:
+            name = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+
+        os.makedirs(self._runs, exist_ok=True)
+
+        with open(self._path(name), 'w') as f:
+            json.dump(document, f, indent=2)
+
+        return name
+
+    def load(self, name: str) -> dict:
+        try:
+            with open(self._path(name)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f'No benchmark run named {name!r} in {self._directory}') from None
+
+    def names(self) -> list[str]:
+        if not os.path.isdir(self._runs):
+            return []
+
+        return sorted(f[:-len('.json')] for f in os.listdir(self._runs) if f.endswith('.json'))
+
+    def set_baseline(self, name: str):
+        # Make sure the run exists before pointing at it
+        self.load(name)
+
+        with open(os.path.join(self._directory, 'baseline'), 'w') as f:
+            f.write(name)
+
+    @property
+    def baseline_name(self) -> str | None:
+        try:
+            with open(os.path.join(self._directory, 'baseline')) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def load_baseline(self) -> dict:
+        name = self.baseline_name
+        if name is None:
+            raise KeyError(f'No baseline has been set in {self._directory}')
+
+        return self.load(name)
+
+
+@functools.cache
+def _u_counts(n1, n2):
+    # Number of orderings of n1 + n2 distinct samples giving each value of the
+    # Mann-Whitney U statistic, indexed by U
+    if n1 == 0 or n2 == 0:
+        return (1,)
+
+    # The largest sample either belongs to the first group and beats all n2 of the
+    # second, or it belongs to the second group and beats nothing of the first
+    with_first = _u_counts(n1 - 1, n2)
+    with_second = _u_counts(n1, n2 - 1)
+
+    counts = [0] * (n1 * n2 + 1)
+    for u, c in enumerate(with_first):
+        counts[u + n2] += c
+    for u, c in enumerate(with_second):
+        counts[u] += c
+
+    return tuple(counts)
+
+
+def mann_whitney_greater(xs, ys) -> float:
+    """
+    One-sided Mann-Whitney U test of whether the values in xs tend to be larger than those in ys.
+    The exact distribution is used for small samples without ties, otherwise the normal approximation.
+    :return: The p-value
+    """
+    n1, n2 = len(xs), len(ys)
+
+    # Rank every value, giving tied values the average of their ranks
+    ordered = sorted(xs + ys)
+    first_rank = {}
+    tie_sizes = {}
+    for i, v in enumerate(ordered):
+        first_rank.setdefault(v, i + 1)
+        tie_sizes[v] = tie_sizes.get(v, 0) + 1
+    rank = {v: first_rank[v] + (tie_sizes[v] - 1) / 2 for v in first_rank}
+
+    u = sum(rank[x] for x in xs) - n1 * (n1 + 1) / 2
+    has_ties = any(t > 1 for t in tie_sizes.values())
+
+    if not has_ties and n1 + n2 <= 30:
+        counts = _u_counts(n1, n2)
+        return sum(counts[math.ceil(u):]) / sum(counts)
+
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    tie_correction = sum(t ** 3 - t for t in tie_sizes.values()) / (n * (n - 1))
+    variance = n1 * n2 / 12 * ((n + 1) - tie_correction)
+    if variance == 0:
+        return 1.0
+
+    # Continuity corrected z-score
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass(frozen=True)
+class Comparison:
+    algorithm: str
+    nodes: int
+    density: float
+    baseline_median_ns: float
+    current_median_ns: float
+    p_value: float
+    regressed: bool
+
+    @property
+    def ratio(self):
+        return self.current_median_ns / self.baseline_median_ns
+
+
+def compare(baseline: dict, current: dict, alpha: float = 0.05, min_slowdown: float = 0.05) -> list[Comparison]:
+    """
+    Compare every (algorithm, size, density) measured in both runs.
+    A result counts as a regression when the current samples are significantly larger than the
+    baseline's and the median grew by more than min_slowdown, so tiny but consistent shifts are ignored.
+    :param baseline: The results document to compare against
+    :param current: The results document of the run being checked
+    :param alpha: The significance level of the Mann-Whitney test
+    :param min_slowdown: The relative increase of the median that is tolerated
+    :return: One Comparison per result present in both documents
+    """
+    key = lambda r: (r['algorithm'], r['nodes'], r['density'])
+
+    baseline_results = {key(r): r for r in baseline['results']}
+
+    comparisons = []
+    for r in current['results']:
+        old = baseline_results.get(key(r))
+        if old is None:
+            continue
+
+        p_value = mann_whitney_greater(r['samples_ns'], old['samples_ns'])
+        slower = r['median_ns'] > old['median_ns'] * (1 + min_slowdown)
+
+        comparisons.append(Comparison(*key(r),
+                                      baseline_median_ns=old['median_ns'],
+                                      current_median_ns=r['median_ns'],
+                                      p_value=p_value,
+                                      regressed=slower and p_value < alpha))
+
+    return comparisons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage saved benchmark runs and check for regressions.')
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY, help=f'Where runs are stored (default: {DEFAULT_DIRECTORY})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    save = commands.add_parser('save', help='Store a results file in the history')
+    save.add_argument('results')
+    save.add_argument('--name')
+
+    commands.add_parser('list', help='List the stored runs')
+
+    baseline = commands.add_parser('baseline', help='Mark a stored run as the baseline')
+    baseline.add_argument('name')
+
+    comp = commands.add_parser('compare', help='Compare a results file against the baseline')
+    comp.add_argument('results')
+    comp.add_argument('--baseline', help='Stored run to compare against (default: the marked baseline)')
+    comp.add_argument('--alpha', type=float, default=0.05)
+    comp.add_argument('--min-slowdown', type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+    store = ResultStore(args.directory)
+
+    match args.command:
+        case 'save':
+            with open(args.results) as f:
+                name = store.save(json.load(f), args.name)
+            print(f'Saved {args.results} as {name}')
+        case 'list':
+            for name in store.names():
+                print(f'{name} (baseline)' if name == store.baseline_name else name)
+        case 'baseline':
+            store.set_baseline(args.name)
+            print(f'Baseline is now {args.name}')
+        case 'compare':
+            with open(args.results) as f:
+                current = json.load(f)
+            base = store.load(args.baseline) if args.baseline else store.load_baseline()
+
+            comparisons = compare(base, current, args.alpha, args.min_slowdown)
+
+            for c in comparisons:
+                flag = 'SLOWER' if c.regressed else ''
+                print(f'{c.algorithm:>14} V={c.nodes:<6} p={c.density:<5} '
+                      f'{c.baseline_median_ns / 1e6:10.3f}ms -> {c.current_median_ns / 1e6:10.3f}ms '
+                      f'({c.ratio:5.2f}x, p-value {c.p_value:.4f}) {flag}')
+
+            regressions = [c for c in comparisons if c.regressed]
+            print(f'{len(regressions)} of {len(comparisons)} results regressed')
+
+            return 1 if len(regressions) > 0 else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""
+Minimum spanning forest kept up to date as edges are added and removed, instead of
+running Prim's algorithm again after every edit.
+
+The forest is held in a link-cut tree, in which every edge is a node of its own, so the
+heaviest edge on the path between two vertices is found in O(log n) amortized time.
+
+Adding an edge between two trees links them. Adding one within a tree swaps it for the
+heaviest edge on the cycle it closes, if that is heavier. Removing a tree edge splits its
+tree in two, and the lightest edge across is searched for from the smaller half, so the
+search costs the edges of the smaller half rather than those of the whole graph.
+"""
+from collections.abc import Hashable, Iterable, Iterator
+import networkx as nx
+
+
+class _Node:
+    """
+    A node of the link-cut tree's splay trees, standing for a vertex or an edge.
+    """
+    __slots__ = ('parent', 'left', 'right', 'flipped', 'weight', 'edge', 'heaviest')
+
+    def __init__(self, weight=float('-inf'), edge=None):
+        self.parent = None
+        self.left = None
+        self.right = None
+        # Whether the children of the subtree still have to be swapped
+        self.flipped = False
+
+        # Vertices weigh nothing, so the heaviest node on a path is always an edge
+        self.weight = weight
+        self.edge = edge
+        self.heaviest = self
+
+    def is_root(self) -> bool:
+        # The root of its splay tree, whose parent pointer is the path-parent if any
+        parent = self.parent
+        return parent is None or (parent.left is not self and parent.right is not self)
+
+    def push(self):
+        if self.flipped:
+            self.left, self.right = self.right, self.left
+            for child in (self.left, self.right):
+                if child is not None:
+                    child.flipped = not child.flipped
+            self.flipped = False
+
+    def update(self):
+        heaviest = self
+        for child in (self.left, self.right):
+            if child is not None and child.heaviest.weight > heaviest.weight:
+                heaviest = child.heaviest
+        self.heaviest = heaviest
+
+
+def _rotate(x):
+    parent = x.parent
+    grandparent = parent.parent
+
+    if parent.left is x:
+        parent.left = x.right
+        if x.right is not None:
+            x.right.parent = parent
+        x.right = parent
+    else:
+        parent.right = x.left
+        if x.left is not None:
+            x.left.parent = parent
+        x.left = parent
+
+    if not parent.is_root():
+        if grandparent.left is parent:
+            grandparent.left = x
+        else:
+            grandparent.right = x
+
+    x.parent = grandparent
+    parent.parent = x
+
+    parent.update()
+    x.update()
+
+
+def _splay(x):
+    # Push pending flips down from the top of the splay tree first
+    path = [x]
+    while not path[-1].is_root():
+        path.append(path[-1].parent)
+    for node in reversed(path):
+        node.push()
+
+    while not x.is_root():
+        parent = x.parent
+        if not parent.is_root():
+            grandparent = parent.parent
+            if (grandparent.left is parent) == (parent.left is x):
+                _rotate(parent)
+            else:
+                _rotate(x)
+        _rotate(x)
+
+
+def _access(x):
+    # Make the path from the root of x's tree to x preferred, with x at the root of its splay tree
+    last = None
+    node = x
+    while node is not None:
+        _splay(node)
+        node.right = last
+        node.update()
+        last = node
+        node = node.parent
+
+    _splay(x)
+
+
+def _make_root(x):
+    _access(x)
+    x.flipped = not x.flipped
+    x.push()
+
+
+def _find_root(x):
+    _access(x)
+
+    node = x
+    node.push()
+    while node.left is not None:
+        node = node.left
+        node.push()
+
+    _splay(node)
+    return node
+
+
+def _link(x, y):
+    _make_root(x)
+    x.parent = y
+
+
+def _cut(x, y):
+    # x and y have to be next to each other in their tree
+    _make_root(x)
+    _access(y)
+
+    y.left.parent = None
+    y.left = None
+    y.update()
+
+
+def _combine(first, second) -> tuple[list, list]:
+    # The tree edges added and removed by two changes, one after the other
+    added, removed = first
+    more_added, more_removed = second
+
+    undone = set(added) & set(more_removed)
+    redone = set(removed) & set(more_added)
+
+    return ([e for e in added if e not in undone] + [e for e in more_added if e not in redone],
+            [e for e in removed if e not in redone] + [e for e in more_removed if e not in undone])
+
+
+class DynamicMST:
+    """
+    Minimum spanning forest of an undirected graph, kept up to date as edges are added and
+    removed. Edges are identified by their endpoints, in either order, and a graph can hold
+    one edge between any two vertices.
+
+    add_edge and remove_edge return the tree edges the change added and removed, so a view
+    of the forest only has to be updated for those.
+    """
+    def __init__(self, graph: nx.Graph | nx.DiGraph | None = None, forest: Iterable[tuple] = ()):
+        """
+        :param graph: A graph to start from, taken as undirected. Edges without a weight weigh 1
+        :param forest: Edges of the graph already known to be in a minimum spanning forest, such
+            as a tree Prim's algorithm found for one of its components, which are taken first
+        """
+        # Every edge by the pair it was added as, and under both orders of its endpoints
+        self._keys = {}
+        self._weights = {}
+        self._adjacent = {}
+
+        # The edges of the forest, around every vertex
+        self._tree = {}
+
+        self._vertexNodes = {}
+        self._edgeNodes = {}
+
+        if graph is None:
+            return
+
+        for node in graph.nodes:
+            self.add_node(node)
+        for u, v, w in graph.edges(data='weight', default=1):
+            if (u, v) not in self._keys or w < self._weights[self._keys[(u, v)]]:
+                self._store(u, v, w)
+
+        # Kruskal's algorithm, with the given forest's edges ahead of the rest
+        forest = [self._keys[(u, v)] for u, v in forest]
+        given = set(forest)
+        rest = sorted((key for key in self._weights if key not in given), key=self._weights.get)
+
+        components = {node: node for node in self._adjacent}
+
+        def find(node):
+            while components[node] != node:
+                components[node] = components[components[node]]
+                node = components[node]
+            return node
+
+        for u, v in forest + rest:
+            root_u, root_v = find(u), find(v)
+            if root_u != root_v:
+                components[root_u] = root_v
+                self._link_edge((u, v))
+
+    def _store(self, u, v, weight):
+        key = self._keys.get((u, v), (u, v))
+        self._keys[(u, v)] = self._keys[(v, u)] = key
+        self._weights[key] = weight
+        self._adjacent[u][v] = weight
+        self._adjacent[v][u] = weight
+
+    def _link_edge(self, key):
+        u, v = key
+        node = _Node(self._weights[key], key)
+        self._edgeNodes[key] = node
+
+        _link(node, self._vertexNodes[u])
+        _link(node, self._vertexNodes[v])
+
+        self._tree[u].add(v)
+        self._tree[v].add(u)
+
+    def _cut_edge(self, key):
+        u, v = key
+        node = self._edgeNodes.pop(key)
+
+        _cut(node, self._vertexNodes[u])
+        _cut(node, self._vertexNodes[v])
+
+        self._tree[u].discard(v)
+        self._tree[v].discard(u)
+
+    def _connected(self, u, v) -> bool:
+        return _find_root(self._vertexNodes[u]) is _find_root(self._vertexNodes[v])
+
+    def _heaviest_on_path(self, u, v) -> tuple:
+        _make_root(self._vertexNodes[u])
+        _access(self._vertexNodes[v])
+        return self._vertexNodes[v].heaviest.edge
+
+    def _tree_vertices(self, start) -> Iterator:
+        seen = {start}
+        stack = [start]
+        while len(stack) > 0:
+            node = stack.pop()
+            yield node
+            for neighbor in self._tree[node]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+
+    def _smaller_side(self, u, v) -> set:
+        # Walk both trees in step, the first to run out is the smaller one
+        sides = (self._tree_vertices(u), self._tree_vertices(v))
+        seen = (set(), set())
+        while True:
+            for side, walk in zip(seen, sides):
+                node = next(walk, None)
+                if node is None:
+                    return side
+                side.add(node)
+
+    def add_node(self, node: Hashable):
+        if node not in self._adjacent:
+            self._adjacent[node] = {}
+            self._tree[node] = set()
+            self._vertexNodes[node] = _Node()
+
+    def remove_node(self, node: Hashable) -> tuple[list, list]:
+        """
+        Remove a vertex along with its edges.
+        :return: The tree edges added and removed
+        """
+        changes = [], []
+        for neighbor in list(self._adjacent.get(node, ())):
+            changes = _combine(changes, self.remove_edge(node, neighbor))
+
+        if node in self._adjacent:
+            del self._adjacent[node]
+            del self._tree[node]
+            del self._vertexNodes[node]
+
+        return changes
+
+    def add_edge(self, u: Hashable, v: Hashable, weight: float = 1) -> tuple[list, list]:
+        """
+        Add an edge, or change the weight of the one between u and v.
+        :return: The tree edges added and removed
+        """
+        key = self._keys.get((u, v))
+        if key is not None:
+            if self._weights[key] == weight:
+                return [], []
+
+            # Taking the edge out and putting it back handles both lighter and heavier weights
+            return _combine(self.remove_edge(*key), self.add_edge(*key, weight))
+
+        self.add_node(u)
+        self.add_node(v)
+        self._store(u, v, weight)
+
+        key = (u, v)
+        if u == v:
+            return [], []
+
+        if not self._connected(u, v):
+            self._link_edge(key)
+            return [key], []
+
+        heaviest = self._heaviest_on_path(u, v)
+        if self._weights[heaviest] <= weight:
+            return [], []
+
+        self._cut_edge(heaviest)
+        self._link_edge(key)
+        return [key], [heaviest]
+
+    def remove_edge(self, u: Hashable, v: Hashable) -> tuple[list, list]:
+        """
+        Remove the edge between u and v, if there is one.
+        :return: The tree edges added and removed
+        """
+        key = self._keys.get((u, v))
+        if key is None:
+            return [], []
+
+        del self._keys[(u, v)]
+        self._keys.pop((v, u), None)
+        del self._weights[key]
+        del self._adjacent[u][v]
+        self._adjacent[v].pop(u, None)
+
+        if key not in self._edgeNodes:
+            return [], []
+
+        self._cut_edge(key)
+
+        # The lightest edge leaving the smaller of the two trees joins them again
+        side = self._smaller_side(u, v)
+        best = None
+        for node in side:
+            for neighbor, weight in self._adjacent[node].items():
+                if neighbor not in side and (best is None or weight < best[0]):
+                    best = (weight, self._keys[(node, neighbor)])
+
+        if best is None:
+            return [], [key]
+
+        self._link_edge(best[1])
+        return [best[1]], [key]
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        """
+        :return: Whether the edge between u and v is in the forest
+        """
+        return self._keys.get((u, v)) in self._edgeNodes
+
+    def edges(self) -> list[tuple]:
+        """
+        :return: The edges of the forest, as the pairs they were added as
+        """
+        return list(self._edgeNodes)
+
+    @property
+    def weight(self) -> float:
+        return sum(self._weights[key] for key in self._edgeNodes)
+
+    def forest(self) -> nx.Graph:
+        """
+        :return: The minimum spanning forest as a networkx Graph
+        """
+        forest = nx.Graph()
+        forest.add_nodes_from(self._adjacent)
+        forest.add_weighted_edges_from((u, v, self._weights[(u, v)]) for u, v in self._edgeNodes)
+
+        return forest
@@ -0,0 +1,275 @@
+"""
+Shortest paths from one source, repaired when an edge is added, removed or re-weighted
+instead of running Bellman-Ford again.
+
+An edge that got lighter can only shorten paths through it, so distances are lowered
+from its head outwards, touching only the nodes that get closer. An edge of the
+shortest-path tree that got heavier or was removed can only lengthen the paths in the
+subtree below it, so only that subtree is worked out again, from the edges leading into
+it. Edges outside the tree getting heavier change nothing.
+
+A negative cycle can only form through the edge that got lighter, and is found when
+lowering distances comes back around to that edge's tail, or lowers a node more often
+than any shortest path has edges. Once there is a negative cycle, the next change marks
+the tree stale, to be worked out from scratch, since whether the cycle is gone is only
+known by starting over. The same goes for removing the source.
+"""
+from collections import deque
+from collections.abc import Hashable
+import networkx as nx
+
+# Imported next to bellman.py, as the tests do, or from the GUI with src as the root
+try:
+    from bellman import NegativeCycleException
+    from shortest_paths import shortest_paths
+except ImportError:
+    from algorithms.bellman import NegativeCycleException
+    from algorithms.shortest_paths import shortest_paths
+
+INF = float('inf')
+
+
+def _cycle_from(node, predecessor) -> tuple | None:
+    # Walk the predecessors back from node, looking for a node seen before
+    seen = {}
+    path = []
+    while node is not None and node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = predecessor.get(node)
+
+    if node is None:
+        return None
+
+    cycle = path[seen[node]:]
+    cycle.reverse()
+    return tuple(cycle)
+
+
+class DynamicSSSP:
+    """
+    Shortest paths from source in a directed weighted graph, which is told about every
+    change of the graph's edges through edge_changed. The graph isn't kept, it is passed
+    to every call, so one graph can be shared by the trees of several sources.
+    """
+    def __init__(self, graph: nx.DiGraph, source: Hashable, progress=None, smallest_weight=None):
+        """
+        :param graph: The graph, whose edges all have a weight
+        :param source: The node the paths start from
+        :param progress: Optionally called with the fraction of the work done
+        :param smallest_weight: The graph's smallest edge weight, if already known
+        """
+        self.source = source
+        # Whether the tree has to be worked out from scratch before it can be used again
+        self.stale = False
+
+        self.recompute(graph, progress, smallest_weight)
+
+    def recompute(self, graph: nx.DiGraph, progress=None, smallest_weight=None):
+        """
+        Work the tree out from scratch, with Dijkstra's algorithm if no weight is negative
+        and Bellman-Ford otherwise.
+        """
+        self.stale = False
+        self.cycle = None
+        self._distance = {}
+        self._predecessor = {}
+        self._children = {}
+
+        try:
+            distance, predecessor = shortest_paths(graph, self.source, progress, smallest_weight)
+        except NegativeCycleException as nce:
+            self.cycle = nce
+            return
+
+        # Only the source and the nodes with a predecessor were reached
+        for node, d in distance.items():
+            if node == self.source or predecessor[node] is not None:
+                self._distance[node] = d
+                self._setPredecessor(node, predecessor[node])
+
+    def _setPredecessor(self, node, parent):
+        old = self._predecessor.get(node)
+        if old is not None:
+            self._children[old].discard(node)
+
+        self._predecessor[node] = parent
+        if parent is not None:
+            self._children.setdefault(parent, set()).add(node)
+
+    def _drop(self, node):
+        self._setPredecessor(node, None)
+        del self._predecessor[node]
+        self._distance.pop(node, None)
+
+    def distance(self, node) -> float:
+        """
+        :return: The length of the shortest path to node, inf if there is none
+        """
+        return self._distance.get(node, INF)
+
+    def predecessor(self, node):
+        return self._predecessor.get(node)
+
+    def path(self, target: Hashable) -> list:
+        """
+        :return: The nodes on the shortest path from the source to target, empty if there is
+            none. Only the path's own nodes are looked at
+        :raises NegativeCycleException: If a negative cycle can be reached from the source
+        """
+        if self.stale:
+            raise ValueError('The tree has to be recomputed first')
+        if self.cycle is not None:
+            raise self.cycle
+
+        if target not in self._distance:
+            return []
+
+        path = [target]
+        while path[-1] != self.source:
+            path.append(self._predecessor[path[-1]])
+
+        path.reverse()
+        return path
+
+    def result(self, graph: nx.DiGraph):
+        """
+        :return: The distances and predecessors of every node of graph, like bellman_ford
+            returns them, with the same stand-in for the distance of unreachable nodes
+        :raises NegativeCycleException: If a negative cycle can be reached from the source
+        """
+        if self.stale:
+            raise ValueError('The tree has to be recomputed first')
+        if self.cycle is not None:
+            raise self.cycle
+
+        inf = sum(abs(w) for _, _, w in graph.edges(data='weight')) + 1
+
+        distance = {v: self._distance.get(v, inf * 2) for v in graph.nodes}
+        predecessor = {v: self._predecessor.get(v) for v in graph.nodes}
+        return distance, predecessor
+
+    def edge_changed(self, graph: nx.DiGraph, u: Hashable, v: Hashable, old_weight: float | None = None) -> bool:
+        """
+        Repair the tree after the edge from u to v was added, removed or re-weighted. The graph
+        has to have been changed already.
+        :param old_weight: The edge's weight before, None if it was just added
+        :return: Whether any distances or predecessors changed
+        """
+        if self.stale:
+            return False
+        if self.cycle is not None:
+            # Whether the cycle is still there is only known by starting over
+            self.stale = True
+            return True
+
+        weight = graph.edges[u, v]['weight'] if graph.has_edge(u, v) else None
+
+        if weight is not None and (old_weight is None or weight < old_weight):
+            return self._lowered(graph, u, v, weight)
+
+        # Only paths through the edge can get longer, of which the tree only holds one
+        if old_weight is not None and self._predecessor.get(v) == u:
+            return self._raised(graph, v)
+
+        return False
+
+    def node_removed(self, node: Hashable):
+        """
+        Forget a node, once all its edges have been reported as removed.
+        """
+        if node == self.source:
+            self.stale = True
+        elif node in self._predecessor or node in self._distance:
+            for child in list(self._children.get(node, ())):
+                self._setPredecessor(child, None)
+            self._children.pop(node, None)
+            self._drop(node)
+
+    def _lowered(self, graph, u, v, weight) -> bool:
+        if self.distance(u) + weight >= self.distance(v):
+            return False
+
+        # How often every node was lowered, which can't reach the number of nodes without a cycle
+        lowered = {}
+        limit = graph.number_of_nodes()
+
+        queue = deque()
+
+        def lower(x, y, d):
+            self._distance[y] = d
+            self._setPredecessor(y, x)
+
+            lowered[y] = lowered.get(y, 0) + 1
+            if y == u or y == self.source or lowered[y] >= limit:
+                # Come back around to where it started, there's a negative cycle
+                return False
+
+            queue.append(y)
+            return True
+
+        if not lower(u, v, self.distance(u) + weight):
+            return self._foundCycle(v)
+
+        while len(queue) > 0:
+            x = queue.popleft()
+            for y, data in graph.succ[x].items():
+                d = self._distance[x] + data['weight']
+                if d < self.distance(y) and not lower(x, y, d):
+                    return self._foundCycle(y)
+
+        return True
+
+    def _foundCycle(self, node) -> bool:
+        cycle = _cycle_from(node, self._predecessor)
+        if cycle is None:
+            self.stale = True
+        else:
+            self.cycle = NegativeCycleException.from_cycle(cycle)
+
+        return True
+
+    def _raised(self, graph, v) -> bool:
+        # Everything below v in the tree may now be further away
+        subtree = [v]
+        for node in subtree:
+            subtree.extend(self._children.get(node, ()))
+
+        inside = set(subtree)
+        for node in subtree:
+            self._distance.pop(node, None)
+            self._setPredecessor(node, None)
+
+        # Start from the best way in from outside the subtree
+        queue = deque()
+        for y in subtree:
+            for x, data in graph.pred[y].items():
+                if x not in inside and x in self._distance:
+                    d = self._distance[x] + data['weight']
+                    if d < self.distance(y):
+                        self._distance[y] = d
+                        self._setPredecessor(y, x)
+
+            if y in self._distance:
+                queue.append(y)
+
+        # and settle the rest of the subtree, whose nodes are the only ones that can get closer
+        queued = set(queue)
+        while len(queue) > 0:
+            x = queue.popleft()
+            queued.discard(x)
+            for y, data in graph.succ[x].items():
+                if y in inside:
+                    d = self._distance[x] + data['weight']
+                    if d < self.distance(y):
+                        self._distance[y] = d
+                        self._setPredecessor(y, x)
+                        if y not in queued:
+                            queued.add(y)
+                            queue.append(y)
+
+        for node in subtree:
+            if node not in self._distance:
+                del self._predecessor[node]
+
+        return True
@@ -0,0 +1,240 @@
+"""
+Force-directed graph layout (Fruchterman-Reingold) with Barnes-Hut style approximation
+of the repulsive forces, written with NumPy so it can lay out tens of thousands of nodes.
+
+The quadtree is implicit: every level is a uniform grid twice as fine as the one above,
+and the mass and center of mass of its cells are found with np.bincount. A node feels a
+cell of a level as a single body when the cell is not next to the node's own cell, but
+its parent was next to the node's parent (so it wasn't already counted a level up). At
+the finest level, nodes in neighboring cells repel each other directly.
+"""
+from collections.abc import Iterator
+import math
+import numpy as np
+
+
+DEFAULT_ITERATIONS = 100
+# Pull towards the centroid that keeps disconnected components from drifting apart
+GRAVITY = 0.3
+# The finest level holds about this many nodes per cell on average
+LEAF_SIZE = 4
+MAX_DEPTH = 10
+# Distances are never taken as smaller than this, to keep coincident nodes from blowing up
+MIN_DISTANCE = 1e-3
+
+
+def grid_layout(num_nodes: int, spacing: float = 1.0) -> np.ndarray:
+    """
+    Place nodes row by row on a square grid, a cheap starting point with no two nodes on top of each other.
+    :return: An (num_nodes, 2) array of positions
+    """
+    columns = max(1, math.ceil(math.sqrt(num_nodes)))
+    index = np.arange(num_nodes)
+
+    return np.stack([index % columns, index // columns], axis=1).astype(float) * spacing
+
+
+def _interaction_offsets():
+    # The children of the cells around a node's parent form a 6x6 block starting two cells
+    # before the parent's first child. Those not next to the node's own cell are its
+    # interaction list, as offsets from the node's cell for each of the four children
+    offsets = []
+    for px in (0, 1):
+        for py in (0, 1):
+            offsets.append([(dx - 2 - px, dy - 2 - py) for dx in range(6) for dy in range(6)
+                            if max(abs(dx - 2 - px), abs(dy - 2 - py)) > 1])
+
+    return np.array(offsets)
+
+
+_INTERACTION_OFFSETS = _interaction_offsets()
+
+
+def _cells(positions, origin, size, level):
+    cells = 1 << level
+    ij = np.floor((positions - origin) / size * cells).astype(np.int64)
+    np.clip(ij, 0, cells - 1, out=ij)
+
+    return ij, ij[:, 0] * cells + ij[:, 1]
+
+
+def _add_repulsion(forces, nodes, deltas, strength):
+    # strength is k^2 times the mass pushing, the force is k^2 m / d along the unit vector
+    d2 = np.maximum((deltas ** 2).sum(axis=1), MIN_DISTANCE ** 2)
+    scale = strength / d2
+
+    forces[:, 0] += np.bincount(nodes, weights=deltas[:, 0] * scale, minlength=len(forces))
+    forces[:, 1] += np.bincount(nodes, weights=deltas[:, 1] * scale, minlength=len(forces))
+
+
+def repulsive_forces(positions: np.ndarray, k: float = 1.0) -> np.ndarray:
+    """
+    Approximate the Fruchterman-Reingold repulsion every node feels from all the others.
+    :param positions: An (n, 2) array of positions
+    :param k: The ideal edge length
+    :return: An (n, 2) array of forces
+    """
+    n = len(positions)
+    forces = np.zeros((n, 2))
+    if n < 2:
+        return forces
+
+    origin = positions.min(axis=0)
+    # Slightly larger than the extent so the largest coordinates fall inside the last cell
+    size = max(float((positions.max(axis=0) - origin).max()), MIN_DISTANCE) * (1 + 1e-9)
+
+    # Start at the depth a uniform spread would need, and go deeper while the nodes are
+    # clustered enough to leave the direct pairs at the finest level doing most of the work
+    depth = min(max(2, math.ceil(math.log(max(n / LEAF_SIZE, 1), 4))), MAX_DEPTH)
+    while depth < MAX_DEPTH:
+        _, flat = _cells(positions, origin, size, depth)
+        count = np.bincount(flat)
+        if (count * count).sum() <= 2 * LEAF_SIZE * n:
+            break
+        depth += 1
+
+    k2 = k * k
+
+    for level in range(2, depth + 1):
+        cells = 1 << level
+        ij, flat = _cells(positions, origin, size, level)
+
+        # Padded by two empty cells on every side, so the interaction lists never need bounds checks
+        padded = cells + 4
+        grid = np.zeros((3, padded, padded))
+        for i, weights in enumerate((None, positions[:, 0], positions[:, 1])):
+            grid[i, 2:-2, 2:-2] = np.bincount(flat, weights=weights, minlength=cells * cells).reshape(cells, cells)
+
+        # Flattened, with each cell's center of mass in place of the sums
+        mass = grid[0].ravel()
+        center_x = grid[1].ravel() / np.maximum(mass, 1)
+        center_y = grid[2].ravel() / np.maximum(mass, 1)
+
+        # Which cells are in a node's interaction list only depends on which child of its parent it is
+        parity = (ij[:, 0] % 2) * 2 + ij[:, 1] % 2
+        own = (ij[:, 0] + 2) * padded + ij[:, 1] + 2
+        for p, offsets in enumerate(_INTERACTION_OFFSETS):
+            nodes = np.flatnonzero(parity == p)
+            if len(nodes) == 0:
+                continue
+
+            c = own[nodes, None] + (offsets[:, 0] * padded + offsets[:, 1])
+            dx = positions[nodes, 0, None] - center_x[c]
+            dy = positions[nodes, 1, None] - center_y[c]
+
+            # Empty cells have no mass, so they push with no force
+            scale = k2 * mass[c] / np.maximum(dx * dx + dy * dy, MIN_DISTANCE ** 2)
+            forces[nodes, 0] += (dx * scale).sum(axis=1)
+            forces[nodes, 1] += (dy * scale).sum(axis=1)
+
+    # Nodes in the same or neighboring cells of the finest level repel each other directly
+    cells = 1 << depth
+    ij, flat = _cells(positions, origin, size, depth)
+
+    order = np.argsort(flat, kind='stable')
+    count = np.bincount(flat, minlength=cells * cells)
+    start = np.cumsum(count) - count
+
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            c = ij + (ox, oy)
+            inside = (c >= 0).all(axis=1) & (c < cells).all(axis=1)
+
+            nodes = np.flatnonzero(inside)
+            cell = c[nodes, 0] * cells + c[nodes, 1]
+            partners = count[cell]
+
+            # Pair every node with each node of the neighboring cell
+            total = int(partners.sum())
+            if total == 0:
+                continue
+            pair_nodes = np.repeat(nodes, partners)
+            within = np.arange(total) - np.repeat(np.cumsum(partners) - partners, partners)
+            pair_others = order[np.repeat(start[cell], partners) + within]
+
+            distinct = pair_nodes != pair_others
+            pair_nodes, pair_others = pair_nodes[distinct], pair_others[distinct]
+
+            _add_repulsion(forces, pair_nodes, positions[pair_nodes] - positions[pair_others], k2)
+
+    return forces
+
+
+def attractive_forces(positions: np.ndarray, edges: np.ndarray, k: float = 1.0) -> np.ndarray:
+    """
+    :param positions: An (n, 2) array of positions
+    :param edges: An (m, 2) array of node indices
+    :param k: The ideal edge length
+    :return: The (n, 2) array of forces pulling the endpoints of every edge together
+    """
+    forces = np.zeros((len(positions), 2))
+    if len(edges) == 0:
+        return forces
+
+    u, v = edges[:, 0], edges[:, 1]
+    deltas = positions[v] - positions[u]
+    # d^2 / k along the unit vector
+    pull = deltas * (np.sqrt((deltas ** 2).sum(axis=1)) / k)[:, None]
+
+    for axis in (0, 1):
+        forces[:, axis] += np.bincount(u, weights=pull[:, axis], minlength=len(positions))
+        forces[:, axis] -= np.bincount(v, weights=pull[:, axis], minlength=len(positions))
+
+    return forces
+
+
+def force_layout_steps(num_nodes: int, edges, positions=None, iterations: int = DEFAULT_ITERATIONS,
+                       k: float = 1.0, seed: int = 0) -> Iterator[np.ndarray]:
+    """
+    Run the layout one iteration at a time.
+    :param num_nodes: The number of nodes, which are numbered 0 to num_nodes - 1
+    :param edges: Pairs of node indices, as an (m, 2) array or a list of pairs
+    :param positions: Where to start, defaults to grid_layout
+    :param iterations: The number of iterations, over which the step size cools down to nothing
+    :param k: The ideal edge length
+    :param seed: Seeds the jitter that separates nodes starting at the same position
+    :return: A generator yielding the positions after every iteration. The same array is
+        updated in place, so copy it to keep an intermediate layout
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+
+    if positions is None:
+        positions = grid_layout(num_nodes, k)
+    else:
+        positions = np.array(positions, dtype=float).reshape(num_nodes, 2)
+
+    if num_nodes == 0:
+        return
+
+    # Coincident nodes would exert no force on each other and stay stuck together
+    positions += np.random.default_rng(seed).uniform(-k, k, positions.shape) * 1e-3
+
+    temperature = max(math.sqrt(num_nodes) * k / 10, k)
+
+    for i in range(iterations):
+        forces = repulsive_forces(positions, k) + attractive_forces(positions, edges, k)
+        forces -= GRAVITY * (positions - positions.mean(axis=0))
+
+        # Move along the force, but never further than the current temperature
+        step = temperature * (1 - i / iterations)
+        length = np.maximum(np.sqrt((forces ** 2).sum(axis=1)), MIN_DISTANCE)
+        positions += forces * (np.minimum(length, step) / length)[:, None]
+
+        yield positions
+
+
+def force_layout(num_nodes: int, edges, positions=None, iterations: int = DEFAULT_ITERATIONS,
+                 k: float = 1.0, seed: int = 0, progress=None) -> np.ndarray:
+    """
+    Lay out a graph with the force-directed algorithm, see force_layout_steps for the parameters.
+    :param progress: Called with the fraction of iterations done after every iteration
+    :return: An (num_nodes, 2) array of positions
+    """
+    result = np.zeros((num_nodes, 2)) if positions is None else np.array(positions, dtype=float)
+
+    for i, result in enumerate(force_layout_steps(num_nodes, edges, positions, iterations, k, seed)):
+        if progress is not None:
+            progress((i + 1) / iterations)
+
+    return result
@@ -1,18 +1,21 @@
 import networkx as nx
+from typing import Callable, Optional
 
 
-def girvan_newman(G: nx.Graph | nx.DiGraph, return_extra_info: bool = False):
+def girvan_newman(G: nx.Graph | nx.DiGraph, return_extra_info: bool = False, progress: Optional[Callable[[Optional[float]], None]] = None):
     """
     Implementation of the Girvan-Newman algorithm for detecting communities in a graph
     by iteratively removing edges from the original graph. 
     :param G: The input networkx Graph or DiGraph object
+    :param progress: Optionally called with None after every source node of every betweenness pass,
+        since the number of passes is not known up front
     :return: A tuple of communities in the graph
     """
     components = list(nx.connected_components(G))
     btwnss = {}
     while len(components) == 1:
         # Get the dictionary of edges to betweenness values using networkx
-        btwnss = betweenness(G)
+        btwnss = betweenness(G, progress=None if progress is None else lambda _: progress(None))
         # Store the highest betweenness value 
         max_btwnss = max(btwnss.values())
 
@@ -34,11 +37,12 @@ from collections import deque
 from typing import Mapping
 
 
-def betweenness(G: nx.Graph | nx.DiGraph) -> Mapping:
+def betweenness(G: nx.Graph | nx.DiGraph, progress: Optional[Callable[[float], None]] = None) -> Mapping:
     """
     Implementation of the edge betweenness calculation for all edges in the graph
       as given by Ulrik Brandes (2008)
     :param G: The input networkx Graph or DiGraph object
+    :param progress: Optionally called with the fraction of source nodes processed after each one
     :return: A dictionary of edges to betweenness values
     """
     # G = (V, E)
@@ -47,7 +51,7 @@ def betweenness(G: nx.Graph | nx.DiGraph) -> Mapping:
 
     c_B = {e: 0.0 for e in E}     # Output dictionary accumulator
 
-    for s in V:
+    for i, s in enumerate(V):
     # single-source shortest-paths problem
         # intialization
 
@@ -96,6 +100,9 @@ def betweenness(G: nx.Graph | nx.DiGraph) -> Mapping:
             # if w != s:
             #     c_B[w] += delta[w]
 
+        if progress is not None:
+            progress((i + 1) / len(V))
+
     # -----------
     # End Brandes
     # -----------
@@ -1,9 +1,10 @@
 import networkx as nx
 import random
 
-def ramsey(g: nx.Graph):
+def ramsey(g: nx.Graph, progress=None):
     """
     Respectively approximates the largest clique and independent set in a graph.
+    If given, progress is called with None every time a pivot is chosen.
     """
 
     # base case, return empty clique and independent set
@@ -13,6 +14,9 @@ def ramsey(g: nx.Graph):
     # choose random node as pivot
     v = random.choice(sorted(g.nodes))
 
+    if progress is not None:
+        progress(None)
+
     node_set = set(g.nodes)
 
     # determine the neighbors and non-neighbors of v in g
@@ -24,14 +28,14 @@ def ramsey(g: nx.Graph):
     neighbor_graph.remove_node(v)
     neighbor_graph.remove_nodes_from(non_neighbors)
 
-    c1, i1 = ramsey(neighbor_graph)
+    c1, i1 = ramsey(neighbor_graph, progress)
 
     # recurse on the subgraph induced on the non-neighbors of v
     non_neighbor_graph = g.copy()
     non_neighbor_graph.remove_node(v)
     non_neighbor_graph.remove_nodes_from(neighbors)
 
-    c2, i2 = ramsey(non_neighbor_graph)
+    c2, i2 = ramsey(non_neighbor_graph, progress)
 
     # since c1 is a clique of neighbors of v, {v} | c1 is still
     # a clique. And likewise, since i2 is an independent set of
@@ -1,12 +1,14 @@
 import random
 import networkx as nx
 import heapq
+from typing import Callable, Optional
 
 
-def prims(graph: nx.Graph | nx.DiGraph) -> nx.Graph | nx.DiGraph:
+def prims(graph: nx.Graph | nx.DiGraph, progress: Optional[Callable[[float], None]] = None) -> nx.Graph | nx.DiGraph:
     """
     Implementation of Prim's algorithm for finding the minimum spanning tree of a graph
     :param graph: The input networkx Graph or DiGraph object
+    :param progress: Optionally called with the fraction of nodes added to the tree so far
     :return: The minimum spanning tree of the input graph
     """
     start = list(graph.nodes)[random.randint(0, len(graph.nodes) - 1)]  # Randomly select a starting node from the graph
@@ -27,6 +29,9 @@ def prims(graph: nx.Graph | nx.DiGraph) -> nx.Graph | nx.DiGraph:
             mst.add_node(edge[1][1])
             mst.add_edge(*edge[1], weight=edge[0])
 
+            if progress is not None:
+                progress(len(mst) / len(graph))
+
             for origin, link, data in graph.edges(edge[1][1], data=True):
                 if link not in mst.nodes:
                     weight = data['weight']
@@ -1,7 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 import functools
 import itertools
+import math
 import networkx as nx
+import numpy as np
 import random
+import time
 
 
 def _edge_gen(nodes, directed):
@@ -9,6 +14,46 @@ def _edge_gen(nodes, directed):
 
     return f(nodes, 2)
 
+def _sample_edges(nodes, directed, p):
+    # Yields every pair _edge_gen would, each independently with probability p, in the same order.
+    # Jumps straight between picked pairs with geometrically distributed gaps, so the cost grows
+    # with the number of pairs picked rather than with all |V|^2 of them
+    if p >= 1:
+        yield from _edge_gen(nodes, directed)
+        return
+
+    nodes = list(nodes)
+    n = len(nodes)
+    if p <= 0 or n < 2:
+        return
+
+    log_q = math.log1p(-p)
+    num_pairs = n * (n - 1) if directed else n * (n - 1) // 2
+
+    # The pairs are numbered in _edge_gen's order, a row of pairs per first node
+    row, row_start = 0, 0
+    row_length = n - 1
+    index = -1
+    while True:
+        # Kept as a float until it's known to be in range, it can be huge for a tiny p
+        gap = math.log(1 - random.random()) / log_q
+        if index + 1 + gap >= num_pairs:
+            return
+        index += 1 + int(gap)
+
+        while index >= row_start + row_length:
+            row_start += row_length
+            row += 1
+            if not directed:
+                row_length -= 1
+
+        offset = index - row_start
+        if directed:
+            # permutations skips the node itself
+            yield nodes[row], nodes[offset if offset < row else offset + 1]
+        else:
+            yield nodes[row], nodes[row + 1 + offset]
+
 def _scour(g, node):
     visited = set()
 
@@ -50,10 +95,101 @@ class transform:
             return self.f
 
         def newfunc(inst, *args, **kwargs):
-            return inst._next(lambda g: self.f(g, *args, **kwargs))
+            return inst._next(_Step(self.f, args, kwargs))
         return functools.partial(newfunc, obj)
 
 
+class _Step:
+    # Stands in for `lambda g: f(g, *args, **kwargs)` so that builders stay
+    # picklable and can be shipped to worker processes by build_many
+    def __init__(self, f, args, kwargs):
+        self.f = f
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, g):
+        return self.f(g, *self.args, **self.kwargs)
+
+
+@dataclass(frozen=True)
+class CompactGraph:
+    """
+    Flat array form of a generated graph, which is much cheaper to pickle between
+    processes than a networkx dict-of-dicts.
+    """
+    directed: bool
+    nodes: np.ndarray
+    edges: np.ndarray
+    weights: np.ndarray | None
+    build_ns: int = 0  # Time the builder spent generating the graph
+    # Which edges have a weight, None if all of them do. The others hold 0 in weights
+    weighted: np.ndarray | None = None
+
+    @classmethod
+    def from_networkx(cls, g, build_ns=0):
+        nodes = np.fromiter(g.nodes, dtype=np.int64, count=g.number_of_nodes())
+        edges = np.array(list(g.edges), dtype=np.int64).reshape(-1, 2)
+
+        weights = [w for _, _, w in g.edges(data='weight')]
+        weighted = np.array([w is not None for w in weights], dtype=bool)
+
+        # Building a graph can mix weighted and unweighted edges, such as a negative cycle
+        # added to unweighted random edges
+        if not weighted.any():
+            weights = weighted = None
+        elif weighted.all():
+            weights = np.array(weights)
+            weighted = None
+        else:
+            weights = np.array([0 if w is None else w for w in weights])
+
+        return cls(g.is_directed(), nodes, edges, weights, build_ns, weighted)
+
+    @property
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def number_of_edges(self):
+        return len(self.edges)
+
+    def edge_weights(self) -> list:
+        """
+        :return: The weight of every edge, None for those without one
+        """
+        if self.weights is None:
+            return [None] * self.number_of_edges
+
+        weights = self.weights.tolist()
+        if self.weighted is not None:
+            weights = [w if has_weight else None for w, has_weight in zip(weights, self.weighted.tolist())]
+
+        return weights
+
+    def to_networkx(self):
+        g = nx.DiGraph() if self.directed else nx.Graph()
+
+        g.add_nodes_from(self.nodes.tolist())
+
+        for (u, v), w in zip(self.edges.tolist(), self.edge_weights()):
+            if w is None:
+                g.add_edge(u, v)
+            else:
+                g.add_edge(u, v, weight=w)
+
+        return g
+
+
+def _build_task(builder, num_nodes, seed):
+    random.seed(seed)
+
+    start_time = time.perf_counter_ns()
+    g = builder.nodes(num_nodes).build()
+    build_ns = time.perf_counter_ns() - start_time
+
+    return CompactGraph.from_networkx(g, build_ns)
+
+
 class RandomGraphBuilder:
     def __init__(self, directed=False):
         self._init = nx.DiGraph if directed else nx.Graph
@@ -89,11 +225,13 @@ class RandomGraphBuilder:
 
     @transform
     def random_edges(g, p, backwards_edges=True):
-        edges_left = (e for e in _edge_gen(g.nodes, g.is_directed()) if e not in g.edges)
-        for e in edges_left:
+        for e in _sample_edges(g.nodes, g.is_directed(), p):
+            if e in g.edges:
+                continue
+
             erev = tuple(reversed(e))
             allow_insertion = backwards_edges or erev not in g.edges
-            if allow_insertion and random.random() < p:
+            if allow_insertion:
                 g.add_edge(*e)
 
         return g
@@ -108,6 +246,28 @@ class RandomGraphBuilder:
 
         return g
 
+    def build_many(self, sizes, workers=None, seed=None):
+        """
+        Build one independent graph per entry of sizes, overriding the node count set by nodes().
+        :param sizes: The number of nodes of each graph to build
+        :param workers: The number of worker processes to build in (None uses every core, 1 builds in this process)
+        :param seed: Seeds the per-graph random seeds so a batch can be reproduced
+        :return: A list of CompactGraphs in the same order as sizes
+        """
+        sizes = list(sizes)
+
+        # Derive every task's seed up front so the output doesn't depend on scheduling
+        rng = random.Random(seed)
+        seeds = [rng.getrandbits(64) for _ in sizes]
+
+        tasks = ([self] * len(sizes), sizes, seeds)
+
+        if workers == 1:
+            return list(map(_build_task, *tasks))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_build_task, *tasks))
+
     @property
     def directed(self):
         return self._directed
@@ -312,13 +472,13 @@ class RandomGraphBuilder:
     
     @transform
     def remove_negative_cycles(g):
-        from bellman import bellman_ford, NegativeCycleException
+        from bellman import bellman_ford_tarjan, NegativeCycleException
 
         has_negative_cycle = True
         while has_negative_cycle:
             try:
                 for v in g.nodes():
-                    bellman_ford(g, v)
+                    bellman_ford_tarjan(g, v)
 
                 has_negative_cycle = False
             except NegativeCycleException as nce:
@@ -0,0 +1,94 @@
+"""
+Shortest paths from one source, by Dijkstra's algorithm when no edge weighs less than
+zero and by Bellman-Ford otherwise, so graphs without negative weights, the usual case,
+take O(|E| log |V|) instead of O(|V||E|).
+
+Both return the same pair of dictionaries, with the same stand-in distance for the
+nodes the source can't reach.
+"""
+from collections.abc import Hashable
+import heapq
+import networkx as nx
+from typing import Callable, Optional
+
+try:
+    from bellman import bellman_ford
+except ImportError:
+    from algorithms.bellman import bellman_ford
+
+
+def min_weight(g: nx.Graph | nx.DiGraph) -> float:
+    """
+    :return: The smallest edge weight of g, 0 if it has no weighted edges. Edges without a
+        weight are left out
+    """
+    return min((w for _, _, w in g.edges(data='weight') if w is not None), default=0)
+
+
+def dijkstra(g: nx.Graph | nx.DiGraph, source: Hashable, progress: Optional[Callable[[float], None]] = None):
+    """
+    Dijkstra's algorithm with a binary heap. Only correct if no edge weight is negative.
+    :param g: the graph to perform the algorithm on
+    :param source: the source node to query in g
+    :param progress: optionally called with the fraction of nodes settled so far
+    :return: The distances and predecessors of every node, like bellman_ford returns them
+    """
+    n = g.number_of_nodes()
+
+    inf = sum(abs(w) for _, _, w in g.edges(data='weight')) + 1
+
+    distance = {v: inf * 2 for v in g.nodes}
+    predecessor = {v: None for v in g.nodes}
+
+    distance[source] = 0
+
+    settled = set()
+    # Nodes are pushed again when they get closer instead of being moved up, the stale entries are skipped
+    p_queue = [(0, 0, source)]
+    # Breaks ties between equal distances, as the nodes themselves may not be comparable
+    count = 1
+
+    while len(p_queue) > 0:
+        d, _, u = heapq.heappop(p_queue)
+        if u in settled:
+            continue
+        settled.add(u)
+
+        if progress is not None:
+            progress(len(settled) / n)
+
+        for v, w in g.adj[u].items():
+            relax = d + w['weight']
+            if relax < distance[v]:
+                distance[v] = relax
+                predecessor[v] = u
+                heapq.heappush(p_queue, (relax, count, v))
+                count += 1
+
+    return distance, predecessor
+
+
+def shortest_paths(g: nx.Graph | nx.DiGraph, source: Hashable, progress: Optional[Callable[[float], None]] = None,
+                   smallest_weight: Optional[float] = None):
+    """
+    Computes the shortest paths between a source node and every node, with Dijkstra's
+    algorithm if no edge weight is negative and Bellman-Ford otherwise. An undirected g is
+    taken as its directed version, each edge going both ways, whichever of the two runs.
+    :param g: the graph to perform the algorithm on
+    :param source: the source node to query in g
+    :param progress: optionally called with the fraction of the work done
+    :param smallest_weight: g's smallest edge weight, if already known, see min_weight
+    :return: The distances and predecessors of every node, like bellman_ford returns them
+    :raises NegativeCycleException: If a negative cycle can be reached from the source
+    """
+    # bellman_ford only relaxes edges the way g.edges lists them, while dijkstra walks g.adj
+    if not g.is_directed():
+        g = g.to_directed(as_view=True)
+
+    if smallest_weight is None:
+        smallest_weight = min_weight(g)
+
+    if smallest_weight >= 0:
+        return dijkstra(g, source, progress)
+
+    return bellman_ford(g, source, progress)
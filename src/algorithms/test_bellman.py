@@ -1,7 +1,7 @@
 import unittest
 import networkx as nx
 
-from bellman import NegativeCycleException, bellman_ford
+from bellman import NegativeCycleException, bellman_ford, bellman_ford_tarjan
 from random_graph import RandomGraphBuilder
 
 def add_weighted_edges(g, edges):
@@ -144,5 +144,65 @@ class TestNegativeCycles(unittest.TestCase):
         # should raise exception
         self.assertRaises(NegativeCycleException, bellman_ford, self.nonConnectedCycle, 11)
 
+class TestTarjan(unittest.TestCase):
+    """
+    The subtree disassembly variant finds the same distances, and a negative cycle whenever
+    bellman_ford does, though not necessarily the same one
+    """
+    @classmethod
+    def setUpClass(cls):
+        # The graphs of the tests above
+        TestWikipediaExample.setUpClass()
+        TestNegativeCycles.setUpClass()
+        cls.example = TestWikipediaExample.graph
+        cls.cycles = TestNegativeCycles
+
+    def checkAgainstBellmanFord(self, g, s):
+        try:
+            expected, _ = bellman_ford(g, s)
+        except NegativeCycleException:
+            expected = None
+
+        try:
+            distance, predecessor = bellman_ford_tarjan(g, s)
+        except NegativeCycleException as e:
+            self.assertIsNone(expected)
+            self.assertLess(sum(g.edges[edge]['weight'] for edge in e.edges), 0)
+            return
+
+        self.assertEqual(distance, expected)
+        for v, u in predecessor.items():
+            if u is not None:
+                self.assertEqual(distance[v], distance[u] + g.edges[u, v]['weight'])
+
+    def test_wikipediaExample(self):
+        self.checkAgainstBellmanFord(self.example, 's')
+
+    def test_cycles(self):
+        self.assertEqual(Cycle(self.cycleOf(self.cycles.twoCycle, 0)), Cycle((0, 1)))
+        self.assertEqual(Cycle(self.cycleOf(self.cycles.nonTrivialCycle, 1)), Cycle((1, 5, 4, 3, 2)))
+        self.assertEqual(Cycle(self.cycleOf(self.cycles.nonSourceCycle, 4)), Cycle((0, 1, 2, 3)))
+
+        bellman_ford_tarjan(self.cycles.nonConnectedCycle, 0)
+        self.assertRaises(NegativeCycleException, bellman_ford_tarjan, self.cycles.nonConnectedCycle, 11)
+
+    def cycleOf(self, g, s):
+        with self.assertRaises(NegativeCycleException) as context:
+            bellman_ford_tarjan(g, s)
+        return context.exception.cycle
+
+    def test_selfLoop(self):
+        g = nx.DiGraph()
+        add_weighted_edges(g, [(0, 1, 2), (1, 1, -1)])
+
+        self.assertEqual(self.cycleOf(g, 0), (1,))
+
+    def test_randomGraphs(self):
+        for i in range(20):
+            with self.subTest(graph=i):
+                g = RandomGraphBuilder().nodes(30).directed().strongly_connected(False).random_edges(0.1) \
+                                        .weighted(range(-3, 30)).build()
+                self.checkAgainstBellmanFord(g, 0)
+
 if __name__ == '__main__':
     unittest.main()
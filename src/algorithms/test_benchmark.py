@@ -0,0 +1,72 @@
+import unittest
+
+from benchmark import CASES, profile_memory, run_benchmark, summarize, time_algorithm
+from random_graph import RandomGraphBuilder as randG
+
+
+class TestSummarize(unittest.TestCase):
+    def test_statistics(self):
+        stats = summarize([5, 1, 4, 2, 3])
+
+        self.assertEqual(stats['min_ns'], 1)
+        self.assertEqual(stats['max_ns'], 5)
+        self.assertEqual(stats['median_ns'], 3)
+        self.assertEqual(stats['q1_ns'], 2)
+        self.assertEqual(stats['q3_ns'], 4)
+        self.assertEqual(stats['iqr_ns'], 2)
+
+    def test_single_sample(self):
+        stats = summarize([7])
+
+        self.assertEqual(stats['median_ns'], 7)
+        self.assertEqual(stats['iqr_ns'], 0)
+
+
+class TestTimeAlgorithm(unittest.TestCase):
+    def test_mutating_algorithm_gets_fresh_copies(self):
+        # Girvan-Newman removes edges, so every run must start from the original graph
+        graph = randG().nodes(15).random_edges(0.4).connected().build()
+        num_edges = graph.number_of_edges()
+
+        samples = time_algorithm(CASES['girvan_newman'], graph, repeats=3, warmup=1)
+
+        self.assertEqual(len(samples), 3)
+        self.assertEqual(graph.number_of_edges(), num_edges)
+
+
+class TestProfileMemory(unittest.TestCase):
+    def test_records_allocations(self):
+        graph = randG().nodes(40).random_edges(0.3).build()
+
+        memory = profile_memory(CASES['ramsey'], graph)
+
+        self.assertGreater(memory['peak_alloc_bytes'], 0)
+        if memory['rss_bytes'] is not None:
+            self.assertGreater(memory['rss_bytes'], 0)
+
+
+class TestRunBenchmark(unittest.TestCase):
+    def test_grid(self):
+        sizes = [10, 20]
+        densities = [0.1, 0.3]
+
+        for name, case in CASES.items():
+            with self.subTest(algorithm=name):
+                results = run_benchmark(case, sizes, densities, repeats=2, warmup=0, workers=1, seed=0)
+
+                self.assertEqual([(r['nodes'], r['density']) for r in results],
+                                 [(n, p) for p in densities for n in sizes])
+                for r in results:
+                    self.assertEqual(len(r['samples_ns']), 2)
+                    self.assertLessEqual(r['min_ns'], r['median_ns'])
+                    self.assertGreater(r['peak_alloc_bytes'], 0)
+                    self.assertGreater(r['graph_bytes'], 0)
+
+    def test_without_memory(self):
+        results = run_benchmark(CASES['prims'], [10], repeats=1, warmup=0, workers=1, memory=False)
+
+        self.assertNotIn('peak_alloc_bytes', results[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+
+from benchmark_history import ResultStore, compare, mann_whitney_greater
+
+
+def make_run(samples_by_key):
+    results = []
+    for (algorithm, nodes), samples in samples_by_key.items():
+        ordered = sorted(samples)
+        results.append({'algorithm': algorithm, 'nodes': nodes, 'density': 0.1,
+                        'samples_ns': samples, 'median_ns': ordered[len(ordered) // 2]})
+
+    return {'results': results}
+
+
+class TestMannWhitney(unittest.TestCase):
+    def test_separated_samples(self):
+        # Every x beats every y, which has probability 1 / C(10, 5) under the null hypothesis
+        p = mann_whitney_greater([6, 7, 8, 9, 10], [1, 2, 3, 4, 5])
+        self.assertAlmostEqual(p, 1 / 252)
+
+    def test_opposite_direction(self):
+        p = mann_whitney_greater([1, 2, 3, 4, 5], [6, 7, 8, 9, 10])
+        self.assertAlmostEqual(p, 1.0)
+
+    def test_identical_samples(self):
+        p = mann_whitney_greater([3, 3, 3], [3, 3, 3])
+        self.assertEqual(p, 1.0)
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_only_significant_slowdowns(self):
+        baseline = make_run({('prims', 10): [100, 101, 102, 103, 104],
+                             ('ramsey', 10): [100, 101, 102, 103, 104],
+                             ('ramsey', 60): [100, 120, 90, 110, 105]})
+        current = make_run({('prims', 10): [200, 201, 202, 203, 204],
+                            ('ramsey', 10): [99, 100, 101, 102, 103],
+                            ('ramsey', 60): [95, 125, 100, 112, 104]})
+
+        regressed = {(c.algorithm, c.nodes) for c in compare(baseline, current) if c.regressed}
+
+        self.assertEqual(regressed, {('prims', 10)})
+
+    def test_ignores_results_missing_from_baseline(self):
+        baseline = make_run({('prims', 10): [1, 2, 3]})
+        current = make_run({('prims', 60): [1, 2, 3]})
+
+        self.assertEqual(compare(baseline, current), [])
+
+
+class TestResultStore(unittest.TestCase):
+    def test_save_and_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResultStore(directory)
+            run = make_run({('prims', 10): [1, 2, 3]})
+
+            store.save(run, 'first')
+            self.assertEqual(store.names(), ['first'])
+            self.assertIsNone(store.baseline_name)
+
+            store.set_baseline('first')
+            self.assertEqual(store.load_baseline(), run)
+
+            self.assertRaises(KeyError, store.set_baseline, 'missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
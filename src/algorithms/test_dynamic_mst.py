@@ -0,0 +1,93 @@
+import random
+import unittest
+import networkx as nx
+
+from dynamic_mst import DynamicMST
+from prims import prims
+from random_graph import RandomGraphBuilder as randG
+
+
+def forest_weight(graph):
+    return nx.minimum_spanning_tree(graph).size(weight='weight')
+
+
+class TestDynamicMST(unittest.TestCase):
+    def assertMinimum(self, mst, graph):
+        forest = mst.forest()
+        self.assertTrue(nx.is_forest(forest), "The result is not a forest")
+        # A spanning forest has one tree per component
+        self.assertEqual(nx.number_connected_components(forest), nx.number_connected_components(graph))
+        self.assertEqual(mst.weight, forest_weight(graph), "The forest does not have the minimum weight")
+        for u, v in forest.edges:
+            self.assertTrue(graph.has_edge(u, v), "An edge of the forest is not in the graph")
+
+    def test_initial(self):
+        graph = randG().nodes(30).random_edges(0.2).weighted(range(1, 10)).build()
+        self.assertMinimum(DynamicMST(graph), graph)
+
+    def test_initial_from_prims(self):
+        graph = randG().nodes(20).complete().connected().weighted(range(1, 10)).build()
+        tree = prims(graph)
+
+        mst = DynamicMST(graph, tree.edges)
+        self.assertEqual({frozenset(e) for e in mst.edges()}, {frozenset(e) for e in tree.edges})
+
+    def test_add(self):
+        mst = DynamicMST()
+        self.assertEqual(mst.add_edge(0, 1, 5), ([(0, 1)], []))
+        self.assertEqual(mst.add_edge(1, 2, 3), ([(1, 2)], []))
+
+        # Closing a cycle swaps out the heaviest edge on it only when that is heavier
+        self.assertEqual(mst.add_edge(2, 0, 9), ([], []))
+        # Made lighter, the edge from before takes the place of the heaviest one
+        self.assertEqual(mst.add_edge(0, 2, 1), ([(2, 0)], [(0, 1)]))
+        self.assertEqual(mst.weight, 4)
+        self.assertFalse(mst.has_edge(0, 1))
+        self.assertTrue(mst.has_edge(0, 2) and mst.has_edge(2, 1))
+
+    def test_remove(self):
+        mst = DynamicMST()
+        mst.add_edge(0, 1, 1)
+        mst.add_edge(1, 2, 1)
+        mst.add_edge(0, 2, 5)
+        mst.add_edge(2, 3, 1)
+
+        # The lightest edge across the cut replaces a removed tree edge
+        self.assertEqual(mst.remove_edge(1, 2), ([(0, 2)], [(1, 2)]))
+        self.assertEqual(mst.remove_edge(2, 3), ([], [(2, 3)]))
+        self.assertEqual(mst.remove_edge(2, 3), ([], []))
+        self.assertEqual(mst.remove_node(0), ([], [(0, 1), (0, 2)]))
+
+    def test_reweight(self):
+        mst = DynamicMST()
+        mst.add_edge(0, 1, 1)
+        mst.add_edge(1, 2, 2)
+        mst.add_edge(0, 2, 3)
+
+        self.assertEqual(mst.add_edge(2, 1, 5), ([(0, 2)], [(1, 2)]))
+        self.assertEqual(mst.add_edge(1, 0, 0), ([], []))
+        self.assertEqual(mst.weight, 3)
+
+    def test_random_edits(self):
+        # Compare against networkx after every edit of a graph that keeps changing
+        rnd = random.Random(0)
+        graph = randG().nodes(40).random_edges(0.1).weighted(range(1, 20)).build()
+        mst = DynamicMST(graph)
+
+        for _ in range(300):
+            u, v = rnd.sample(range(40), 2)
+            if graph.has_edge(u, v) and rnd.random() < 0.6:
+                graph.remove_edge(u, v)
+                added, removed = mst.remove_edge(u, v)
+            else:
+                weight = rnd.randint(1, 20)
+                graph.add_edge(u, v, weight=weight)
+                added, removed = mst.add_edge(u, v, weight)
+
+            self.assertMinimum(mst, graph)
+            self.assertTrue(all(mst.has_edge(*e) for e in added))
+            self.assertFalse(any(mst.has_edge(*e) for e in removed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import random
+import unittest
+import networkx as nx
+
+from bellman import NegativeCycleException, bellman_ford
+from dynamic_sssp import DynamicSSSP
+
+
+def check_against_bellman_ford(test, tree, graph):
+    try:
+        expected, _ = bellman_ford(graph, tree.source)
+    except NegativeCycleException:
+        test.assertRaises(NegativeCycleException, tree.result, graph)
+        return
+
+    distance, predecessor = tree.result(graph)
+    test.assertEqual(distance, expected)
+
+    # Predecessors may differ on ties, but have to lie on a shortest path
+    for v, u in predecessor.items():
+        if u is not None:
+            test.assertEqual(distance[v], distance[u] + graph.edges[u, v]['weight'])
+
+
+class TestDynamicSSSP(unittest.TestCase):
+    def setUp(self):
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from(['s', 't', 'x', 'y', 'z'])
+        for u, v, w in [('s', 't', 6), ('s', 'y', 7), ('t', 'y', 8), ('t', 'x', 5), ('t', 'z', -4),
+                        ('y', 'x', -3), ('y', 'z', 9), ('x', 't', -2), ('z', 'x', 7)]:
+            self.graph.add_edge(u, v, weight=w)
+
+        self.tree = DynamicSSSP(self.graph, 's')
+
+    def test_initial(self):
+        self.assertEqual(self.tree.result(self.graph), bellman_ford(self.graph, 's'))
+
+    def test_path(self):
+        self.assertEqual(self.tree.path('z'), ['s', 'y', 'x', 't', 'z'])
+        self.assertEqual(self.tree.path('s'), ['s'])
+
+        self.graph.add_node('u')
+        self.assertEqual(self.tree.path('u'), [])
+
+    def test_added(self):
+        self.graph.add_edge('s', 'z', weight=-5)
+        self.assertTrue(self.tree.edge_changed(self.graph, 's', 'z'))
+
+        self.assertEqual(self.tree.distance('z'), -5)
+        self.assertEqual(self.tree.distance('x'), 2)
+        check_against_bellman_ford(self, self.tree, self.graph)
+
+    def test_removed(self):
+        # s -> y -> x -> t -> z is the tree path to z
+        old = self.graph.edges['y', 'x']['weight']
+        self.graph.remove_edge('y', 'x')
+        self.assertTrue(self.tree.edge_changed(self.graph, 'y', 'x', old))
+        check_against_bellman_ford(self, self.tree, self.graph)
+
+        # An edge off the tree changes nothing
+        old = self.graph.edges['y', 'z']['weight']
+        self.graph.remove_edge('y', 'z')
+        self.assertFalse(self.tree.edge_changed(self.graph, 'y', 'z', old))
+
+    def test_unreachable(self):
+        self.graph.add_node('u')
+        self.graph.remove_edge('s', 't')
+        self.tree.edge_changed(self.graph, 's', 't', 6)
+        self.graph.remove_edge('s', 'y')
+        self.tree.edge_changed(self.graph, 's', 'y', 7)
+
+        distance, predecessor = self.tree.result(self.graph)
+        self.assertEqual(distance, bellman_ford(self.graph, 's')[0])
+        self.assertTrue(all(p is None for p in predecessor.values()))
+
+    def test_negative_cycle(self):
+        self.graph.add_edge('z', 't', weight=1)
+        self.assertTrue(self.tree.edge_changed(self.graph, 'z', 't'))
+
+        # Found without starting over
+        self.assertFalse(self.tree.stale)
+        with self.assertRaises(NegativeCycleException) as raised:
+            self.tree.result(self.graph)
+        self.assertEqual(set(raised.exception.cycle), {'t', 'z'})
+
+        # Nothing is known about the cycle once the graph changes again
+        self.graph.remove_edge('z', 't')
+        self.tree.edge_changed(self.graph, 'z', 't', 1)
+        self.assertTrue(self.tree.stale)
+
+        self.tree.recompute(self.graph)
+        self.assertEqual(self.tree.result(self.graph), bellman_ford(self.graph, 's'))
+
+    def test_unreachable_cycle(self):
+        # A negative cycle only counts once the source can reach it
+        self.graph.add_edges_from([('a', 'b', {'weight': 1}), ('b', 'a', {'weight': -3})])
+        self.tree.edge_changed(self.graph, 'a', 'b')
+        self.tree.edge_changed(self.graph, 'b', 'a')
+        check_against_bellman_ford(self, self.tree, self.graph)
+
+        self.graph.add_edge('x', 'a', weight=1)
+        self.tree.edge_changed(self.graph, 'x', 'a')
+        self.assertRaises(NegativeCycleException, self.tree.result, self.graph)
+
+    def test_random_edits(self):
+        rnd = random.Random(0)
+        for trial in range(20):
+            graph = nx.gnp_random_graph(30, 0.1, seed=trial, directed=True)
+            for u, v in graph.edges:
+                graph.edges[u, v]['weight'] = rnd.randint(0, 20)
+            tree = DynamicSSSP(graph, 0)
+
+            for _ in range(50):
+                u, v = rnd.sample(range(30), 2)
+                old = graph.edges[u, v]['weight'] if graph.has_edge(u, v) else None
+                if old is not None and rnd.random() < 0.4:
+                    graph.remove_edge(u, v)
+                else:
+                    graph.add_edge(u, v, weight=rnd.randint(-2, 20))
+                tree.edge_changed(graph, u, v, old)
+
+                if tree.stale:
+                    tree.recompute(graph)
+                check_against_bellman_ford(self, tree, graph)
+
+
+if __name__ == '__main__':
+    unittest.main()
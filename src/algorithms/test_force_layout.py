@@ -0,0 +1,94 @@
+import unittest
+import networkx as nx
+import numpy as np
+
+from force_layout import attractive_forces, force_layout, force_layout_steps, grid_layout, repulsive_forces
+
+
+def exact_repulsion(positions):
+    deltas = positions[:, None] - positions[None]
+    d2 = (deltas ** 2).sum(axis=2)
+    np.fill_diagonal(d2, np.inf)
+
+    return (deltas / d2[:, :, None]).sum(axis=1)
+
+
+class TestRepulsion(unittest.TestCase):
+    def test_matches_exact(self):
+        # The approximation should stay close to summing over every pair
+        rng = np.random.default_rng(0)
+
+        for n in (2, 10, 200, 2000):
+            positions = rng.uniform(0, 30, (n, 2))
+            exact = exact_repulsion(positions)
+
+            error = np.linalg.norm(repulsive_forces(positions) - exact) / np.linalg.norm(exact)
+            self.assertLess(error, 0.05)
+
+    def test_clustered(self):
+        # A far away outlier squeezes everything else into a corner of the coarse levels
+        rng = np.random.default_rng(1)
+        positions = np.vstack([rng.normal(0, 1, (500, 2)), [[1000, 1000]]])
+        exact = exact_repulsion(positions)
+
+        error = np.linalg.norm(repulsive_forces(positions) - exact) / np.linalg.norm(exact)
+        self.assertLess(error, 0.05)
+
+    def test_attraction(self):
+        positions = np.array([[0.0, 0.0], [2.0, 0.0], [5.0, 5.0]])
+        forces = attractive_forces(positions, np.array([[0, 1]]))
+
+        # d^2 / k pulling both ends together, nothing on the isolated node
+        np.testing.assert_allclose(forces, [[4, 0], [-4, 0], [0, 0]])
+
+
+class TestForceLayout(unittest.TestCase):
+    def test_grid_layout(self):
+        positions = grid_layout(10)
+
+        self.assertEqual(positions.shape, (10, 2))
+        self.assertEqual(len({tuple(p) for p in positions.tolist()}), 10)
+
+    def test_small_graphs(self):
+        self.assertEqual(force_layout(0, []).shape, (0, 2))
+        self.assertEqual(force_layout(1, []).shape, (1, 2))
+
+        positions = force_layout(2, [(0, 1)])
+        self.assertTrue(np.isfinite(positions).all())
+        self.assertGreater(np.linalg.norm(positions[0] - positions[1]), 0.1)
+
+    def test_neighbors_closer(self):
+        # Laid out, a grid graph's edges should be shorter than the distance between random pairs
+        graph = nx.convert_node_labels_to_integers(nx.grid_2d_graph(10, 10))
+        edges = np.array(graph.edges())
+
+        # Start from random positions so the answer isn't already in the grid placement
+        start = np.random.default_rng(0).uniform(0, 10, (100, 2))
+        positions = force_layout(100, edges, start)
+
+        edge_lengths = np.linalg.norm(positions[edges[:, 0]] - positions[edges[:, 1]], axis=1)
+        pairs = np.random.default_rng(1).integers(0, 100, (500, 2))
+        pair_distances = np.linalg.norm(positions[pairs[:, 0]] - positions[pairs[:, 1]], axis=1)
+
+        self.assertLess(np.median(edge_lengths) * 3, np.median(pair_distances))
+
+    def test_coincident_start(self):
+        # Nodes starting on top of each other still have to be pulled apart
+        positions = force_layout(20, [(i, i + 1) for i in range(19)], np.zeros((20, 2)))
+
+        self.assertTrue(np.isfinite(positions).all())
+        distances = np.linalg.norm(positions[:, None] - positions[None], axis=2) + np.eye(20)
+        self.assertGreater(distances.min(), 0.1)
+
+    def test_steps(self):
+        steps = list(force_layout_steps(5, [(0, 1)], iterations=7))
+        self.assertEqual(len(steps), 7)
+
+        progress = []
+        final = force_layout(5, [(0, 1)], iterations=7, progress=progress.append)
+        self.assertEqual(progress[-1], 1)
+        np.testing.assert_allclose(final, steps[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+from collections import Counter
+import random
+import unittest
+import networkx as nx
+
+from random_graph import CompactGraph, RandomGraphBuilder as randG
+
+
+class TestCompactGraph(unittest.TestCase):
+    def test_round_trip(self):
+        # Converting to the compact form and back should give the same graph
+        graph = randG().nodes(20).directed().random_edges(0.3).weighted(range(-5, 5)).build()
+
+        restored = CompactGraph.from_networkx(graph).to_networkx()
+
+        self.assertTrue(restored.is_directed())
+        self.assertEqual(set(restored.nodes), set(graph.nodes))
+        self.assertEqual(set(restored.edges(data='weight')), set(graph.edges(data='weight')))
+
+    def test_round_trip_mixed_weights(self):
+        # Only some edges weighted, as when a negative cycle is added to unweighted edges
+        graph = nx.DiGraph()
+        graph.add_edge(0, 1, weight=5)
+        graph.add_edge(1, 2)
+        graph.add_edge(2, 0, weight=-1)
+
+        compact = CompactGraph.from_networkx(graph)
+        self.assertEqual(compact.edge_weights(), [5, None, -1])
+
+        restored = compact.to_networkx()
+        self.assertEqual(set(restored.edges(data='weight')), set(graph.edges(data='weight')))
+        self.assertNotIn('weight', restored.edges[1, 2])
+
+    def test_round_trip_unweighted(self):
+        graph = randG().nodes(15).random_edges(0.5).build()
+
+        restored = CompactGraph.from_networkx(graph).to_networkx()
+
+        self.assertFalse(restored.is_directed())
+        self.assertTrue(nx.utils.graphs_equal(restored, graph))
+
+
+class TestBuildMany(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.builder = randG().random_edges(0.2).connected().weighted(range(1, 100))
+        cls.sizes = [10, 30, 50]
+
+    def test_sizes(self):
+        graphs = self.builder.build_many(self.sizes, workers=1, seed=0)
+
+        self.assertEqual([g.number_of_nodes for g in graphs], self.sizes)
+        for g in graphs:
+            self.assertTrue(nx.is_connected(g.to_networkx()))
+
+    def test_seeded_batches_match_across_workers(self):
+        # The seed decides each graph, not which process happened to build it
+        serial = self.builder.build_many(self.sizes, workers=1, seed=42)
+        parallel = self.builder.build_many(self.sizes, workers=2, seed=42)
+
+        for a, b in zip(serial, parallel):
+            self.assertTrue(nx.utils.graphs_equal(a.to_networkx(), b.to_networkx()))
+            self.assertEqual(set(a.to_networkx().edges(data='weight')), set(b.to_networkx().edges(data='weight')))
+
+
+class TestRandomEdges(unittest.TestCase):
+    def test_extremes(self):
+        self.assertEqual(randG().nodes(12).random_edges(0).build().number_of_edges(), 0)
+        self.assertTrue(nx.utils.graphs_equal(randG().nodes(12).random_edges(1).build(), nx.complete_graph(12)))
+        self.assertTrue(nx.utils.graphs_equal(randG().nodes(12).directed().random_edges(1).build(),
+                                              nx.complete_graph(12, nx.DiGraph)))
+
+    def test_edge_frequencies(self):
+        # Every pair should be picked with probability p, independently of its position
+        random.seed(0)
+        trials = 2000
+        counts = Counter()
+        for _ in range(trials):
+            counts.update(list(randG().nodes(6).directed().random_edges(0.3).build().edges))
+
+        self.assertEqual(len(counts), 30)
+        for pair, count in counts.items():
+            self.assertAlmostEqual(count / trials, 0.3, delta=0.05, msg=pair)
+
+    def test_no_backwards_edges(self):
+        graph = randG().nodes(40).directed().random_edges(0.5, backwards_edges=False).build()
+
+        self.assertFalse(any(graph.has_edge(v, u) for u, v in graph.edges))
+
+
+class TestRemoveNegativeCycles(unittest.TestCase):
+    def test_no_cycles_left(self):
+        random.seed(0)
+        graph = randG().nodes(40).directed().random_edges(0.1).weighted(range(-10, 30)).remove_negative_cycles().build()
+
+        self.assertTrue(any(w < 0 for _, _, w in graph.edges(data='weight')))
+        self.assertFalse(nx.negative_edge_cycle(graph))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import networkx as nx
+
+from bellman import NegativeCycleException, bellman_ford
+from random_graph import RandomGraphBuilder
+from shortest_paths import dijkstra, min_weight, shortest_paths
+
+
+def check_tree(test, graph, distance, predecessor):
+    """
+    Check that every predecessor is on a shortest path, by the edge leading from it.
+    """
+    for v, u in predecessor.items():
+        if u is not None:
+            test.assertEqual(distance[v], distance[u] + graph.edges[u, v]['weight'])
+
+
+class TestDijkstra(unittest.TestCase):
+    def test_random_graphs(self):
+        for i in range(10):
+            with self.subTest(graph=i):
+                graph = RandomGraphBuilder().nodes(40).directed().strongly_connected(False).random_edges(0.1) \
+                                            .weighted(range(0, 20)).build()
+
+                distance, predecessor = dijkstra(graph, 0)
+                expected, _ = bellman_ford(graph, 0)
+
+                self.assertEqual(distance, expected)
+                check_tree(self, graph, distance, predecessor)
+
+    def test_unreachable(self):
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(4))
+        graph.add_edge(0, 1, weight=3)
+        graph.add_edge(2, 3, weight=4)
+
+        self.assertEqual(dijkstra(graph, 0), bellman_ford(graph, 0))
+
+    def test_unorderable_nodes(self):
+        # Equal distances must not fall back to comparing the nodes
+        graph = nx.DiGraph()
+        graph.add_edge('s', 1, weight=1)
+        graph.add_edge('s', (2,), weight=1)
+
+        distance, _ = dijkstra(graph, 's')
+        self.assertEqual(distance, {'s': 0, 1: 1, (2,): 1})
+
+
+class TestShortestPaths(unittest.TestCase):
+    def test_min_weight(self):
+        graph = nx.DiGraph()
+        self.assertEqual(min_weight(graph), 0)
+
+        graph.add_edge(0, 1, weight=5)
+        graph.add_edge(1, 2, weight=-2)
+        self.assertEqual(min_weight(graph), -2)
+
+    def test_min_weight_unweighted(self):
+        graph = nx.DiGraph()
+        graph.add_edges_from([(0, 1), (1, 2), (2, 0)])
+        self.assertEqual(min_weight(graph), 0)
+
+        graph.add_edge(2, 3, weight=4)
+        self.assertEqual(min_weight(graph), 4)
+
+    def test_negative_weights(self):
+        graph = nx.DiGraph()
+        graph.add_edge('s', 'a', weight=4)
+        graph.add_edge('s', 'b', weight=5)
+        graph.add_edge('b', 'a', weight=-3)
+
+        distance, predecessor = shortest_paths(graph, 's')
+        self.assertEqual(distance['a'], 2)
+        self.assertEqual(predecessor['a'], 'b')
+
+    def test_negative_cycle(self):
+        graph = nx.DiGraph()
+        graph.add_edge(0, 1, weight=7)
+        graph.add_edge(1, 0, weight=-8)
+
+        self.assertRaises(NegativeCycleException, shortest_paths, graph, 0)
+
+    def test_given_weight(self):
+        graph = RandomGraphBuilder().nodes(30).directed().random_edges(0.2).weighted(range(1, 100)).build()
+
+        distance, predecessor = shortest_paths(graph, 0, smallest_weight=min_weight(graph))
+        self.assertEqual(distance, bellman_ford(graph, 0)[0])
+        check_tree(self, graph, distance, predecessor)
+
+    def test_undirected(self):
+        # The same distances whether Dijkstra's algorithm or Bellman-Ford runs
+        graph = RandomGraphBuilder().nodes(30).random_edges(0.2).weighted(range(1, 100)).build()
+        self.assertFalse(graph.is_directed())
+
+        expected = dijkstra(graph.to_directed(), 0)
+        self.assertEqual(shortest_paths(graph, 0), expected)
+        self.assertEqual(shortest_paths(graph, 0, smallest_weight=-1)[0], expected[0])
+
+    def test_undirected_negative_edge(self):
+        # An undirected negative edge is a negative cycle, going back and forth along it
+        graph = nx.Graph()
+        graph.add_edge(0, 1, weight=3)
+        graph.add_edge(1, 2, weight=-1)
+
+        self.assertRaises(NegativeCycleException, shortest_paths, graph, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
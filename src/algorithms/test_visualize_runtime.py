@@ -0,0 +1,52 @@
+import math
+import unittest
+
+from benchmark import CASES
+from visualize_runtime import fit_complexity
+
+
+def synthetic_results(runtime, densities):
+    results = []
+    for p in densities:
+        for n in range(50, 1000, 100):
+            m = int(p * n * (n - 1) / 2)
+            results.append({'nodes': n, 'edges': m, 'density': p, 'median_ns': runtime(n, m)})
+
+    return results
+
+
+class TestFitComplexity(unittest.TestCase):
+    def test_separates_v_and_e(self):
+        results = synthetic_results(lambda n, m: 3 * n * m, [0.05, 0.1, 0.3])
+
+        fit = fit_complexity(results, CASES['bellman_ford'])
+
+        self.assertAlmostEqual(fit.exponent_v, 1, places=5)
+        self.assertAlmostEqual(fit.exponent_e, 1, places=5)
+        self.assertAlmostEqual(fit.bound_exponent, 1, places=5)
+        self.assertAlmostEqual(fit.r_squared, 1, places=5)
+        self.assertFalse(fit.exceeds_declared())
+
+    def test_single_density_fits_v_only(self):
+        results = synthetic_results(lambda n, m: m * math.log(n), [0.1])
+
+        fit = fit_complexity(results, CASES['prims'])
+
+        self.assertIsNone(fit.exponent_e)
+        self.assertAlmostEqual(fit.exponent_v, fit.declared_exponent_v, places=5)
+        self.assertFalse(fit.exceeds_declared())
+
+    def test_detects_quadratic_regression(self):
+        # An O(E log V) algorithm that has silently become O(E^2)
+        results = synthetic_results(lambda n, m: m ** 2, [0.05, 0.2])
+
+        fit = fit_complexity(results, CASES['prims'])
+
+        self.assertTrue(fit.exceeds_declared())
+
+    def test_too_few_results(self):
+        self.assertRaises(ValueError, fit_complexity, synthetic_results(lambda n, m: n, [0.1])[:2], CASES['prims'])
+
+
+if __name__ == '__main__':
+    unittest.main()
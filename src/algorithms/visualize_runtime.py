@@ -1,52 +1,204 @@
-import time
+import argparse
+from dataclasses import dataclass
 import numpy as np
-import random
 import networkx as nx
 import matplotlib.pyplot as plt
 from typing import Callable, Tuple
 
+from benchmark import CASES, BenchmarkCase, make_document, run_benchmark, summarize, time_algorithm
+from benchmark_history import ResultStore
+from random_graph import RandomGraphBuilder
 
-def measure_runtime(algorithm: Callable[[nx.Graph], any], graph_gen_function: Callable[[int, int], nx.Graph], runtime_function: Callable[[int, int], float]) -> Tuple[range, list, list]:
+
+def measure_runtime(algorithm: Callable[[nx.Graph], any], graph_gen_function: Callable[[int, int], nx.Graph] | RandomGraphBuilder, runtime_function: Callable[[int, int], float], workers: int | None = None, repeats: int = 5, warmup: int = 1) -> Tuple[range, list, list]:
     """
     Measure the runtime of the given algorithm on graphs with various numbers of nodes `range(10, 1000, 50)`.
+    For a configurable size and density grid with full statistics, use `benchmark.run_benchmark` instead.
 
     :param algorithm: The algorithm to measure the runtime of. (Assumes a single argument *G*)
     :param graph_gen_function: A function that generates a random graph. (Assumes two arguments *num_nodes* and *num_edges*)
+        Alternatively a RandomGraphBuilder, in which case every graph is generated up front in parallel.
     :param runtime_function: A function that calculate the expected runtime of the algorithm. (Assumes two arguments, *num_nodes* and *num_edges*)
+    :param workers: The number of processes to generate graphs with when given a RandomGraphBuilder.
+    :param repeats: The number of timed runs per graph, of which the median is reported.
+    :param warmup: The number of untimed runs per graph.
     :return results: A tuple of 3 lists containing the number of nodes, the measured runtimes, and the expected runtimes.
     """
     node_counts = range(10, 1000, 50)
     runtimes = []
-    expected_times = []
-    ratios = []
-    for n in node_counts:
-        max_edges = n * (n - 1)
-        num_edges = max_edges * 0.1
-        G = graph_gen_function(n, num_edges)
-
-        start_time = time.time()
-        algorithm(G)
-        runtime = time.time() - start_time
-        runtimes.append(runtime)
-
-        expected_runtime = runtime_function(n, num_edges) / 1e6  # Convert time units down
-        expected_times.append(expected_runtime)
-
-        # calculate how much faster the actual runtime is over the expected runtime
-        ratio = runtime / expected_runtime
-        ratios.append(ratio)
-
-    # find the average ratio and multiply the expected times by it to better fit the runtime curve
-    ratios.sort()
-    c = ratios[len(ratios) // 2]
-    expected_times = [t * c for t in expected_times]
+    edge_counts = []
+
+    case = BenchmarkCase(name=getattr(algorithm, '__name__', 'algorithm'),
+                         algorithm=algorithm,
+                         make_builder=None,
+                         complexity=runtime_function,
+                         complexity_label='',
+                         default_sizes=node_counts)
+
+    if isinstance(graph_gen_function, RandomGraphBuilder):
+        compact_graphs = graph_gen_function.build_many(node_counts, workers=workers)
+    else:
+        compact_graphs = None
+
+    for i, n in enumerate(node_counts):
+        if compact_graphs is not None:
+            G = compact_graphs[i].to_networkx()
+            num_edges = G.number_of_edges()
+        else:
+            max_edges = n * (n - 1)
+            num_edges = max_edges * 0.1
+            G = graph_gen_function(n, num_edges)
+
+        samples = time_algorithm(case, G, repeats, warmup)
+        runtimes.append(summarize(samples)['median_ns'] / 1e9)
+        edge_counts.append(num_edges)
+
+    expected_times = _fit_expected(node_counts, edge_counts, runtimes, runtime_function)
 
     return [(node_counts, runtimes, expected_times)]
 
 
-def plot_results(results, algorithm_name: str, expected_runtime: str, line_color: str):
-    plt.figure(figsize=(6, 4), facecolor="#16242f")
-    ax = plt.axes()
+def _fit_expected(node_counts, edge_counts, runtimes, runtime_function):
+    expected_times = [runtime_function(n, m) for n, m in zip(node_counts, edge_counts)]
+
+    # calculate how much faster the actual runtime is over the expected runtime
+    ratios = sorted(t / e for t, e in zip(runtimes, expected_times) if e > 0)
+
+    # find the median ratio and multiply the expected times by it to better fit the runtime curve
+    c = ratios[len(ratios) // 2] if len(ratios) > 0 else 0
+
+    return [t * c for t in expected_times]
+
+
+def results_to_series(results: list[dict], case: BenchmarkCase) -> list[Tuple[list, list, list]]:
+    """
+    Turn the output of `benchmark.run_benchmark` into the series drawn by `plot_results`.
+
+    :param results: Result dictionaries of a single algorithm.
+    :param case: The benchmarked algorithm, whose declared complexity is scaled to fit the measurements.
+    :return series: One tuple of node counts, median runtimes in seconds and expected runtimes per density.
+    """
+    series = []
+
+    for density in sorted({r['density'] for r in results}):
+        rows = sorted((r for r in results if r['density'] == density), key=lambda r: r['nodes'])
+
+        node_counts = [r['nodes'] for r in rows]
+        edge_counts = [r['edges'] for r in rows]
+        runtimes = [r['median_ns'] / 1e9 for r in rows]
+
+        expected_times = _fit_expected(node_counts, edge_counts, runtimes, case.complexity)
+
+        series.append((node_counts, runtimes, expected_times))
+
+    return series
+
+
+@dataclass(frozen=True)
+class ComplexityFit:
+    exponent_v: float
+    # None when every result has the same density, since E then grows as a fixed power of V
+    # and the two exponents cannot be told apart
+    exponent_e: float | None
+    r_squared: float
+    # Slope of log(runtime) against log(declared bound), 1 when the bound describes the growth exactly
+    bound_exponent: float
+    bound_r_squared: float
+    # The exponent in V the declared bound itself has over the measured graphs
+    declared_exponent_v: float
+
+    def exceeds_declared(self, tolerance: float = 0.25) -> bool:
+        return self.bound_exponent > 1 + tolerance
+
+
+def _least_squares(columns, y):
+    # Fits y = c0 + c1 * columns[0] + ..., returning the coefficients and R^2
+    X = np.column_stack([np.ones_like(y)] + list(columns))
+    coefficients, *_ = np.linalg.lstsq(X, y, rcond=None)
+
+    residual = y - X @ coefficients
+    total = y - y.mean()
+    r_squared = 1 - (residual @ residual) / (total @ total) if total @ total > 0 else 1.0
+
+    return coefficients, float(r_squared)
+
+
+def fit_complexity(results: list[dict], case: BenchmarkCase) -> ComplexityFit:
+    """
+    Estimate how the runtime of an algorithm grows with a log-log regression of the median runtimes.
+
+    The runtime is fitted as t = c * V^a * E^b (only t = c * V^a when the exponents cannot be separated),
+    and also against the declared bound as t = c * bound(V, E)^k. A k noticeably above 1 means the
+    implementation grows faster than its declared complexity.
+
+    :param results: Result dictionaries of a single algorithm from `benchmark.run_benchmark`.
+    :param case: The benchmarked algorithm, whose `complexity` is the declared bound.
+    :return fit: The fitted exponents and their coefficients of determination.
+    """
+    rows = [r for r in results if r['median_ns'] > 0 and r['nodes'] > 1 and r['edges'] > 0]
+    if len(rows) < 3:
+        raise ValueError('Need at least three non-trivial results to fit a complexity')
+
+    log_t = np.log([r['median_ns'] for r in rows])
+    log_v = np.log([r['nodes'] for r in rows])
+    log_e = np.log([r['edges'] for r in rows])
+    log_bound = np.log([case.complexity(r['nodes'], r['edges']) for r in rows])
+
+    # With a single density log(E) is (nearly) a linear function of log(V)
+    separable = len({r['density'] for r in rows}) > 1 and abs(np.corrcoef(log_v, log_e)[0, 1]) < 0.999
+
+    if separable:
+        (_, exponent_v, exponent_e), r_squared = _least_squares([log_v, log_e], log_t)
+    else:
+        (_, exponent_v), r_squared = _least_squares([log_v], log_t)
+        exponent_e = None
+
+    (_, bound_exponent), bound_r_squared = _least_squares([log_bound], log_t)
+    (_, declared_exponent_v), _ = _least_squares([log_v], log_bound)
+
+    return ComplexityFit(float(exponent_v),
+                         None if exponent_e is None else float(exponent_e),
+                         r_squared,
+                         float(bound_exponent),
+                         bound_r_squared,
+                         float(declared_exponent_v))
+
+
+def describe_fit(fit: ComplexityFit, case: BenchmarkCase, tolerance: float = 0.25) -> str:
+    if fit.exponent_e is None:
+        growth = f"t ~ V^{fit.exponent_v:.2f}"
+    else:
+        growth = f"t ~ V^{fit.exponent_v:.2f} E^{fit.exponent_e:.2f}"
+
+    verdict = 'GROWS FASTER THAN DECLARED' if fit.exceeds_declared(tolerance) else 'consistent with the declared bound'
+
+    return (f"{case.name}: {growth} (R^2 = {fit.r_squared:.3f}); "
+            f"declared {case.complexity_label} grows as V^{fit.declared_exponent_v:.2f} on these graphs; "
+            f"t ~ bound^{fit.bound_exponent:.2f} (R^2 = {fit.bound_r_squared:.3f}), {verdict}")
+
+
+def results_to_memory_series(results: list[dict]) -> list[Tuple[list, list, list]]:
+    """
+    Turn the memory measurements of `benchmark.run_benchmark` into the series drawn by `plot_results`.
+
+    :param results: Result dictionaries of a single algorithm, recorded with memory profiling on.
+    :return series: One tuple of node counts, peak allocations and graph sizes in MiB per density.
+    """
+    series = []
+
+    for density in sorted({r['density'] for r in results}):
+        rows = sorted((r for r in results if r['density'] == density), key=lambda r: r['nodes'])
+
+        node_counts = [r['nodes'] for r in rows]
+        peak_allocs = [r['peak_alloc_bytes'] / 2**20 for r in rows]
+        graph_sizes = [r['graph_bytes'] / 2**20 for r in rows]
+
+        series.append((node_counts, peak_allocs, graph_sizes))
+
+    return series
+
+
+def _style_axes(ax):
     ax.set_facecolor("#16242f")
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
@@ -57,60 +209,100 @@ def plot_results(results, algorithm_name: str, expected_runtime: str, line_color
     ax.yaxis.label.set_color('white')
     ax.tick_params(axis='y', colors='white')
 
+
+def plot_results(results, algorithm_name: str, expected_runtime: str, line_color: str, fit: ComplexityFit | None = None, memory=None):
+    if memory is None:
+        fig, ax = plt.subplots(figsize=(6, 4), facecolor="#16242f")
+    else:
+        # Draw memory usage in a second chart to the right of the runtimes
+        fig, (ax, memory_ax) = plt.subplots(1, 2, figsize=(12, 4), facecolor="#16242f")
+    _style_axes(ax)
+
     for node_counts, runtimes, expected_times in results:
         # Plot measured runtimes
-        plt.plot(node_counts, runtimes, label=f"Measured Runtime", color=line_color)
+        ax.plot(node_counts, runtimes, label=f"Measured Runtime", color=line_color)
         # Plot expected runtimes
-        plt.plot(node_counts, expected_times, linestyle="dotted", label=expected_runtime, color=line_color)
-
-    plt.xlabel("Number of Vertices ($V$)")
-    plt.ylabel("Execution Time (seconds)")
-    plt.title(f"Time Complexity of {algorithm_name.capitalize()}", color="white")
-    plt.legend(facecolor="#16242f", labelcolor='linecolor')
-    plt.xlim(10, 1000)
-    plt.ylim(0, 1)
-    plt.xticks(node_counts[::2])
+        ax.plot(node_counts, expected_times, linestyle="dotted", label=expected_runtime, color=line_color)
+
+    if fit is not None:
+        fitted = f"Fitted: $V^{{{fit.exponent_v:.2f}}}$" if fit.exponent_e is None else \
+                 f"Fitted: $V^{{{fit.exponent_v:.2f}}} E^{{{fit.exponent_e:.2f}}}$"
+        ax.text(0.02, 0.95, f"{fitted} ($R^2$ = {fit.r_squared:.3f})", transform=ax.transAxes, color='white', va='top')
+
+    ax.set_xlabel("Number of Vertices ($V$)")
+    ax.set_ylabel("Execution Time (seconds)")
+    ax.set_title(f"Time Complexity of {algorithm_name.capitalize()}", color="white")
+    ax.legend(facecolor="#16242f", labelcolor='linecolor')
+    ax.set_xlim(min(node_counts), max(node_counts))
+    ax.set_ylim(bottom=0)
+    ax.set_xticks(node_counts[::2])
+
+    if memory is not None:
+        _style_axes(memory_ax)
+
+        for node_counts, peak_allocs, graph_sizes in memory:
+            memory_ax.plot(node_counts, peak_allocs, label="Peak Allocation", color=line_color)
+            memory_ax.plot(node_counts, graph_sizes, linestyle="dashed", label="Input Graph", color=line_color)
+
+        memory_ax.set_xlabel("Number of Vertices ($V$)")
+        memory_ax.set_ylabel("Memory (MiB)")
+        memory_ax.set_title(f"Memory Usage of {algorithm_name.capitalize()}", color="white")
+        memory_ax.legend(facecolor="#16242f", labelcolor='linecolor')
+        memory_ax.set_xlim(min(node_counts), max(node_counts))
+        memory_ax.set_ylim(bottom=0)
+        memory_ax.set_xticks(node_counts[::2])
+
+    fig.tight_layout()
     plt.savefig(f"src/algorithms/{algorithm_name}_time_complexity.png")
     plt.show()
 
 
-def main():
-    # Intended usage using prims algorithm as an example:
-    from prims import prims
-    from random_graph import RandomGraphBuilder
+PLOT_STYLES = {
+    'prims': ('prims', '#eb8fd8'),
+    'bellman_ford': ('Bellman-Ford', '#13ff50'),
+    'shortest_paths': ('shortest_paths', '#f2c14e'),
+    'girvan_newman': ('girvan_newman', '#b9d4b4'),
+    'ramsey': ('ramsey', '#8fc8eb'),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Plot measured against expected runtime for one algorithm.')
+    parser.add_argument('algorithm', nargs='?', default='prims', choices=list(CASES))
+    parser.add_argument('--densities', type=lambda text: [float(p) for p in text.split(',')], default=[0.1],
+                        help='Comma separated edge probabilities, more than one lets V and E be fitted separately')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--save', nargs='?', const='', metavar='NAME',
+                        help='Store the run in the benchmark history, optionally under NAME')
+    args = parser.parse_args(argv)
+
+    case = CASES[args.algorithm]
 
-    algorithm = prims
+    results = run_benchmark(case, densities=args.densities, repeats=args.repeats, seed=args.seed)
 
-    def graph_gen_function(num_nodes, num_edges):
-        max_edges = (num_nodes * (num_nodes - 1)) // 2
-        edge_density = num_edges / max_edges
+    if args.save is not None:
+        config = {'algorithms': [case.name], 'densities': args.densities, 'repeats': args.repeats, 'seed': args.seed}
+        ResultStore().save(make_document(results, config), args.save or None)
 
-        return RandomGraphBuilder() \
-               .nodes(num_nodes) \
-               .random_edges(edge_density) \
-               .weighted(range(1, 100)) \
-               .build()
+    series = results_to_series(results, case)
+    print(series)
 
-    def runtime_function(num_nodes, num_edges):
-        return num_edges * np.log(num_nodes)
+    fit = fit_complexity(results, case)
+    print(describe_fit(fit, case))
 
-    count = 0
-    while True:
-        MAX_ATTEMPTS = 50
-        if count > MAX_ATTEMPTS:
-            raise Exception(f"Failed to generate a valid graph after {MAX_ATTEMPTS} attempts")
-        count += 1
+    memory = results_to_memory_series(results)
+    for r in results:
+        print(f"V={r['nodes']:<6} E={r['edges']:<8} peak={r['peak_alloc_bytes'] / 2**20:8.2f}MiB  "
+              f"graph={r['bytes_per_edge']:7.1f}B/edge")
 
-        try:
-            results = measure_runtime(algorithm, graph_gen_function, runtime_function)
-            print(results)
-            break
-        except:
-            pass
+    algorithm_name, line_color = PLOT_STYLES[case.name]
 
-    plot_results(results, algorithm.__name__, \
-                 expected_runtime="Expected Runtime: $O(|E| \log |V|)$", \
-                 line_color="#eb8fd8"\
+    plot_results(series, algorithm_name, \
+                 expected_runtime=f"Expected Runtime: {case.complexity_label}", \
+                 line_color=line_color, \
+                 fit=fit, \
+                 memory=memory\
                 )
 
 
@@ -0,0 +1,207 @@
+"""
+Compressed sparse row (CSR) snapshot of a graph, so algorithms can work on NumPy arrays
+instead of each converting networkx's dict-of-dicts on their own.
+
+The arrays of a snapshot can be copied into shared memory once and attached to by
+worker processes without copying them again, see CSRGraph.share.
+"""
+from collections.abc import Hashable, Iterable
+from multiprocessing import shared_memory
+import networkx as nx
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Immutable array form of a graph. Nodes are numbered 0 to n - 1 in the order of labels,
+    and the neighbors of node i are neighbors[offsets[i]:offsets[i + 1]], sorted, with the
+    weights of the edges to them in the same slice of weights.
+
+    An undirected edge is stored in both directions, except for self loops, which are
+    stored once like in networkx's adjacency.
+    """
+    def __init__(self, directed: bool, labels: Iterable[Hashable], offsets: np.ndarray,
+                 neighbors: np.ndarray, weights: np.ndarray, _buffer=None):
+        self.directed = directed
+        self.labels = tuple(labels)
+        self.ids = {label: i for i, label in enumerate(self.labels)}
+
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        for array in (offsets, neighbors, weights):
+            array.flags.writeable = False
+
+        # The shared memory the arrays are views of, if any, which has to stay open as long as they do
+        self._buffer = _buffer
+
+    @classmethod
+    def from_edges(cls, labels: Iterable[Hashable], edges, weights=None, directed: bool = True):
+        """
+        :param labels: The label of every node, in the order of their ids
+        :param edges: Pairs of node ids, as an (m, 2) array or a list of pairs
+        :param weights: The weight of every edge, all 1 if not given
+        :param directed: Whether edges only lead from their first node to their second
+        :return: The snapshot. Of an edge given more than once only the first is kept, which
+            includes the same edge given in both directions when the graph isn't directed
+        """
+        labels = tuple(labels)
+        n = len(labels)
+
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        weights = np.ones(len(edges)) if weights is None else np.asarray(weights, dtype=float).reshape(-1)
+
+        if not directed:
+            edges = np.sort(edges, axis=1)
+
+        # np.unique keeps the first of every pair, and sorts them by source then target
+        _, first = np.unique(edges[:, 0] * n + edges[:, 1], return_index=True)
+        edges, weights = edges[first], weights[first]
+
+        if not directed:
+            reverse = edges[:, 0] != edges[:, 1]
+            edges = np.vstack([edges, edges[reverse, ::-1]])
+            weights = np.concatenate([weights, weights[reverse]])
+
+            order = np.argsort(edges[:, 0] * n + edges[:, 1])
+            edges, weights = edges[order], weights[order]
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edges[:, 0], minlength=n), out=offsets[1:])
+
+        return cls(directed, labels, offsets, np.ascontiguousarray(edges[:, 1]), weights)
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph | nx.DiGraph, directed: bool | None = None,
+                      weight: str = 'weight', default: float = 1.0):
+        """
+        :param graph: The networkx Graph or DiGraph object
+        :param directed: Whether to take the edges as directed, defaults to whether the graph is
+        :param weight: The edge attribute holding the weights
+        :param default: The weight of edges without the attribute
+        """
+        if directed is None:
+            directed = graph.is_directed()
+
+        labels = list(graph.nodes)
+        ids = {label: i for i, label in enumerate(labels)}
+
+        data = list(graph.edges(data=weight, default=default))
+        edges = np.array([(ids[u], ids[v]) for u, v, _ in data], dtype=np.int64).reshape(-1, 2)
+        weights = np.array([w for _, _, w in data], dtype=float)
+
+        return cls.from_edges(labels, edges, weights, directed)
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.labels)
+
+    @property
+    def number_of_edges(self) -> int:
+        if self.directed:
+            return len(self.neighbors)
+
+        # Every edge but the self loops is stored twice
+        loops = int((self.sources() == self.neighbors).sum())
+        return (len(self.neighbors) + loops) // 2
+
+    def degrees(self) -> np.ndarray:
+        """
+        :return: The number of neighbors of every node, or the out-degrees of a directed graph
+        """
+        return np.diff(self.offsets)
+
+    def sources(self) -> np.ndarray:
+        """
+        :return: The node every entry of neighbors and weights is a neighbor of
+        """
+        return np.repeat(np.arange(self.number_of_nodes), self.degrees())
+
+    def neighbors_of(self, node: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :param node: A node id
+        :return: The ids of the node's neighbors and the weights of the edges to them
+        """
+        start, stop = self.offsets[node], self.offsets[node + 1]
+        return self.neighbors[start:stop], self.weights[start:stop]
+
+    def to_networkx(self) -> nx.Graph | nx.DiGraph:
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+
+        graph.add_nodes_from(self.labels)
+        graph.add_weighted_edges_from((self.labels[u], self.labels[v], w) for u, v, w in
+                                      zip(self.sources().tolist(), self.neighbors.tolist(), self.weights.tolist()))
+
+        return graph
+
+    def share(self) -> 'SharedCSR':
+        """
+        Copy the arrays into shared memory, for worker processes to attach to.
+        """
+        return SharedCSR(self)
+
+
+class SharedCSR:
+    """
+    A CSRGraph in shared memory. Pickling it only sends the name of the memory block along
+    with the labels, so it can be handed to worker processes, which call attach to get a
+    CSRGraph whose arrays are views of the shared block.
+
+    The process that shared the graph owns the block and has to call unlink once the
+    workers are done with it, or use the handle as a context manager.
+    """
+    def __init__(self, graph: CSRGraph):
+        self.directed = graph.directed
+        self.labels = graph.labels
+        self.nodes = len(graph.offsets) - 1
+        self.entries = len(graph.neighbors)
+
+        self._memory = shared_memory.SharedMemory(create=True, size=max(self._size(), 1))
+        self.name = self._memory.name
+
+        offsets, neighbors, weights = self._views(self._memory.buf)
+        offsets[:] = graph.offsets
+        neighbors[:] = graph.neighbors
+        weights[:] = graph.weights
+
+    def _size(self):
+        # The offsets and neighbors are int64 and the weights float64, 8 bytes each
+        return 8 * ((self.nodes + 1) + 2 * self.entries)
+
+    def _views(self, buffer):
+        offsets = np.ndarray(self.nodes + 1, dtype=np.int64, buffer=buffer)
+        neighbors = np.ndarray(self.entries, dtype=np.int64, buffer=buffer, offset=offsets.nbytes)
+        weights = np.ndarray(self.entries, dtype=np.float64, buffer=buffer, offset=offsets.nbytes + neighbors.nbytes)
+
+        return offsets, neighbors, weights
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_memory'] = None
+        return state
+
+    def attach(self) -> CSRGraph:
+        """
+        :return: The graph, with its arrays in the shared block rather than copied out of it
+        """
+        memory = self._memory
+        if memory is None:
+            memory = shared_memory.SharedMemory(name=self.name)
+
+        return CSRGraph(self.directed, self.labels, *self._views(memory.buf), _buffer=memory)
+
+    def unlink(self):
+        """
+        Free the shared block. Only the process that shared the graph may call this, and
+        graphs it attached to the block itself have to be let go of first.
+        """
+        if self._memory is not None:
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
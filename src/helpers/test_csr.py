@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+import unittest
+import networkx as nx
+import numpy as np
+
+from csr import CSRGraph
+
+
+def adjacency(csr):
+    return {csr.labels[u]: {csr.labels[v]: w for v, w in zip(*map(np.ndarray.tolist, csr.neighbors_of(u)))}
+            for u in range(csr.number_of_nodes)}
+
+
+def attached_adjacency(shared):
+    # Run in a worker process, which only gets the name of the shared block
+    return adjacency(shared.attach())
+
+
+class TestCSRGraph(unittest.TestCase):
+    def test_matches_networkx(self):
+        for graph in (nx.gnp_random_graph(50, 0.1, seed=0), nx.gnp_random_graph(50, 0.1, seed=0, directed=True)):
+            for u, v in graph.edges:
+                graph[u][v]['weight'] = u * 100 + v
+            graph.add_edge(3, 3, weight=7)
+            graph = nx.relabel_nodes(graph, {i: f'v{i}' for i in graph})
+
+            csr = CSRGraph.from_networkx(graph)
+            expected = {u: {v: data['weight'] for v, data in neighbors.items()} for u, neighbors in graph.adj.items()}
+
+            self.assertEqual(adjacency(csr), expected)
+            self.assertEqual(csr.number_of_edges, graph.number_of_edges())
+            self.assertEqual(csr.ids['v3'], csr.labels.index('v3'))
+            self.assertTrue(nx.utils.graphs_equal(csr.to_networkx(), graph))
+
+    def test_directed_as_undirected(self):
+        graph = nx.DiGraph()
+        graph.add_edge(0, 1, weight=2)
+        graph.add_edge(1, 0, weight=5)
+        graph.add_edge(1, 2)
+        graph.add_node(3)
+
+        csr = CSRGraph.from_networkx(graph, directed=False)
+
+        # Both directions of an edge are one edge, with the weight of whichever came first
+        self.assertEqual(adjacency(csr), {0: {1: 2}, 1: {0: 2, 2: 1}, 2: {1: 1}, 3: {}})
+        self.assertEqual(csr.number_of_edges, 2)
+
+    def test_immutable(self):
+        csr = CSRGraph.from_edges('abc', [(0, 1), (1, 2)])
+
+        with self.assertRaises(ValueError):
+            csr.weights[0] = 3
+
+    def test_share(self):
+        csr = CSRGraph.from_edges(range(4), [(2, 0), (0, 1), (3, 3)], [1.5, 2.5, 3.5], directed=True)
+
+        with csr.share() as shared:
+            # What a worker process would receive
+            attached = pickle.loads(pickle.dumps(shared)).attach()
+
+            for name in ('offsets', 'neighbors', 'weights'):
+                np.testing.assert_array_equal(getattr(attached, name), getattr(csr, name))
+            self.assertEqual(attached.labels, csr.labels)
+            self.assertFalse(attached.weights.flags.writeable)
+
+            del attached
+
+    def test_share_with_workers(self):
+        graph = nx.gnp_random_graph(40, 0.2, seed=0, directed=True)
+        for u, v in graph.edges:
+            graph[u][v]['weight'] = u - v / 100
+        csr = CSRGraph.from_networkx(graph)
+
+        with csr.share() as shared, ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(attached_adjacency, [shared] * 4))
+
+        for result in results:
+            self.assertEqual(result, adjacency(csr))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,13 +15,30 @@ def validateWeight(weight: str):
     except ValueError:
         pass
 
+class ArrowHead(QGraphicsPolygonItem):
+    # Arrowheads shorter than this many pixels on screen are just noise on the end of the line
+    MIN_HEIGHT = 4
+
+    def paint(self, painter, option, widget):
+        # Whether the graph is directed is checked here, so switching doesn't have to touch every edge
+        graph = self.parentItem().parentItem()
+        if graph is not None and not graph.isDirected:
+            return
+
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if Edge.ARROW_HEIGHT * lod < self.MIN_HEIGHT:
+            return
+
+        super().paint(painter, option, widget)
+
+
 class Edge(QGraphicsItemGroup):
     ARROW_HEIGHT = 25
     ARROW_WIDTH = 20
 
     _created = 0
 
-    def __init__(self, originVertex, linkVertex, directed=True, weight=None, doOffset=False):
+    def __init__(self, originVertex, linkVertex, weight=None, doOffset=False):
         super().__init__()
 
         isWeighted = weight is not None
@@ -65,13 +82,11 @@ class Edge(QGraphicsItemGroup):
         self._weight = _weight
 
         # Handle arrowHead
-        self._arrowHead = QGraphicsPolygonItem(self.getArrow(), self)
+        self._arrowHead = ArrowHead(self.getArrow(), self)
         self._arrowHead.setBrush(QBrush(self._color))
         self._arrowHead.setZValue(-1)
 
         self.addToGroup(self._arrowHead)
-
-        self._arrowHead.setOpacity(1.0 if directed else 0.0)
     
     @property
     def color(self):
@@ -157,7 +172,17 @@ class Edge(QGraphicsItemGroup):
 
         return QPolygonF([tip, leftWing, rightWing])
 
+    def boundingRect(self):
+        # QGraphicsItemGroup only updates its bounds when children are added, not when they move
+        return self.childrenBoundingRect()
+
+    def shape(self):
+        # Hit testing goes by the wide hit box instead of the whole bounding rect
+        return self._hitBox.shape()
+
     def updatePosition(self):
+        self.prepareGeometryChange()
+
         origin, link = self.getEndpoints()
         self._visibleLine.setLine(origin.x(), origin.y(), link.x(), link.y())
         self._hitBox.setLine(origin.x(), origin.y(), link.x(), link.y())
@@ -166,15 +191,5 @@ class Edge(QGraphicsItemGroup):
         # Handle arrowHead
         self._arrowHead.setPolygon(self.getArrow())
 
-    def remove(self, call_backend=True, caller=None):
-        group = self.parentItem()
-
-        self.scene().removeItem(self)
-        group.removeFromGroup(self, call_backend)
-       
-        # need caller so we don't mutate a list that
-        # is being iterated through in Vertex.remove()
-        if caller is not self._originVertex:
-            self._originVertex._edges.remove(self)
-        if caller is not self._linkVertex:
-            self._linkVertex._edges.remove(self)
+    def remove(self):
+        self.parentItem().removeMany([self])
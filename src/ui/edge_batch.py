@@ -0,0 +1,298 @@
+import struct
+import numpy as np
+from PyQt6.QtCore import Qt, QByteArray, QDataStream, QPointF, QRectF
+from PyQt6.QtGui import QBrush, QColor, QPainterPath, QPen
+from PyQt6.QtWidgets import QGraphicsItem
+
+from ui.edge import ArrowHead, Edge
+from ui.text_items import MIN_TEXT_HEIGHT
+
+
+# QPainterPath element types, as written to a QDataStream
+_MOVE_TO = 0
+_LINE_TO = 1
+
+_ELEMENT = np.dtype([('type', '>i4'), ('x', '>f8'), ('y', '>f8')])
+
+
+def _pathFromPoints(points, types) -> QPainterPath:
+    # Building a path element by element from Python costs about a microsecond per element,
+    # so the path's serialized form is written with numpy instead and read back by Qt
+    elements = np.empty(len(points), dtype=_ELEMENT)
+    elements['type'] = types
+    elements['x'] = points[:, 0]
+    elements['y'] = points[:, 1]
+
+    # Serialized as the element count, the elements, the start of the last subpath and the fill rule
+    lastStart = len(points) - 1 - np.argmax(types[::-1] == _MOVE_TO) if len(points) > 0 else 0
+    data = struct.pack('>i', len(points)) + elements.tobytes() + struct.pack('>ii', lastStart, 0)
+
+    path = QPainterPath()
+    QDataStream(QByteArray(data)) >> path
+    return path
+
+
+def linesPath(lines) -> QPainterPath:
+    """
+    :param lines: An (n, 4) array of x1, y1, x2, y2 rows
+    :return: A path of n separate line segments
+    """
+    types = np.tile(np.array([_MOVE_TO, _LINE_TO]), len(lines))
+    return _pathFromPoints(lines.reshape(-1, 2), types)
+
+
+def trianglesPath(triangles) -> QPainterPath:
+    """
+    :param triangles: An (n, 6) array holding the three corners of a triangle per row
+    :return: A path of n closed triangles
+    """
+    closed = np.hstack([triangles, triangles[:, :2]])
+    types = np.tile(np.array([_MOVE_TO, _LINE_TO, _LINE_TO, _LINE_TO]), len(triangles))
+    return _pathFromPoints(closed.reshape(-1, 2), types)
+
+
+class EdgeBatchRenderer(QGraphicsItem):
+    """
+    Draws a large number of edges as one item, instead of the four scene items every
+    Edge is made of. The geometry of every edge is copied out of its Edge into arrays,
+    which are turned into one painter path per color for every chunk of rows, so a
+    change only rebuilds the paths of the chunk it falls in.
+
+    The Edge items stay in the scene, hidden, for hit testing. An edge can be detached
+    from the batch, e.g. while it is hovered, in which case its own item draws it.
+    """
+    CHUNK_SIZE = 4096
+    LINE_WIDTH = 3
+    # Weight labels are skipped when more than this many are exposed, they'd be unreadable
+    MAX_LABELS = 2000
+
+    def __init__(self, directed=True):
+        super().__init__()
+
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+        self._directed = directed
+
+        self._edges = []
+        self._rows = {}
+
+        self._lines = np.empty((0, 4))
+        self._arrows = np.empty((0, 6))
+        self._labelPositions = np.empty((0, 2))
+        self._labels = []
+        self._labelled = np.empty(0, dtype=bool)
+        self._colors = np.empty(0, dtype=np.int32)
+        self._detached = np.empty(0, dtype=bool)
+
+        # Colors are stored per edge as an index into the palette
+        self._palette = [QColor(Qt.GlobalColor.black)]
+        self._paletteIndex = {self._palette[0].rgba(): 0}
+
+        self._chunkPaths = {}
+        self._bounds = None
+
+    def _grow(self, count):
+        capacity = len(self._colors)
+        if count <= capacity:
+            return
+
+        capacity = max(count, capacity * 2, 64)
+        extra = capacity - len(self._colors)
+
+        self._lines = np.vstack([self._lines, np.zeros((extra, 4))])
+        self._arrows = np.vstack([self._arrows, np.zeros((extra, 6))])
+        self._labelPositions = np.vstack([self._labelPositions, np.zeros((extra, 2))])
+        self._labelled = np.concatenate([self._labelled, np.zeros(extra, dtype=bool)])
+        self._colors = np.concatenate([self._colors, np.zeros(extra, dtype=np.int32)])
+        self._detached = np.concatenate([self._detached, np.zeros(extra, dtype=bool)])
+
+    def _colorIndex(self, color):
+        color = QColor(color)
+        index = self._paletteIndex.get(color.rgba())
+        if index is None:
+            index = len(self._palette)
+            self._palette.append(color)
+            self._paletteIndex[color.rgba()] = index
+
+        return index
+
+    def _dirty(self, row):
+        self._chunkPaths.pop(row // self.CHUNK_SIZE, None)
+
+    def _geometryChanged(self):
+        self.prepareGeometryChange()
+        self._bounds = None
+
+    def _read(self, row, edge):
+        line = edge.line()
+        self._lines[row] = (line.x1(), line.y1(), line.x2(), line.y2())
+
+        arrow = edge._arrowHead.polygon()
+        self._arrows[row] = [c for i in range(3) for c in (arrow[i].x(), arrow[i].y())]
+
+        label = edge._weightText
+        position = label.pos()
+        self._labelPositions[row] = (position.x(), position.y() + label.boundingRect().height() * 0.8)
+        self._labels[row] = label.text()
+        self._labelled[row] = label.isVisibleTo(edge)
+
+        self._dirty(row)
+
+    def addEdges(self, edges):
+        edges = [e for e in edges if e not in self._rows]
+        if len(edges) == 0:
+            return
+
+        self._grow(len(self._edges) + len(edges))
+
+        for edge in edges:
+            row = len(self._edges)
+            self._edges.append(edge)
+            self._labels.append('')
+            self._rows[edge] = row
+
+            self._colors[row] = self._colorIndex(edge.color)
+            self._detached[row] = False
+            self._read(row, edge)
+
+        self._geometryChanged()
+
+    def removeEdge(self, edge):
+        row = self._rows.pop(edge, None)
+        if row is None:
+            return
+
+        # Fill the hole with the last row
+        last = len(self._edges) - 1
+        if row != last:
+            moved = self._edges[last]
+            self._edges[row] = moved
+            self._rows[moved] = row
+            self._labels[row] = self._labels[last]
+            for array in (self._lines, self._arrows, self._labelPositions, self._labelled, self._colors, self._detached):
+                array[row] = array[last]
+
+        self._edges.pop()
+        self._labels.pop()
+
+        self._dirty(row)
+        self._dirty(last)
+        self._geometryChanged()
+
+    def updateEdges(self, edges):
+        """
+        Copy the geometry and labels of edges that changed, e.g. because their endpoints moved.
+        """
+        for edge in edges:
+            row = self._rows.get(edge)
+            if row is not None:
+                self._read(row, edge)
+
+        self._geometryChanged()
+
+    def setColor(self, edges, color):
+        index = self._colorIndex(color)
+
+        for edge in edges:
+            row = self._rows.get(edge)
+            if row is not None and self._colors[row] != index:
+                self._colors[row] = index
+                self._dirty(row)
+
+        self.update()
+
+    def setDetached(self, edge, detached):
+        """
+        Leave an edge to be drawn by its own item, or take it back into the batch.
+        """
+        row = self._rows.get(edge)
+        if row is not None and self._detached[row] != detached:
+            self._detached[row] = detached
+            self._dirty(row)
+            self.update()
+
+    def setDirected(self, directed):
+        self._directed = directed
+        self.update()
+
+    def boundingRect(self):
+        count = len(self._edges)
+        if count == 0:
+            return QRectF()
+
+        if self._bounds is None:
+            xs = np.concatenate([self._lines[:count, 0::2].ravel(), self._arrows[:count, 0::2].ravel()])
+            ys = np.concatenate([self._lines[:count, 1::2].ravel(), self._arrows[:count, 1::2].ravel()])
+            # Leave room for the pen and the weight labels
+            margin = 30
+            self._bounds = QRectF(xs.min() - margin, ys.min() - margin,
+                                  xs.max() - xs.min() + 2 * margin, ys.max() - ys.min() + 2 * margin)
+
+        return self._bounds
+
+    def _buildChunk(self, chunk):
+        start = chunk * self.CHUNK_SIZE
+        stop = min(start + self.CHUNK_SIZE, len(self._edges))
+
+        colors = self._colors[start:stop]
+        drawn = ~self._detached[start:stop]
+
+        paths = []
+        for index in np.unique(colors[drawn]):
+            rows = drawn & (colors == index)
+            lines = linesPath(self._lines[start:stop][rows])
+            arrows = trianglesPath(self._arrows[start:stop][rows])
+            paths.append((int(index), lines, arrows))
+
+        self._chunkPaths[chunk] = paths
+        return paths
+
+    def paint(self, painter, option, widget):
+        count = len(self._edges)
+        chunks = (count + self.CHUNK_SIZE - 1) // self.CHUNK_SIZE
+
+        paths = []
+        for chunk in range(chunks):
+            chunkPaths = self._chunkPaths.get(chunk)
+            if chunkPaths is None:
+                chunkPaths = self._buildChunk(chunk)
+            paths.extend(chunkPaths)
+
+        # Highlighted edges go on top of the plain ones, whichever chunk they are in
+        paths.sort(key=lambda p: p[0])
+
+        # Arrowheads and labels are left out once they'd be too small to make out
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        drawArrows = self._directed and Edge.ARROW_HEIGHT * lod >= ArrowHead.MIN_HEIGHT
+
+        for index, lines, arrows in paths:
+            color = self._palette[index]
+
+            painter.setPen(QPen(color, self.LINE_WIDTH))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawPath(lines)
+
+            if drawArrows:
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QBrush(color))
+                painter.drawPath(arrows)
+
+        if painter.fontMetrics().height() * lod >= MIN_TEXT_HEIGHT:
+            self._paintLabels(painter, option.exposedRect)
+
+    def _paintLabels(self, painter, exposed):
+        count = len(self._edges)
+        positions = self._labelPositions[:count]
+
+        visible = (self._labelled[:count] & ~self._detached[:count]
+                   & (positions[:, 0] >= exposed.left()) & (positions[:, 0] <= exposed.right())
+                   & (positions[:, 1] >= exposed.top()) & (positions[:, 1] <= exposed.bottom()))
+
+        rows = np.flatnonzero(visible)
+        if len(rows) > self.MAX_LABELS:
+            return
+
+        painter.setPen(QPen(Qt.GlobalColor.black))
+        for row in rows.tolist():
+            x, y = positions[row]
+            painter.drawText(QPointF(x, y), self._labels[row])
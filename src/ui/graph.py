@@ -1,48 +1,181 @@
+from contextlib import ExitStack, contextmanager
+from itertools import islice
 from typing import Optional
 import networkx as nx
-from PyQt6.QtCore import Qt, QRectF
+import numpy as np
+from PyQt6.QtCore import Qt, QRectF, QTimer
 from PyQt6.QtGui import QTransform
-from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsScene
 
+from algorithms.force_layout import force_layout
+from helpers.csr import CSRGraph
 from ui.edge import Edge
+from ui.edge_batch import EdgeBatchRenderer
+from ui.hit_grid import HitGrid
 from ui.vertex import Vertex
 
+# Number of vertices and edges added per turn of the event loop by importCompact
+IMPORT_CHUNK_SIZE = 250
+# Above this many edges they are all drawn by one EdgeBatchRenderer instead of an item each.
+# Below half of it they go back to their own items
+EDGE_BATCH_THRESHOLD = 2000
+# Milliseconds between updates of the edges of moving vertices, about once per frame at 60 fps
+MOVE_UPDATE_INTERVAL = 16
+# Scene distance between vertices joined by an edge in layouts from force_layout
+LAYOUT_SPACING = 150
+# Removing more items than this at once turns the scene's index off until done, rebuilding
+# it costs about as much as taking that many items out of it one at a time
+REINDEX_THRESHOLD = 1000
+
+
+def toScenePositions(positions):
+    """
+    Scale positions from force_layout, where edges are about one unit long, to the scene's
+    coordinates, with the top left vertex a little way off the origin.
+    """
+    if len(positions) == 0:
+        return positions
+
+    return (positions - positions.min(axis=0) + 1) * LAYOUT_SPACING
+
+
+def layoutPositions(graph, progress=None) -> dict:
+    """
+    Lay a graph out with the force-directed layout, scaled to the scene's coordinates.
+    Doesn't touch any graphics items, so it is safe to call from a background thread.
+    :param progress: Called with the fraction of the layout done
+    :return: A dictionary mapping every node to an (x, y) pair
+    """
+    nodes = list(graph.nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = [(index[origin], index[link]) for origin, link in graph.edges()]
+
+    positions = toScenePositions(force_layout(len(nodes), edges, progress=progress))
+    return dict(zip(nodes, positions.tolist()))
+
+
+class _ChunkedImport:
+    # Drives GraphScene._compactItems a slice at a time from single shot timers
+    def __init__(self, graphScene, items, total, chunkSize, progress, finished):
+        self._graphScene = graphScene
+        self._items = items
+        self._total = total
+        self._done = 0
+        self._chunkSize = chunkSize
+        self._progress = progress
+        self._finished = finished
+        self._cancelled = False
+
+        # The whole import is one batch: repainting the view after every chunk would redraw
+        # everything added so far, and indexing each new item costs more than adding it.
+        # The rest of the window stays responsive in the meantime.
+        self._batch = ExitStack()
+        self._batch.enter_context(graphScene.batchedUpdate(reindex=True))
+
+    def start(self):
+        QTimer.singleShot(0, self.step)
+
+    def cancel(self):
+        self._cancelled = True
+
+    def step(self):
+        # A timer can still fire after a cancelled import has been wrapped up
+        if self._graphScene._pendingImport is not self:
+            return
+
+        if not self._cancelled:
+            added = sum(1 for _ in islice(self._items, self._chunkSize))
+            self._done += added
+
+            if added == self._chunkSize:
+                if self._progress is not None:
+                    self._progress(self._done / max(self._total, 1))
+                QTimer.singleShot(0, self.step)
+                return
+
+        self._batch.close()
+        self._graphScene._endImport()
+
+        if self._finished is not None:
+            self._finished()
+
+
 class ItemGroup(QGraphicsItem):
     def __init__(self):
         super().__init__()
 
-        self._items = []
+        # The group draws nothing itself, only its items do
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemHasNoContents)
+
+        # Used as an insertion ordered set, so items can be removed in constant time
+        self._items = {}
+
+        # The bounds of every item in the group's coordinates, and their union. The union only
+        # grows as items are added or moved, and is recomputed lazily when an item that
+        # defined its edge is removed or moved inwards
+        self._itemBounds = {}
+        self._bounds = QRectF()
+        self._boundsValid = True
 
     def addToGroup(self, item):
         item.setParentItem(self)
-        self._items.append(item)
+        self._items[item] = None
+        self.itemMoved(item)
 
     def removeFromGroup(self, item):
         item.setParentItem(None)
-        self._items.remove(item)
+        del self._items[item]
+
+        rect = self._itemBounds.pop(item, None)
+        if rect is not None and self._onBoundary(rect):
+            self._invalidateBounds()
+
+    def clearGroup(self):
+        # For when the items have already been taken out of the scene
+        self._items.clear()
+        self._itemBounds.clear()
+        self._invalidateBounds()
+
+    def itemMoved(self, item):
+        """
+        Update the group's bounds after an item was added, moved or changed shape.
+        """
+        rect = item.mapRectToParent(item.boundingRect())
+        old = self._itemBounds.get(item)
+        self._itemBounds[item] = rect
+
+        if not self._boundsValid:
+            return
+
+        if old is not None and self._onBoundary(old):
+            self._invalidateBounds()
+        elif len(self._itemBounds) == 1:
+            self.prepareGeometryChange()
+            self._bounds = rect
+        elif not self._bounds.contains(rect):
+            self.prepareGeometryChange()
+            self._bounds = self._bounds.united(rect)
+
+    def _onBoundary(self, rect):
+        b = self._bounds
+        return (rect.left() <= b.left() or rect.top() <= b.top()
+                or rect.right() >= b.right() or rect.bottom() >= b.bottom())
+
+    def _invalidateBounds(self):
+        if self._boundsValid:
+            self.prepareGeometryChange()
+            self._boundsValid = False
 
     def boundingRect(self):
-        if len(self._items) == 0:
-            return QRectF(0, 0, 0, 0)
-
-        rect = self._items[0].boundingRect().translated(0, 0)
-
-        for item in self._items:
-            top = item.boundingRect().top()
-            bottom = item.boundingRect().bottom()
-            left = item.boundingRect().left()
-            right = item.boundingRect().right()
-
-            if rect.top() > top:
-                rect.setTop(top)
-            if rect.bottom() < bottom:
-                rect.setBottom(bottom)
-            if rect.left() > left:
-                rect.setLeft(left)
-            if rect.right() < right:
-                rect.setRight(right)
-
-        return rect
+        if not self._boundsValid:
+            bounds = QRectF()
+            for rect in self._itemBounds.values():
+                bounds = rect if bounds.isNull() else bounds.united(rect)
+
+            self._bounds = bounds
+            self._boundsValid = True
+
+        return self._bounds
     
     def translate(self, dx, dy):
         transform = QTransform()
@@ -59,106 +192,417 @@ class GraphScene(ItemGroup):
     def __init__(self, graph: Optional[nx.Graph | nx.DiGraph]):
         super().__init__()
 
-        # List of vertices and edges created. Can possibly make it a set?
-        self._vertexList = []
-        self._edgeList = []
+        # Vertices by label and edges by (origin label, link label), in the order they were added
+        self._vertexIndex = {}
+        self._edgeIndex = {}
+
+        # Where every vertex and edge is, for finding what was clicked on
+        self._hitGrid = HitGrid()
+
+        # Draws the edges of large graphs, see _updateEdgeBatching
+        self._edgeBatch = None
+        self._hoveredEdge = None
+
+        # Every edge is kept in the direction it was drawn, whether or not the graph is directed.
+        # While it isn't, the graph property hands out an undirected copy, made when first asked for
+        self._graph = nx.DiGraph()
+        self._undirectedGraph = None
+        # Counts the changes to the graph, so results computed from it can be told apart
+        self._version = 0
+        # The last CSR snapshot of the graph, and the version and directedness it was made for
+        self._csr = None
+        self._csrKey = None
+        # The smallest edge weight, and the version it was found for
+        self._minWeight = None
+        self._minWeightVersion = None
+        # Called with the vertices and edges added and removed by every edit, mapped to whether
+        # they keep a highlight up to date, in which case they are dropped along with the colors
+        self._editListeners = {}
 
         self._isWeighted = True
-        self._isDirected = True
+        self._isDirected = True if graph is None else graph.is_directed()
 
         self._originVertex = None
 
+        self._batchDepth = 0
+        self._pendingImport = None
+
+        # Vertices that moved since their edges were last updated
+        self._movedVertices = set()
+        self._moveTimer = QTimer()
+        self._moveTimer.setSingleShot(True)
+        self._moveTimer.setInterval(MOVE_UPDATE_INTERVAL)
+        self._moveTimer.timeout.connect(self.updateMovedVertices)
+
         if graph is not None:
-            self._graph = graph
             self.importGraph(graph)
-        else:
-            self._graph = nx.DiGraph()
 
         self._coloredVertices = set()
         self._coloredEdges = set()
 
     @property
     def graph(self):
-        return self._graph
+        if self._isDirected:
+            return self._graph
+
+        if self._undirectedGraph is None:
+            self._undirectedGraph = self._graph.to_undirected()
+        return self._undirectedGraph
+
+    @property
+    def isDirected(self) -> bool:
+        return self._isDirected
+
+    @property
+    def version(self) -> int:
+        """
+        Goes up every time a vertex or an edge is added or removed. Directedness is not part
+        of it, since toggling it doesn't change which vertices and edges there are.
+        """
+        return self._version
+
+    def csr(self) -> CSRGraph:
+        """
+        :return: The graph as arrays, made at most once for every version. It never changes,
+            so it can be handed to background threads without copying it
+        """
+        key = (self._version, self._isDirected)
+        if self._csrKey != key:
+            self._csr = CSRGraph.from_networkx(self._graph, directed=self._isDirected)
+            self._csrKey = key
+
+        return self._csr
+
+    def minWeight(self) -> float:
+        """
+        :return: The smallest weight of the edges as drawn, 0 without edges, looked up at most
+            once for every version
+        """
+        if self._minWeightVersion != self._version:
+            self._minWeight = min((edge.weight for edge in self.edges), default=0)
+            self._minWeightVersion = self._version
+
+        return self._minWeight
 
     @property
     def vertices(self):
-        return self._vertexList
+        return self._vertexIndex.values()
     
     @property
     def edges(self):
-        return self._edgeList
+        return self._edgeIndex.values()
     
+    def vertex(self, label) -> Optional[Vertex]:
+        return self._vertexIndex.get(label)
+
+    def edge(self, origin, link) -> Optional[Edge]:
+        return self._edgeIndex.get((origin, link))
+
+    def _graphChanged(self):
+        self._version += 1
+        self._undirectedGraph = None
+
+    def _registerVertex(self, vertex):
+        self._graphChanged()
+        self._vertexIndex[vertex.label] = vertex
+        self.addToGroup(vertex)
+        self._placeVertex(vertex)
+        self._notifyEdited([vertex], [])
+
+    def _registerEdge(self, edge):
+        self._graphChanged()
+        edge._originVertex.addEdge(edge)
+        edge._linkVertex.addEdge(edge)
+        self._edgeIndex[edge.pair] = edge
+        self.addToGroup(edge)
+        self._placeEdge(edge)
+
+        if self._edgeBatch is not None:
+            edge.setVisible(False)
+            self._edgeBatch.addEdges([edge])
+        else:
+            self._updateEdgeBatching()
+
+        self._notifyEdited([edge], [])
+
+    def addEditListener(self, listener, highlight=False):
+        """
+        :param listener: Called with the lists of vertices and edges added and removed by every
+            edit. The version goes up by one before every call, so a bigger jump means the graph
+            changed without the listener being told, as it does when it is cleared
+        :param highlight: Whether the listener keeps a highlight up to date, in which case it is
+            dropped along with the colors, and clicks that edit the graph don't clear them
+        """
+        self._editListeners[listener] = highlight
+
+    def removeEditListener(self, listener):
+        self._editListeners.pop(listener, None)
+
+    def isEditListener(self, listener) -> bool:
+        return listener in self._editListeners
+
+    def hasLiveHighlight(self) -> bool:
+        return any(self._editListeners.values())
+
+    def _dropHighlightListeners(self):
+        self._editListeners = {listener: highlight for listener, highlight in self._editListeners.items()
+                               if not highlight}
+
+    def _notifyEdited(self, added, removed):
+        for listener in list(self._editListeners):
+            listener(added, removed)
+
+    def _updateEdgeBatching(self):
+        count = len(self._edgeIndex)
+
+        if self._edgeBatch is None and count > EDGE_BATCH_THRESHOLD:
+            self._edgeBatch = EdgeBatchRenderer(self._isDirected)
+            self._edgeBatch.setParentItem(self)
+            # Beneath the vertices, like the edges' own lines
+            self._edgeBatch.setZValue(-1)
+
+            with self.batchedUpdate():
+                for edge in self._edgeIndex.values():
+                    edge.setVisible(False)
+                self._edgeBatch.addEdges(self._edgeIndex.values())
+        elif self._edgeBatch is not None and count < EDGE_BATCH_THRESHOLD // 2:
+            with self.batchedUpdate():
+                for edge in self._edgeIndex.values():
+                    edge.setVisible(True)
+                self._dropEdgeBatch()
+
+    def _dropEdgeBatch(self):
+        if self._edgeBatch is None:
+            return
+
+        if self._hoveredEdge is not None:
+            self._hoveredEdge.setZValue(0)
+            self._hoveredEdge = None
+
+        scene = self._edgeBatch.scene()
+        if scene is not None:
+            scene.removeItem(self._edgeBatch)
+        self._edgeBatch = None
+
+    def hoverAt(self, pos):
+        """
+        While the edges are batched, hand the edge under the mouse back to its own item,
+        raised above the rest so it stands out where edges overlap.
+        :param pos: The mouse position in scene coordinates
+        """
+        if self._edgeBatch is None:
+            return
+
+        edge = self.scene().getItemUnderMouse(Edge, pos)
+        if edge is self._hoveredEdge:
+            return
+
+        if self._hoveredEdge is not None:
+            self._hoveredEdge.setVisible(False)
+            self._hoveredEdge.setZValue(0)
+            self._edgeBatch.setDetached(self._hoveredEdge, False)
+
+        if edge is not None:
+            edge.setVisible(True)
+            edge.setZValue(1)
+            self._edgeBatch.setDetached(edge, True)
+
+        self._hoveredEdge = edge
+
+    def _placeVertex(self, vertex):
+        rect = vertex.sceneBoundingRect()
+        self._hitGrid.insertRect(vertex, rect.left(), rect.top(), rect.right(), rect.bottom())
+
+    def _placeEdge(self, edge):
+        hitBox = edge._hitBox
+        line = hitBox.line()
+        p1 = hitBox.mapToScene(line.p1())
+        p2 = hitBox.mapToScene(line.p2())
+        self._hitGrid.insertSegment(edge, p1.x(), p1.y(), p2.x(), p2.y(), hitBox.pen().widthF() / 2)
+
+    def itemsAt(self, pos) -> set:
+        """
+        :param pos: A position in scene coordinates
+        :return: The vertices and edges that might be at pos, a superset of the ones that actually are
+        """
+        return self._hitGrid.itemsAt(pos.x(), pos.y())
+
+    @contextmanager
+    def batchedUpdate(self, reindex=False):
+        """
+        Hold off repainting while many items change, then repaint once.
+        :param reindex: Also stop indexing the scene's items, rebuilding the index once at the end.
+            Worth it when adding or moving many items.
+        """
+        scene = self.scene()
+        # Nested batches are folded into the outermost one
+        if scene is None or self._batchDepth > 0:
+            self._batchDepth += 1
+            try:
+                yield
+            finally:
+                self._batchDepth -= 1
+            return
+
+        self._batchDepth += 1
+
+        views = scene.views()
+        for view in views:
+            view.setUpdatesEnabled(False)
+
+        if reindex:
+            indexMethod = scene.itemIndexMethod()
+            scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+
+        try:
+            yield
+        finally:
+            self._batchDepth -= 1
+
+            if reindex:
+                scene.setItemIndexMethod(indexMethod)
+
+            for view in views:
+                view.setUpdatesEnabled(True)
+                view.viewport().update()
+
     def clearGraph(self):
-        self._vertexList.clear()
-        self._edgeList.clear()
+        self.cancelImport()
+        self._vertexIndex.clear()
+        self._edgeIndex.clear()
+        self._hitGrid.clear()
+        self._movedVertices.clear()
         self._graph.clear()
-        remaining = self.scene().items(self.scene().sceneRect())
-        for item in remaining:
-            if isinstance(item, Vertex) or isinstance(item, Edge):
+        self._graphChanged()
+        with self.batchedUpdate(reindex=True):
+            self._dropEdgeBatch()
+            for item in self._items:
                 self.scene().removeItem(item)
+            self.clearGroup()
         self._originVertex = None
+        self._dropHighlightListeners()
         Vertex._next_label = 0
     
     def setGraphType(self, graph_type: bool):
+        # Nothing is copied or converted here, see the graph property. Arrowheads check
+        # whether the graph is directed as they are drawn, so they only need repainting
         self._isDirected = graph_type
-        if graph_type:
-            self._graph = self._graph.to_directed()
-        else:
-            self._graph = self._graph.to_undirected()
-        for edge in self._edgeList:
-            edge._arrowHead.setOpacity(1.0) if self._isDirected else edge._arrowHead.setOpacity(0.0)
+        if self._edgeBatch is not None:
+            self._edgeBatch.setDirected(self._isDirected)
+
+        scene = self.scene()
+        if scene is not None:
+            scene.update()
 
     def setWeighted(self, weighted: bool):
         self._isWeighted = weighted
-        for edge in self._edgeList:
+        for edge in self._edgeIndex.values():
             edge._weightText.setVisible(weighted)
+        if self._edgeBatch is not None:
+            self._edgeBatch.updateEdges(self._edgeIndex.values())
 
     def importGraph(self, graph):
-        # Use networkx's shell layout to position vertices
-        positions = nx.shell_layout(graph)
-        # Then normalize the positions to match PyQt6 coordinate system
-        min_x = min(x for x, y in positions.values())
-        min_y = min(y for x, y in positions.values())
-        # Finally, update the backend graph object to include the new graph
-        self._graph = nx.disjoint_union(self._graph, graph)
+        positions = layoutPositions(graph)
+
+        with self.batchedUpdate(reindex=True):
+            node_map = dict()
+            for node, (x, y) in positions.items():
+                vertex = Vertex(x, y)
+                node_map[node] = vertex
+                self._registerVertex(vertex)
+
+            for origin, link, weight in graph.edges(data='weight'):
+                originVertex = node_map[origin]
+                linkVertex = node_map[link]
+                offset_weight = self.doOffset(originVertex, linkVertex)
+                edge = Edge(originVertex, linkVertex, weight, offset_weight)
+                self._registerEdge(edge)
+
+        # Add the new nodes and edges to the backend graph in place, under their vertices' labels
+        self._graph.add_nodes_from((node_map[node].label, data) for node, data in graph.nodes(data=True))
+        self._graph.add_edges_from((node_map[origin].label, node_map[link].label, data)
+                                   for origin, link, data in graph.edges(data=True))
+
+        self._refreshMode()
+
+    def importCompact(self, compact, positions, chunkSize=IMPORT_CHUNK_SIZE, progress=None, finished=None):
+        """
+        Import a generated graph a chunk at a time, going back to the event loop between chunks
+        so the window keeps repainting and handling input while thousands of items are created.
+        Any import still in progress is cancelled first.
+        :param compact: A CompactGraph, as returned by RandomGraphBuilder.build_many
+        :param positions: The (x, y) scene position of every node, in the order of compact.nodes
+        :param chunkSize: The number of vertices and edges added per turn of the event loop
+        :param progress: Called on the GUI thread with the fraction of items added so far
+        :param finished: Called once every item is added, or the import is cancelled
+        """
+        self.cancelImport()
+
+        if self.scene() is None:
+            raise RuntimeError('The graph has to be in a scene to be imported in chunks')
+
+        items = self._compactItems(compact, positions)
+        total = compact.number_of_nodes + compact.number_of_edges
+
+        self._pendingImport = _ChunkedImport(self, items, total, chunkSize, progress, finished)
+        self._pendingImport.start()
+
+    def isImporting(self) -> bool:
+        return self._pendingImport is not None
+
+    def cancelImport(self):
+        # Whatever has been added so far stays in the scene
+        if self._pendingImport is not None:
+            self._pendingImport.cancel()
+            self._pendingImport.step()
+
+    def _endImport(self):
+        self._pendingImport = None
+        self._refreshMode()
+
+    def _compactItems(self, compact, positions):
+        # Adds one vertex or edge, together with its node or edge in the backend graph, per iteration
         node_map = dict()
-        for node, (x, y) in positions.items():
-            # And scale the positions to fit the size of the scene
-            vertex = Vertex((x - min_x * 2) * 200, (y - min_y * 1.5) * 150)
-            node_map[node] = vertex.label
-            self._vertexList.append(vertex)
-            self.addToGroup(vertex)
-
-        for edge in graph.edges(graph, data=True):
-            try:
-                weight = edge[2]['weight']
-            except KeyError:
-                weight = None
-
-            originVertex = next(vertex for vertex in self._vertexList if vertex.label == node_map[edge[0]])
-            linkVertex = next(vertex for vertex in self._vertexList if vertex.label == node_map[edge[1]])
+        for node, (x, y) in zip(compact.nodes.tolist(), positions.tolist()):
+            vertex = Vertex(x, y)
+            node_map[node] = vertex
+            self._graph.add_node(vertex.label)
+            self._registerVertex(vertex)
+            yield
+
+        for (origin, link), weight in zip(compact.edges.tolist(), compact.edge_weights()):
+            originVertex = node_map[origin]
+            linkVertex = node_map[link]
             offset_weight = self.doOffset(originVertex, linkVertex)
-            edge = Edge(originVertex, linkVertex, self._isDirected, weight, offset_weight)
-            originVertex.addEdge(edge)
-            linkVertex.addEdge(edge)
-            self._edgeList.append(edge)
-            self.addToGroup(edge)
-        
-        if self.scene()._isSelectMode:
-            self.scene().toggleSelectMode(True)
-        elif self.scene()._isVertexMode:
-            self.scene().toggleVertexMode(True)
-        elif self.scene()._isEdgeMode:
-            self.scene().toggleEdgeMode(True)
+            edge = Edge(originVertex, linkVertex, weight, offset_weight)
+            if weight is None:
+                self._graph.add_edge(originVertex.label, linkVertex.label)
+            else:
+                self._graph.add_edge(originVertex.label, linkVertex.label, weight=weight)
+            self._registerEdge(edge)
+            yield
+
+    def _refreshMode(self):
+        # Give newly added items the flags of the current mode
+        scene = self.scene()
+        if scene is None:
+            return
+
+        if scene._isSelectMode:
+            scene.toggleSelectMode(True)
+        elif scene._isVertexMode:
+            scene.toggleVertexMode(True)
+        elif scene._isEdgeMode:
+            scene.toggleEdgeMode(True)
     
     def doOffset(self, originVertex, linkVertex):
-        return any(edge._linkVertex == originVertex for edge in linkVertex._edges)
+        # Whether the edge runs alongside one going the other way
+        return originVertex in linkVertex._outNeighbors
     
     def addEdge(self, e):
         e.accept()
 
-        nearest_vertex = self.scene().getItemUnderMouse(Vertex, self._vertexList)
+        nearest_vertex = self.scene().getVertexUnderMouse(e.scenePos())
         if self._originVertex is None:
             self._originVertex = nearest_vertex
         else:
@@ -167,7 +611,7 @@ class GraphScene(ItemGroup):
                 # or if user tries to connect a vertex to itself
                 nearest_vertex == self._originVertex or
                 # or if user tries to connect originVertex to a vertex it is already connected to
-                any(edge._linkVertex == nearest_vertex for edge in self._originVertex._edges)):
+                nearest_vertex in self._originVertex._outNeighbors):
                 # Reset origin vertex anyways
                 self._originVertex = None
                 return
@@ -175,14 +619,11 @@ class GraphScene(ItemGroup):
             offset_weight = self.doOffset(self._originVertex, nearest_vertex)
             
             edge_args = (self._originVertex, nearest_vertex)
-            edge = Edge(*edge_args, directed=self._isDirected, doOffset=offset_weight)
+            edge = Edge(*edge_args, doOffset=offset_weight)
 
             self._graph.add_edge(self._originVertex.label, nearest_vertex.label, weight=edge.weight)
 
-            self._originVertex.addEdge(edge)
-            nearest_vertex.addEdge(edge)
-            self._edgeList.append(edge)
-            self.addToGroup(edge)
+            self._registerEdge(edge)
             self._originVertex = None
 
     def addVertex(self, e):
@@ -194,61 +635,170 @@ class GraphScene(ItemGroup):
         vertex = Vertex(x, y)
 
         self._graph.add_node(vertex.label)
-        self._vertexList.append(vertex)
-        self.addToGroup(vertex)
-
-    def verticesMoved(self):
-        for v in self._vertexList:
-            v.updateEdges()
+        self._registerVertex(vertex)
+
+    def vertexMoved(self, vertex):
+        """
+        Queue the edges of a vertex to be updated. Moves coming in faster than once
+        per frame, such as while dragging, are folded into one update.
+        """
+        self._movedVertices.add(vertex)
+
+        if not self._moveTimer.isActive():
+            self._moveTimer.start()
+
+    def updateMovedVertices(self):
+        self._moveTimer.stop()
+
+        moved = self._movedVertices
+        self._movedVertices = set()
+
+        # A selection moved together shares edges, update each of those once
+        edges = set()
+        for vertex in moved:
+            self._placeVertex(vertex)
+            self.itemMoved(vertex)
+            edges.update(vertex._edges)
+
+        for edge in edges:
+            edge.updatePosition()
+            self._placeEdge(edge)
+            self.itemMoved(edge)
+
+        if self._edgeBatch is not None:
+            self._edgeBatch.updateEdges(edges)
+
+    def vertexPositions(self):
+        """
+        :return: The vertices, and an (n, 2) array of their centers in the same order
+        """
+        vertices = list(self._vertexIndex.values())
+        positions = np.empty((len(vertices), 2))
+        for i, vertex in enumerate(vertices):
+            center = vertex.pos() + vertex.rect().center()
+            positions[i] = (center.x(), center.y())
+
+        return vertices, positions
+
+    def moveVertices(self, vertices, positions):
+        """
+        Move vertices so they are centered on the given positions, as a layout does.
+        Vertices removed from the graph in the meantime are skipped.
+        :param positions: An (n, 2) array in the order of vertices
+        """
+        with self.batchedUpdate(reindex=True):
+            for vertex, (x, y) in zip(vertices, positions.tolist()):
+                if self._vertexIndex.get(vertex.label) is vertex:
+                    center = vertex.rect().center()
+                    vertex.setPos(x - center.x(), y - center.y())
+
+            self.updateMovedVertices()
 
     def removeFromGroup(self, item, call_backend=True):
         super().removeFromGroup(item)
+        self._hitGrid.remove(item)
+        self._movedVertices.discard(item)
+        self._graphChanged()
 
         if isinstance(item, Vertex):
-            self._vertexList.remove(item)
+            del self._vertexIndex[item.label]
             if call_backend:
                 self._graph.remove_node(item.label)
+
+            self._notifyEdited([], [item])
         else:
             assert(isinstance(item, Edge))
-            self._edgeList.remove(item)
+            del self._edgeIndex[item.pair]
+
+            if item is self._hoveredEdge:
+                self._hoveredEdge = None
+            if self._edgeBatch is not None:
+                self._edgeBatch.removeEdge(item)
+                self._updateEdgeBatching()
             
             if call_backend:
                 self._graph.remove_edge(*item.pair)
 
-    def colorVertices(self, vertices, color):
-        toColor = []
+            self._notifyEdited([], [item])
+
+    def removeMany(self, items):
+        """
+        Remove vertices and edges from the scene and the graph, along with every edge of the
+        removed vertices. The backend graph is updated once for all of them.
+        """
+        vertices = [item for item in items
+                    if isinstance(item, Vertex) and self._vertexIndex.get(item.label) is item]
+
+        edges = {item: None for item in items
+                 if isinstance(item, Edge) and self._edgeIndex.get(item.pair) is item}
+        for vertex in vertices:
+            edges.update(dict.fromkeys(vertex._edges))
+
+        # The backend goes first, so whatever the edit listeners read of the graph is already up to date
+        self._graph.remove_edges_from([edge.pair for edge in edges])
+        self._graph.remove_nodes_from([vertex.label for vertex in vertices])
 
-        for query in vertices:
-            # terrible no good linear search
-            for v in self._vertexList:
-                if v.label == query:
-                    toColor.append(v)
+        scene = self.scene()
+        with self.batchedUpdate(reindex=len(edges) + len(vertices) > REINDEX_THRESHOLD):
+            for edge in edges:
+                if scene is not None:
+                    scene.removeItem(edge)
+                self.removeFromGroup(edge, call_backend=False)
 
-        for v in toColor:
-            v.innerColor = color
+                edge._originVertex.removeEdge(edge)
+                edge._linkVertex.removeEdge(edge)
+
+            for vertex in vertices:
+                if scene is not None:
+                    scene.removeItem(vertex)
+                self.removeFromGroup(vertex, call_backend=False)
+
+    def colorVertices(self, vertices, color):
+        toColor = [self._vertexIndex[query] for query in vertices if query in self._vertexIndex]
+
+        with self.batchedUpdate():
+            for v in toColor:
+                v.innerColor = color
         
-        vs = set(toColor)
-        self._coloredVertices |= vs
+        self._coloredVertices.update(toColor)
 
     def colorEdges(self, edges, color):
         toColor = []
 
         for query in edges:
-            # that linear search again
-            for e in self._edgeList:
-                if e.pair == query or (not self._isDirected and tuple(reversed(e.pair)) == query):
-                    toColor.append(e)
+            query = tuple(query)
+
+            edge = self._edgeIndex.get(query)
+            if edge is not None:
+                toColor.append(edge)
+
+            # An undirected edge may have been drawn in either direction
+            if not self._isDirected:
+                reverse = self._edgeIndex.get(query[::-1])
+                if reverse is not None and reverse is not edge:
+                    toColor.append(reverse)
 
-        for e in toColor:
-            e.color = color
+        with self.batchedUpdate():
+            for e in toColor:
+                e.color = color
 
-        es = set(toColor)
-        self._coloredEdges |= es
+            if self._edgeBatch is not None:
+                self._edgeBatch.setColor(toColor, color)
+
+        self._coloredEdges.update(toColor)
 
     def clearColors(self):
-        for v in self._coloredVertices:
-            v.innerColor = Qt.GlobalColor.white
-            v.outerColor = Qt.GlobalColor.black
+        with self.batchedUpdate():
+            for v in self._coloredVertices:
+                v.innerColor = Qt.GlobalColor.white
+                v.outerColor = Qt.GlobalColor.black
+
+            for e in self._coloredEdges:
+                e.color = Qt.GlobalColor.black
+
+            if self._edgeBatch is not None:
+                self._edgeBatch.setColor(self._coloredEdges, Qt.GlobalColor.black)
 
-        for e in self._coloredEdges:
-            e.color = Qt.GlobalColor.black
+        self._coloredVertices.clear()
+        self._coloredEdges.clear()
+        self._dropHighlightListeners()
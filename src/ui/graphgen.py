@@ -1,4 +1,3 @@
-import networkx as nx
 from PyQt6.QtCore import Qt, QEventLoop, QPersistentModelIndex, QPoint, QStringListModel
 from PyQt6.QtGui import QIntValidator
 from PyQt6.QtWidgets import (
@@ -18,7 +17,7 @@ from PyQt6.QtWidgets import (
 )
 import enum
 
-MAX_NUM_NODES = 1000
+MAX_NUM_NODES = 50000
 MIN_NUM_NODES = 1
 
 
@@ -287,17 +286,11 @@ class GraphGenPopup(QWidget):
         if self.okButton.isEnabled():
             self.loop.exit(True)
 
-            # Import the newly generated graph to the scene
-            graphScene = self.parent().scene._graphScene
+            # Steps whose options popup was cancelled have no arguments and are left out
+            steps = [(f, args) for f, args in self.buildList.values() if args is not None]
 
-            steps = self.buildList.values()
-            new_graph = nx.DiGraph() if graphScene._isDirected else nx.Graph()
-            new_graph.add_nodes_from(range(self.num_nodes))
-            for f, args in steps:
-                new_graph = f(new_graph, **args)
-
-            # combined_graph = nx.disjoint_union(curr_graph, new_graph)
-            graphScene.importGraph(new_graph)
+            # The graph is generated in the background and imported into the scene once it's done
+            self.parent().graph_gen_runner.generate(self.num_nodes, steps)
 
     def reject(self):
         self.loop.exit(False)
@@ -0,0 +1,155 @@
+import math
+import numpy as np
+
+
+class HitGrid:
+    """
+    Buckets items by the cells of a uniform grid that they overlap, so finding what is at a
+    point only looks at the items sharing its cell rather than at every item in the scene.
+
+    The grid only narrows things down to candidates, the caller still tests their actual shapes.
+
+    Long segments, such as the edges of a graph that hasn't been laid out yet, would fill
+    a cell per step along their length. Those are kept in an array instead, and checked
+    against every point looked up all at once.
+    """
+    CELL_SIZE = 100
+    # Segments longer than this many cells are kept out of the cells
+    LONG_SEGMENT_CELLS = 8
+
+    def __init__(self, cellSize=CELL_SIZE):
+        self._cellSize = cellSize
+
+        self._cells = {}
+        # The geometry each item was placed with, and the cells that placed it in
+        self._placed = {}
+
+        # Rows of x1, y1, x2, y2, pad for the long segments, and their items in the same order
+        self._longSegments = np.empty((0, 5))
+        self._longItems = []
+        self._longRows = {}
+
+    def _cell(self, x, y):
+        return math.floor(x / self._cellSize), math.floor(y / self._cellSize)
+
+    def _rectCells(self, left, top, right, bottom):
+        firstCol, firstRow = self._cell(left, top)
+        lastCol, lastRow = self._cell(right, bottom)
+
+        return [(col, row) for col in range(firstCol, lastCol + 1) for row in range(firstRow, lastRow + 1)]
+
+    def _segmentCells(self, x1, y1, x2, y2, pad):
+        # Sample the segment at most half a cell apart. Every point within pad of the segment
+        # is then within pad plus half the spacing of a sample, so covering that square
+        # around each sample covers the whole padded segment
+        length = math.hypot(x2 - x1, y2 - y1)
+        steps = max(1, math.ceil(length / (self._cellSize / 2)))
+        reach = pad + length / steps / 2
+
+        cells = set()
+        for i in range(steps + 1):
+            x = x1 + (x2 - x1) * i / steps
+            y = y1 + (y2 - y1) * i / steps
+            cells.update(self._rectCells(x - reach, y - reach, x + reach, y + reach))
+
+        return cells
+
+    def _place(self, item, geometry, findCells):
+        placed = self._placed.get(item)
+        if placed is not None:
+            if placed[0] == geometry:
+                return
+
+            self.remove(item)
+
+        cells = findCells()
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(item)
+
+        self._placed[item] = (geometry, cells)
+
+    def insertRect(self, item, left, top, right, bottom):
+        """
+        Add an item by its bounding rect, or move it there if it is already in the grid.
+        """
+        geometry = (left, top, right, bottom)
+        self._place(item, geometry, lambda: self._rectCells(*geometry))
+
+    def insertSegment(self, item, x1, y1, x2, y2, pad):
+        """
+        Add an item covering a line segment, or move it there if it is already in the grid.
+        :param pad: How far from the segment the item can still be hit
+        """
+        geometry = (x1, y1, x2, y2, pad)
+        if math.hypot(x2 - x1, y2 - y1) > self.LONG_SEGMENT_CELLS * self._cellSize:
+            self._placeLong(item, geometry)
+        else:
+            self._place(item, geometry, lambda: self._segmentCells(*geometry))
+
+    def _placeLong(self, item, geometry):
+        placed = self._placed.get(item)
+        if placed is not None and item not in self._longRows:
+            self.remove(item)
+
+        row = self._longRows.get(item)
+        if row is None:
+            row = len(self._longItems)
+            if row == len(self._longSegments):
+                self._longSegments = np.vstack([self._longSegments, np.zeros((max(row, 64), 5))])
+
+            self._longItems.append(item)
+            self._longRows[item] = row
+
+        self._longSegments[row] = geometry
+        self._placed[item] = (geometry, ())
+
+    def remove(self, item):
+        placed = self._placed.pop(item, None)
+        if placed is None:
+            return
+
+        for cell in placed[1]:
+            bucket = self._cells[cell]
+            bucket.discard(item)
+            if len(bucket) == 0:
+                del self._cells[cell]
+
+        row = self._longRows.pop(item, None)
+        if row is not None:
+            # Fill the hole with the last row
+            last = len(self._longItems) - 1
+            if row != last:
+                moved = self._longItems[last]
+                self._longItems[row] = moved
+                self._longRows[moved] = row
+                self._longSegments[row] = self._longSegments[last]
+
+            self._longItems.pop()
+
+    def clear(self):
+        self._cells.clear()
+        self._placed.clear()
+
+        self._longSegments = np.empty((0, 5))
+        self._longItems.clear()
+        self._longRows.clear()
+
+    def itemsAt(self, x, y) -> set:
+        items = self._cells.get(self._cell(x, y), set())
+
+        count = len(self._longItems)
+        if count == 0:
+            return items
+
+        x1, y1, x2, y2, pad = self._longSegments[:count].T
+        dx, dy = x2 - x1, y2 - y1
+
+        # The closest point on each segment
+        t = np.clip(((x - x1) * dx + (y - y1) * dy) / np.maximum(dx * dx + dy * dy, 1e-12), 0, 1)
+        near = (x1 + t * dx - x) ** 2 + (y1 + t * dy - y) ** 2 <= pad * pad
+
+        rows = np.flatnonzero(near)
+        if len(rows) == 0:
+            return items
+
+        return items | {self._longItems[row] for row in rows.tolist()}
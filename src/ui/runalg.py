@@ -62,6 +62,7 @@ class RunAlgPopup(QWidget):
 
         from ui.runners.prims_runner import PrimsRunner
         self.prims_runner = PrimsRunner(parent.scene)
+        parent.trackRunner(self.prims_runner)
         self.prims_button = QPushButton("Prim's Algorithm")
         self.prims_button.clicked.connect(self.accept)
         self.prims_button.clicked.connect(self.prims_runner.run)
@@ -69,6 +70,7 @@ class RunAlgPopup(QWidget):
 
         from ui.runners.girvan_newman_runner import GirvanNewmanRunner
         self.girvan_newman_runner = GirvanNewmanRunner(parent.scene)
+        parent.trackRunner(self.girvan_newman_runner)
         self.girvan_newman_button = QPushButton("Girvan-Newman Algorithm")
         self.girvan_newman_button.clicked.connect(self.accept)
         self.girvan_newman_button.clicked.connect(self.girvan_newman_runner.run)
@@ -76,13 +78,20 @@ class RunAlgPopup(QWidget):
 
         from ui.runners.bellman_ford_runner import BellmanFordRunner
         self.bellman_ford_runner = BellmanFordRunner(parent.scene)
+        parent.trackRunner(self.bellman_ford_runner)
         self.bellman_ford_button = QPushButton("Bellman-Ford Algorithm")
         self.bellman_ford_button.clicked.connect(self.accept)
         self.bellman_ford_button.clicked.connect(self.bellman_ford_runner.assignMouse)
         layout.addWidget(self.bellman_ford_button)
 
+        self.shortest_path_button = QPushButton("Shortest Path (Bellman-Ford)")
+        self.shortest_path_button.clicked.connect(self.accept)
+        self.shortest_path_button.clicked.connect(self.bellman_ford_runner.assignPathMouse)
+        layout.addWidget(self.shortest_path_button)
+
         from ui.runners.max_clique_runner import MaxCliqueRunner
         self.max_clique_runner = MaxCliqueRunner(parent.scene)
+        parent.trackRunner(self.max_clique_runner)
         self.max_clique_button = QPushButton("Max Clique Approximation")
         self.max_clique_button.clicked.connect(self.accept)
         self.max_clique_button.clicked.connect(self.max_clique_runner.run)
@@ -1,35 +1,307 @@
-from algorithms.bellman import bellman_ford, NegativeCycleException
+from algorithms.dynamic_sssp import DynamicSSSP
+import networkx as nx
 
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+
+from ui.edge import Edge
+from ui.runners.runner import AlgorithmRunner, ResultCache
+
+
+class BellmanFordRunner(AlgorithmRunner):
+    """
+    Highlights the shortest paths from a source vertex found with Bellman-Ford, or with
+    Dijkstra's algorithm if no weight is negative. The shortest-path trees of the last few
+    sources are kept, along with a copy of the graph they are of, and repaired as the graph
+    is edited, so running from one of those sources again doesn't start over. The
+    highlighted tree follows edits as they happen.
+
+    In path mode only the shortest path to one target is highlighted. Once the source's tree
+    is there, every click on a target just walks the path back to the source.
+    """
+    name = 'Bellman-Ford Algorithm'
+    # Shortest-path trees are kept per source instead, see cachedResult
+    cacheResults = False
+
+    # How many sources' trees are kept
+    MAX_TREES = 8
 
-class BellmanFordRunner:
     def __init__(self, scene):
-        self.scene = scene
+        super().__init__(scene)
+
+        # The graph the trees are of, always directed, and the version and directedness of
+        # the scene's graph it matches
+        self._graph = None
+        self._version = None
+        self._directed = None
+        self._trees = ResultCache(self.MAX_TREES)
+
+        # The version and directedness the running computation's snapshot was taken at, and
+        # the snapshot's smallest weight, which decides between Dijkstra and Bellman-Ford
+        self._snapshotKey = None
+        self._snapshotMinWeight = None
+
+        # The source whose tree is highlighted, and what is colored for it
+        self._shown = None
+        self._shownColor = None
+        self._shownEdges = set()
+        self._shownVertices = set()
+        # Whether an edit changed the highlighted tree since it was last colored
+        self._shownChanged = False
+
+        # Whether only the path to _target is highlighted rather than the whole tree, and
+        # whether clicks on vertices pick the next target
+        self._paths = False
+        self._target = None
+        self._pickingTargets = False
+
+        # Edits come in one item at a time, the highlight is updated once they are done
+        self._refreshTimer = QTimer(self)
+        self._refreshTimer.setSingleShot(True)
+        self._refreshTimer.setInterval(0)
+        self._refreshTimer.timeout.connect(self._refreshShown)
+
+        self.graphScene.addEditListener(self._onEdited)
 
     def assignMouse(self):
+        self._paths = False
+        self._pickingTargets = False
+
+        self.scene._needBFSource = True
+        self.scene._bellmanHook = self.run
+
+    def assignPathMouse(self):
+        """
+        Highlight shortest paths from the vertex clicked next to the vertices clicked after
+        it, until a click misses the vertices.
+        """
+        self._paths = True
+        self._pickingTargets = True
+
         self.scene._needBFSource = True
         self.scene._bellmanHook = self.run
 
     def run(self, vertex):
+        if vertex is None:
+            return
+
+        self._stopPicking()
+        self._target = None
+
+        self._start(vertex)
+
+    def pickTarget(self, vertex):
+        if vertex is None:
+            self._pickingTargets = False
+            self._stopPicking()
+            return
+
+        self._target = vertex
+
+        tree = self._trees.get(self._shown) if self._isSynced() else None
+        if tree is None or tree.stale:
+            # Worked out again in the background, and the path shown once done
+            self._stopPicking()
+            self._start(self._shown)
+            return
+
+        self._forgetClearedColors()
+        self._show(tree, self._graph)
+        self.graphScene.addEditListener(self._onHighlightEdited, highlight=True)
+
+    def _stopPicking(self):
         self.scene._needBFSource = False
         self.scene._bellmanHook = None
 
-        try:
-            _, preds = bellman_ford(self.scene._graphScene.graph, vertex)
+    def _isSynced(self) -> bool:
+        return (self._graph is not None and self._version == self.graphScene.version
+                and self._directed == self.graphScene.isDirected)
+
+    def _reset(self):
+        self._graph = None
+        self._trees.clear()
+
+    def cachedResult(self, vertex):
+        if not self._isSynced():
+            return None
+
+        tree = self._trees.get(vertex)
+        if tree is None or tree.stale:
+            return None
+
+        return self._graph, tree
+
+    def snapshot(self):
+        self._snapshotKey = (self.graphScene.version, self.graphScene.isDirected)
+        self._snapshotMinWeight = self.graphScene.minWeight()
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(vertex.label for vertex in self.graphScene.vertices)
+        for edge in self.graphScene.edges:
+            graph.add_edge(*edge.pair, weight=edge.weight)
 
-            edges = []
+        # Undirected edges can be taken either way, unless an edge was drawn the other way
+        # too, whose weight is taken that way instead, see _sceneWeight
+        if not self.graphScene.isDirected:
+            for edge in self.graphScene.edges:
+                u, v = edge.pair
+                if not graph.has_edge(v, u):
+                    graph.add_edge(v, u, weight=edge.weight)
 
-            for v, p in preds.items():
-                if p is None:
-                    continue
+        return graph
 
-                pair = (p, v)
-                edges.append(pair)
+    def compute(self, graph, progress, vertex):
+        return graph, DynamicSSSP(graph, vertex, progress, self._snapshotMinWeight)
+
+    def apply(self, result):
+        graph, tree = result
+
+        if graph is not self._graph and self._snapshotKey == (self.graphScene.version, self.graphScene.isDirected):
+            # The snapshot is as good as the graph the other trees are of, if they are still up to date
+            if not self._isSynced():
+                self._trees.clear()
+
+            self._graph = graph
+            self._version, self._directed = self._snapshotKey
+
+        # A tree of a graph that was edited while it was computed is shown, but not kept
+        if graph is self._graph:
+            self._trees.put(tree.source, tree)
+
+        self._forgetClearedColors()
+        self._show(tree, graph)
+        self.graphScene.addEditListener(self._onHighlightEdited, highlight=True)
 
-            self.scene._graphScene.colorEdges(edges, Qt.GlobalColor.magenta)
-            
-        except NegativeCycleException as nce:
-            self.scene._graphScene.colorEdges(nce.edges, Qt.GlobalColor.red)
-            self.scene._graphScene.colorVertices(nce.cycle, Qt.GlobalColor.red)
-        
         self.scene._resetColorOnClick = True
+
+        if self._pickingTargets and tree.cycle is None:
+            self.scene._needBFSource = True
+            self.scene._bellmanHook = self.pickTarget
+        else:
+            self._pickingTargets = False
+
+    def _forgetClearedColors(self):
+        # Once the colors are cleared, there's nothing left of the last highlight to update
+        if not self.graphScene.isEditListener(self._onHighlightEdited):
+            self._shownColor = None
+            self._shownEdges = set()
+            self._shownVertices = set()
+
+    def _show(self, tree, graph):
+        if tree.cycle is not None:
+            color = Qt.GlobalColor.red
+            edges = set(tree.cycle.edges)
+            vertices = set(tree.cycle.cycle)
+        elif self._paths:
+            color = Qt.GlobalColor.magenta
+            path = tree.path(self._target) if self._target is not None else []
+            edges = set(zip(path, path[1:]))
+            vertices = {tree.source} if self._target is None else {tree.source, self._target}
+        else:
+            _, preds = tree.result(graph)
+            color = Qt.GlobalColor.magenta
+            edges = {(p, v) for v, p in preds.items() if p is not None}
+            vertices = set()
+
+        self._unshow(self._shownEdges - edges, self._shownVertices - vertices)
+
+        # Only what wasn't colored the same already
+        if color != self._shownColor:
+            self._shownEdges = set()
+            self._shownVertices = set()
+        self.graphScene.colorEdges(edges - self._shownEdges, color)
+        self.graphScene.colorVertices(vertices - self._shownVertices, color)
+
+        self._shown = tree.source
+        self._shownColor = color
+        self._shownEdges = edges
+        self._shownVertices = vertices
+        self._shownChanged = False
+
+    def _unshow(self, edges, vertices):
+        self.graphScene.colorEdges(edges, Qt.GlobalColor.black)
+        self.graphScene.colorVertices(vertices, Qt.GlobalColor.white)
+
+    def _sceneWeight(self, u, v):
+        edge = self.graphScene.edge(u, v)
+        if edge is None and not self._directed:
+            edge = self.graphScene.edge(v, u)
+
+        return None if edge is None else edge.weight
+
+    def _edgeChanged(self, u, v):
+        # Bring the edges between u and v in line with the scene, and tell the trees
+        for a, b in ((u, v),) if self._directed else ((u, v), (v, u)):
+            old = self._graph.edges[a, b]['weight'] if self._graph.has_edge(a, b) else None
+            new = self._sceneWeight(a, b)
+            if old == new:
+                continue
+
+            if new is None:
+                self._graph.remove_edge(a, b)
+            else:
+                self._graph.add_edge(a, b, weight=new)
+
+            for tree in self._trees.values():
+                if tree.edge_changed(self._graph, a, b, old) and tree.source == self._shown:
+                    self._shownChanged = True
+
+    def _vertexRemoved(self, label):
+        if label in self._graph:
+            self._graph.remove_node(label)
+
+        self._trees.pop(label)
+        for tree in self._trees.values():
+            tree.node_removed(label)
+
+        if label == self._shown:
+            self._shownChanged = True
+
+    def _onEdited(self, added, removed):
+        if self._graph is None:
+            return
+
+        # Changes that weren't reported, such as clearing the graph, leave the trees behind for good
+        version = self.graphScene.version
+        if self._version != version - 1 or self._directed != self.graphScene.isDirected:
+            self._reset()
+            self._shownChanged = True
+            return
+        self._version = version
+
+        for item in removed:
+            if isinstance(item, Edge):
+                self._edgeChanged(*item.pair)
+            else:
+                self._vertexRemoved(item.label)
+
+        for item in added:
+            if isinstance(item, Edge):
+                self._edgeChanged(*item.pair)
+            else:
+                self._graph.add_node(item.label)
+
+    def _onHighlightEdited(self, added, removed):
+        if self._shownChanged:
+            self._refreshTimer.start()
+
+    def _refreshShown(self):
+        # The colors may have been cleared in the meantime
+        if not self.graphScene.isEditListener(self._onHighlightEdited):
+            return
+
+        tree = self._trees.get(self._shown) if self._isSynced() else None
+        if tree is None:
+            if self._pickingTargets:
+                self._pickingTargets = False
+                self._stopPicking()
+
+            self._unshow(self._shownEdges, self._shownVertices)
+            self._shown = None
+            self._shownEdges = set()
+            self._shownVertices = set()
+            self.graphScene.removeEditListener(self._onHighlightEdited)
+        elif tree.stale:
+            # Worked out from scratch in the background, and shown once done
+            self._start(self._shown)
+        else:
+            self._show(tree, self._graph)
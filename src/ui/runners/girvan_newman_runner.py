@@ -2,16 +2,17 @@ import networkx as nx
 from PyQt6.QtCore import Qt
 
 from algorithms.girvan_newman import girvan_newman
+from ui.runners.runner import AlgorithmRunner
 
 
-class GirvanNewmanRunner:
-    def __init__(self, scene):
-        self.scene = scene
-        self.graphScene = scene._graphScene
-        self.graph = scene._graphScene.graph
+class GirvanNewmanRunner(AlgorithmRunner):
+    name = 'Girvan-Newman Algorithm'
 
-    def run(self):
-        self.communities, self.edges = next(girvan_newman(self.graph.copy(), return_extra_info=True))
+    def compute(self, graph, progress):
+        return next(girvan_newman(graph, return_extra_info=True, progress=progress))
+
+    def apply(self, result):
+        self.communities, self.edges = result
 
         colors = [Qt.GlobalColor.red, Qt.GlobalColor.blue, Qt.GlobalColor.green, Qt.GlobalColor.magenta]
         # Don't add edges that were drawn in the previous community
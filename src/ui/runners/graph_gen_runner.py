@@ -0,0 +1,72 @@
+from algorithms.random_graph import CompactGraph
+import networkx as nx
+import numpy as np
+
+from ui.graph import layoutPositions
+from ui.runners.runner import AlgorithmRunner
+
+
+class GraphGenRunner(AlgorithmRunner):
+    """
+    Generates a graph with the steps picked in GraphGenPopup in the background, then
+    imports it into the scene a chunk at a time.
+    """
+    name = 'Graph Generator'
+    # Every run generates a new graph
+    cacheResults = False
+
+    # Generating takes the first half of the progress bar, importing the second
+    GENERATION_SHARE = 0.5
+
+    def __init__(self, scene):
+        super().__init__(scene)
+
+        self._importing = False
+
+    def generate(self, num_nodes, steps):
+        """
+        :param num_nodes: The number of nodes the graph starts with
+        :param steps: (RandomGraphBuilder method, keyword arguments) pairs, applied in order
+        """
+        self._start(num_nodes, steps)
+
+    def snapshot(self):
+        # Generation starts from an empty graph rather than a copy of the scene
+        return nx.DiGraph() if self.graphScene._isDirected else nx.Graph()
+
+    def compute(self, graph, progress, num_nodes, steps):
+        # One share for every step, and one for laying out the result
+        total = len(steps) + 1
+
+        graph.add_nodes_from(range(num_nodes))
+        for i, (f, args) in enumerate(steps):
+            progress(self.GENERATION_SHARE * i / total)
+            graph = f(graph, **args)
+
+        done = len(steps) / total
+        positions = layoutPositions(graph, lambda f: progress(self.GENERATION_SHARE * (done + f / total)))
+
+        compact = CompactGraph.from_networkx(graph)
+        return compact, np.array([positions[node] for node in compact.nodes.tolist()]).reshape(-1, 2)
+
+    def apply(self, result):
+        compact, positions = result
+
+        self._importing = True
+        self.graphScene.importCompact(compact, positions,
+                                      progress=lambda f: self.progress.emit(self.GENERATION_SHARE + (1 - self.GENERATION_SHARE) * f),
+                                      finished=self._onImported)
+
+    def isRunning(self) -> bool:
+        return super().isRunning() or self._importing
+
+    def cancel(self):
+        super().cancel()
+
+        if self._importing:
+            self.graphScene.cancelImport()
+
+    def _onImported(self):
+        self._importing = False
+
+        self.stopped.emit('')
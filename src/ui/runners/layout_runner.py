@@ -0,0 +1,100 @@
+from algorithms.force_layout import DEFAULT_ITERATIONS, force_layout_steps
+import threading
+import time
+from PyQt6.QtCore import pyqtSignal
+
+from ui.graph import LAYOUT_SPACING
+from ui.runners.runner import AlgorithmRunner
+
+
+class LayoutRunner(AlgorithmRunner):
+    """
+    Re-lays out the graph with the force-directed layout, starting from where the vertices
+    are now. The vertices are moved to the intermediate positions every so often while the
+    layout runs, so it can be watched settling.
+    """
+    name = 'Layout'
+    # The result depends on where the vertices are
+    cacheResults = False
+
+    # Emitted from the worker thread with intermediate positions, received on the GUI thread
+    intermediate = pyqtSignal(object)
+
+    # Seconds between intermediate positions at the least
+    PUSH_INTERVAL = 0.1
+    # Moving every vertex and edge takes a while in large graphs, so wait this many times as
+    # long as the last move took before the next, to leave the window time to respond
+    PUSH_BACKOFF = 2
+    # Once a move takes longer than this many seconds, only the final positions are shown
+    MAX_PUSH_TIME = 1.0
+    # Seconds the layout waits at most for the vertices to be moved before carrying on
+    PUSH_WAIT = 10
+
+    def __init__(self, scene):
+        super().__init__(scene)
+
+        self._vertices = []
+
+        # Set once the GUI thread has moved the vertices to the last intermediate positions
+        self._applied = threading.Event()
+        self._pushing = True
+        self._nextPush = 0.0
+
+        self.intermediate.connect(self._onIntermediate)
+
+    def snapshot(self):
+        vertices, positions = self.graphScene.vertexPositions()
+        if len(vertices) == 0:
+            return None
+
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        edges = [(index[edge._originVertex], index[edge._linkVertex]) for edge in self.graphScene.edges]
+
+        self._vertices = vertices
+        self._pushing = True
+        self._nextPush = 0.0
+
+        return edges, positions
+
+    def compute(self, snapshot, progress):
+        edges, start = snapshot
+
+        # Keep the layout centered where the graph is now, so the view doesn't jump away
+        center = start.mean(axis=0)
+        toScene = lambda p: (p - p.mean(axis=0)) * LAYOUT_SPACING + center
+
+        positions = start / LAYOUT_SPACING
+        for i, positions in enumerate(force_layout_steps(len(start), edges, positions)):
+            progress((i + 1) / DEFAULT_ITERATIONS)
+
+            if self._pushing and time.monotonic() >= self._nextPush:
+                self._applied.clear()
+                self.intermediate.emit(toScene(positions))
+
+                # Moving the vertices calls into Qt for every one of them, and each call gives
+                # up the GIL, which this thread would then hold on to for a while every time
+                self._applied.wait(self.PUSH_WAIT)
+
+        return toScene(positions)
+
+    def apply(self, positions):
+        self.graphScene.moveVertices(self._vertices, positions)
+        self._vertices = []
+
+    def _onIntermediate(self, positions):
+        start = time.monotonic()
+        self.graphScene.moveVertices(self._vertices, positions)
+        now = time.monotonic()
+
+        if now - start > self.MAX_PUSH_TIME:
+            self._pushing = False
+        else:
+            self._nextPush = now + max(self.PUSH_INTERVAL, self.PUSH_BACKOFF * (now - start))
+
+        self._applied.set()
+
+    def cancel(self):
+        super().cancel()
+
+        # Don't leave the layout waiting on a move
+        self._applied.set()
@@ -2,15 +2,20 @@ from algorithms.max_clique import ramsey
 
 from PyQt6.QtCore import Qt
 
-class MaxCliqueRunner:
-    def __init__(self, scene):
-        self.scene = scene
+from ui.runners.runner import AlgorithmRunner
 
-    def run(self):
-        c, ind = ramsey(self.scene._graphScene.graph)
+
+class MaxCliqueRunner(AlgorithmRunner):
+    name = 'Max Clique Approximation'
+
+    def compute(self, graph, progress):
+        return ramsey(graph, progress)
+
+    def apply(self, result):
+        c, ind = result
         print(c, ind)
 
-        self.scene._graphScene.colorVertices(c, Qt.GlobalColor.darkCyan)
+        self.graphScene.colorVertices(c, Qt.GlobalColor.darkCyan)
 
         clique_edges = []
         c = sorted(c)
@@ -18,8 +23,8 @@ class MaxCliqueRunner:
             for j in range(i + 1, len(c)):
                 clique_edges.append((c[i], c[j]))
 
-        self.scene._graphScene.colorEdges(clique_edges, Qt.GlobalColor.darkCyan)
+        self.graphScene.colorEdges(clique_edges, Qt.GlobalColor.darkCyan)
 
-        self.scene._graphScene.colorVertices(ind, Qt.GlobalColor.green)
+        self.graphScene.colorVertices(ind, Qt.GlobalColor.green)
 
         self.scene._resetColorOnClick = True
@@ -1,22 +1,95 @@
+from algorithms.dynamic_mst import DynamicMST
 from algorithms.prims import prims
+import networkx as nx
 from PyQt6.QtCore import Qt
 
+from ui.edge import Edge
+from ui.runners.runner import AlgorithmRunner
+
+
+class PrimsRunner(AlgorithmRunner):
+    """
+    Highlights a minimum spanning tree found with Prim's algorithm. The tree is kept in a
+    DynamicMST afterwards, so the highlight follows edges being added and removed without
+    running the algorithm again.
+    """
+    name = "Prim's Algorithm"
+
+    COLOR = Qt.GlobalColor.darkRed
 
-class PrimsRunner:
     def __init__(self, scene):
-        self.scene = scene
-        self.graphScene = scene._graphScene
-        self.graph = scene._graphScene.graph
-
-    def run(self):
-        if self.graph.is_directed():
-            self.graph = self.graph.to_undirected()
-        if self.graph.number_of_nodes() == 0:
+        super().__init__(scene)
+
+        self._mst = None
+        # The version of the graph the running computation's snapshot was taken at
+        self._snapshotVersion = None
+
+    def snapshot(self):
+        if len(self.graphScene.vertices) == 0:
+            return None
+
+        self._snapshotVersion = self.graphScene.version
+
+        graph = nx.Graph()
+        graph.add_nodes_from(vertex.label for vertex in self.graphScene.vertices)
+
+        # Weighed the same way as edits are later, see _pairWeight
+        for edge in self.graphScene.edges:
+            u, v = edge.pair
+            if not graph.has_edge(u, v) or edge.weight < graph.edges[u, v]['weight']:
+                graph.add_edge(u, v, weight=edge.weight)
+
+        return graph
+
+    def compute(self, graph, progress):
+        tree = prims(graph, progress)
+
+        # Prim's algorithm only spans the component it started in, the others are spanned too
+        return self._snapshotVersion, DynamicMST(graph, tree.edges)
+
+    def apply(self, result):
+        version, mst = result
+
+        # Edits made while the tree was computed never reach it, so it is computed again
+        if version != self.graphScene.version:
+            self._start()
             return
 
-        mst = prims(self.graph.copy())
-        mst_edges = mst.edges()
+        # The tree that was followed until now may not be the same minimum spanning tree
+        if self._mst is not None and self.graphScene.isEditListener(self._onEdited):
+            self._colorTree(self._mst.edges(), Qt.GlobalColor.black)
+
+        self._mst = mst
 
-        self.scene._graphScene.colorEdges(mst_edges, Qt.GlobalColor.darkRed)
+        self._colorTree(mst.edges(), self.COLOR)
+        self.graphScene.addEditListener(self._onEdited, highlight=True)
 
         self.scene._resetColorOnClick = True
+
+    def _colorTree(self, edges, color):
+        if len(edges) == 0:
+            return
+
+        # A tree edge may have been drawn in either direction
+        self.graphScene.colorEdges([pair for u, v in edges for pair in ((u, v), (v, u))], color)
+
+    def _pairWeight(self, u, v):
+        # Edges drawn both ways between two vertices are one edge of the tree, as light as the lighter
+        edges = (self.graphScene.edge(u, v), self.graphScene.edge(v, u))
+        return min((edge.weight for edge in edges if edge is not None), default=None)
+
+    def _onEdited(self, added, removed):
+        for edge in added + removed:
+            if not isinstance(edge, Edge):
+                continue
+
+            u, v = edge.pair
+
+            weight = self._pairWeight(u, v)
+            if weight is None:
+                treeAdded, treeRemoved = self._mst.remove_edge(u, v)
+            else:
+                treeAdded, treeRemoved = self._mst.add_edge(u, v, weight)
+
+            self._colorTree(treeRemoved, Qt.GlobalColor.black)
+            self._colorTree(treeAdded, self.COLOR)
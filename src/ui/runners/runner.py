@@ -0,0 +1,220 @@
+from collections import OrderedDict
+import threading
+import time
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class RunCancelled(Exception):
+    pass
+
+
+class ResultCache:
+    """
+    Keeps the most recently used results, dropping the least recently used once full.
+    """
+    def __init__(self, size):
+        self._size = size
+        self._results = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._results:
+            return default
+
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    def put(self, key, result):
+        self._results[key] = result
+        self._results.move_to_end(key)
+
+        while len(self._results) > self._size:
+            self._results.popitem(last=False)
+
+    def pop(self, key):
+        return self._results.pop(key, None)
+
+    def values(self):
+        return self._results.values()
+
+    def clear(self):
+        self._results.clear()
+
+
+class _WorkerSignals(QObject):
+    # QRunnable is not a QObject, so the worker emits through this instead
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+
+
+class _Worker(QRunnable):
+    # Emit progress at most this often so the GUI thread isn't flooded with events
+    PROGRESS_INTERVAL = 0.05
+
+    def __init__(self, job):
+        super().__init__()
+
+        self._job = job
+        self._cancelEvent = threading.Event()
+        self._lastReport = 0.0
+
+        self.signals = _WorkerSignals()
+
+    def cancel(self):
+        self._cancelEvent.set()
+
+    def report(self, fraction=None):
+        """
+        Handed to the algorithms as their progress callback. Doubles as the point
+        where a cancelled run is stopped, by raising out of the algorithm.
+        :param fraction: How much of the work is done, or None if that isn't known
+        """
+        if self._cancelEvent.is_set():
+            raise RunCancelled()
+
+        now = time.monotonic()
+        if now - self._lastReport >= self.PROGRESS_INTERVAL:
+            self._lastReport = now
+            self.signals.progress.emit(fraction)
+
+    def run(self):
+        try:
+            result = self._job(self.report)
+        except RunCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            if self._cancelEvent.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+
+class AlgorithmRunner(QObject):
+    """
+    Runs an algorithm on a snapshot of the graph in a background thread, so the window
+    stays responsive, then applies the result to the scene back on the GUI thread.
+
+    Subclasses implement compute, which runs in the background and must not touch any
+    graphics items, and apply, which receives compute's return value.
+
+    Results are kept for the graph's version and the run's arguments, so running again
+    before the graph is edited applies the earlier result without computing it again.
+    """
+    started = pyqtSignal(str)
+    progress = pyqtSignal(object)
+    # Emitted when a run ends for any reason, with an error message if it failed
+    stopped = pyqtSignal(str)
+
+    name = 'Algorithm'
+
+    # How many results are kept
+    CACHE_SIZE = 8
+    # Turned off by runners whose results depend on more than the graph and the arguments
+    cacheResults = True
+
+    def __init__(self, scene):
+        super().__init__()
+
+        self.scene = scene
+        self.graphScene = scene._graphScene
+
+        self._worker = None
+
+        self._results = ResultCache(self.CACHE_SIZE)
+        # What the running computation's result will be cached under
+        self._key = None
+
+    def snapshot(self):
+        """
+        Copy the graph the algorithm will run on. Called on the GUI thread, so the
+        copy can't change while the algorithm is running in the background.
+        """
+        return self.graphScene.graph.copy()
+
+    def cacheKey(self, *args):
+        """
+        :return: What the result of a run with these arguments on the graph as it is now is
+            cached under, or None if it isn't cached
+        """
+        if not self.cacheResults:
+            return None
+
+        return args, self.graphScene.version, self.graphScene.isDirected
+
+    def cachedResult(self, *args):
+        """
+        :return: A result of a run with these arguments that still holds for the graph as it
+            is now, or None to compute one
+        """
+        key = self.cacheKey(*args)
+        if key is None:
+            return None
+
+        return self._results.get(key)
+
+    def compute(self, graph, progress, *args):
+        raise NotImplementedError
+
+    def apply(self, result):
+        raise NotImplementedError
+
+    def isRunning(self) -> bool:
+        return self._worker is not None
+
+    def run(self):
+        self._start()
+
+    def _start(self, *args):
+        if self.isRunning():
+            return
+
+        self._key = self.cacheKey(*args)
+        result = self.cachedResult(*args)
+        if result is not None:
+            self.started.emit(self.name)
+            self._onFinished(result)
+            return
+
+        graph = self.snapshot()
+        if graph is None:
+            return
+
+        worker = _Worker(lambda progress: self.compute(graph, progress, *args))
+        worker.signals.progress.connect(self.progress)
+        worker.signals.finished.connect(self._onFinished)
+        worker.signals.failed.connect(self._onFailed)
+        worker.signals.cancelled.connect(self._onCancelled)
+        self._worker = worker
+
+        self.started.emit(self.name)
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def _onFinished(self, result):
+        self._worker = None
+
+        if self._key is not None:
+            self._results.put(self._key, result)
+            self._key = None
+
+        self.apply(result)
+
+        # apply may carry on asynchronously, in which case the subclass emits stopped itself
+        if not self.isRunning():
+            self.stopped.emit('')
+
+    def _onFailed(self, error):
+        self._worker = None
+
+        self.stopped.emit(f'{self.name} failed: {error}')
+
+    def _onCancelled(self):
+        self._worker = None
+
+        self.stopped.emit('')
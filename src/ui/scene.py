@@ -57,40 +57,44 @@ class Scene(QGraphicsScene):
             else:
                 v.unsetCursor()
 
-    def getItemUnderMouse(self, cls, itemList):
-        underMouse = filter(cls.isUnderMouse, itemList)
-
-        try:
-            return max(underMouse, key=lambda i: i.stamp)
-        except ValueError:
-            return None
+    def getItemUnderMouse(self, cls, pos):
+        """
+        Find the item at a position. Only the items sharing a grid cell with the position are
+        tested, and where several overlap the most recently created one wins.
+        :param cls: Vertex or Edge
+        :param pos: The position in scene coordinates, usually the scenePos of a mouse event
+        """
+        hits = (item for item in self._graphScene.itemsAt(pos)
+                if isinstance(item, cls) and item.contains(item.mapFromScene(pos)))
+
+        return max(hits, key=lambda i: i.stamp, default=None)
         
-    def getVertexUnderMouse(self):
-        return self.getItemUnderMouse(Vertex, self._graphScene.vertices)
+    def getVertexUnderMouse(self, pos):
+        return self.getItemUnderMouse(Vertex, pos)
     
     # Calling this removeItemFromScene because removeItem is reserved by PyQt
     def removeItemFromScene(self, cls, e):
         e.accept()
 
-        list = self._graphScene.vertices if cls == Vertex else self._graphScene.edges
-        toBeRemoved = self.getItemUnderMouse(cls, list)
+        toBeRemoved = self.getItemUnderMouse(cls, e.scenePos())
 
         if toBeRemoved is not None:
             toBeRemoved.remove()
 
     def mousePressEvent(self, e):
-        if self._resetColorOnClick:
+        # Highlights that follow edits are kept when the click is an edit
+        editing = self._isVertexMode or self._isEdgeMode
+        if self._resetColorOnClick and not (editing and self._graphScene.hasLiveHighlight()):
             self._graphScene.clearColors()
 
         if self._needBFSource:
-            v = self.getVertexUnderMouse()
-            if v is not None:
-                self._bellmanHook(v.label)
+            v = self.getVertexUnderMouse(e.scenePos())
+            self._bellmanHook(None if v is None else v.label)
 
             return None
 
         if self._isSelectMode:
-            if e.button() == Qt.MouseButton.LeftButton and self.getVertexUnderMouse() is None:
+            if e.button() == Qt.MouseButton.LeftButton and self.getVertexUnderMouse(e.scenePos()) is None:
                 if not e.modifiers() & Qt.KeyboardModifier.ControlModifier:
                     self.clearSelection() # Un-select selected vertices if CTRL isn't being held down
 
@@ -116,6 +120,8 @@ class Scene(QGraphicsScene):
             super().mouseReleaseEvent(e)
 
     def mouseMoveEvent(self, e):
+        self._graphScene.hoverAt(e.scenePos())
+
         if False and self._dragging: # disable dragging because incredibly scuffed
             # How much mouse has moved since last time
             d = e.scenePos() - self._dragMousePos
@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# The GUI is imported with src as the root, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import networkx as nx
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import QApplication
+
+from algorithms.bellman import bellman_ford
+from ui.runners.bellman_ford_runner import BellmanFordRunner
+from ui.scene import Scene
+
+
+class TestBellmanFordRunner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+        # Many pairs of vertices joined both ways by edges of different weights
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(30))
+        for u in range(30):
+            for v in range(30):
+                if u != v and self.rng.random() < 0.15:
+                    graph.add_edge(u, v, weight=self.rng.randint(1, 20))
+
+        self.scene = Scene(0, 0, 2000, 2000, None)
+        self.graphScene = self.scene._graphScene
+        self.graphScene.importGraph(graph)
+        self.graphScene.setGraphType(False)
+
+        self.runner = BellmanFordRunner(self.scene)
+
+    def run_runner(self, source):
+        self.runner.run(source)
+        while self.runner.isRunning():
+            QThreadPool.globalInstance().waitForDone(10)
+            self.app.processEvents()
+
+    def check_trees(self):
+        # An undirected edge goes either way, unless one was drawn the other way too
+        expected = nx.DiGraph()
+        expected.add_nodes_from(vertex.label for vertex in self.graphScene.vertices)
+        for edge in self.graphScene.edges:
+            u, v = edge.pair
+            reverse = self.graphScene.edge(v, u)
+            expected.add_edge(u, v, weight=edge.weight)
+            expected.add_edge(v, u, weight=edge.weight if reverse is None else reverse.weight)
+
+        for source in (0, 1):
+            tree = self.runner._trees.get(source)
+            distance, _ = tree.result(self.runner._graph)
+            self.assertEqual(distance, bellman_ford(expected, source)[0])
+
+    def test_opposite_edges(self):
+        self.run_runner(0)
+        self.run_runner(1)
+        self.check_trees()
+
+        for _ in range(40):
+            self.rng.choice(list(self.graphScene.edges)).remove()
+            self.check_trees()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import math
+import random
+import unittest
+
+from hit_grid import HitGrid
+
+
+def in_rect(x, y, rect):
+    left, top, right, bottom = rect
+    return left <= x <= right and top <= y <= bottom
+
+
+def near_segment(x, y, segment):
+    x1, y1, x2, y2, pad = segment
+    dx, dy = x2 - x1, y2 - y1
+
+    t = min(max(((x - x1) * dx + (y - y1) * dy) / max(dx * dx + dy * dy, 1e-12), 0), 1)
+    return math.hypot(x1 + t * dx - x, y1 + t * dy - y) <= pad
+
+
+class TestHitGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = HitGrid(cellSize=50)
+        self.rng = random.Random(0)
+
+        self.rects = {}
+        self.segments = {}
+
+    def random_point(self, spread=1000):
+        return self.rng.uniform(-spread, spread), self.rng.uniform(-spread, spread)
+
+    def add_rect(self, item):
+        x, y = self.random_point()
+        rect = (x, y, x + self.rng.uniform(0, 120), y + self.rng.uniform(0, 120))
+        self.rects[item] = rect
+        self.grid.insertRect(item, *rect)
+
+    def add_segment(self, item, long=False):
+        x1, y1 = self.random_point()
+        if long:
+            # Longer than LONG_SEGMENT_CELLS cells, so kept out of the cells
+            angle = self.rng.uniform(0, 2 * math.pi)
+            length = self.rng.uniform(1.2, 3) * HitGrid.LONG_SEGMENT_CELLS * 50
+            x2, y2 = x1 + length * math.cos(angle), y1 + length * math.sin(angle)
+        else:
+            x2, y2 = x1 + self.rng.uniform(-150, 150), y1 + self.rng.uniform(-150, 150)
+
+        segment = (x1, y1, x2, y2, self.rng.uniform(1, 10))
+        self.segments[item] = segment
+        self.grid.insertSegment(item, *segment)
+
+    def hit(self, x, y):
+        return ({item for item, rect in self.rects.items() if in_rect(x, y, rect)}
+                | {item for item, segment in self.segments.items() if near_segment(x, y, segment)})
+
+    def check_points(self, points):
+        for x, y in points:
+            self.assertLessEqual(self.hit(x, y), self.grid.itemsAt(x, y), (x, y))
+
+    def points_on_items(self):
+        # Points inside the rects and within the pad of the segments, as random points rarely hit anything
+        points = []
+        for left, top, right, bottom in self.rects.values():
+            points.append((self.rng.uniform(left, right), self.rng.uniform(top, bottom)))
+        for x1, y1, x2, y2, pad in self.segments.values():
+            t = self.rng.random()
+            angle = self.rng.uniform(0, 2 * math.pi)
+            r = self.rng.uniform(0, pad)
+            points.append((x1 + t * (x2 - x1) + r * math.cos(angle), y1 + t * (y2 - y1) + r * math.sin(angle)))
+
+        return points
+
+    def test_superset(self):
+        for i in range(100):
+            self.add_rect(('rect', i))
+            self.add_segment(('short', i))
+        for i in range(20):
+            self.add_segment(('long', i), long=True)
+
+        points = self.points_on_items()
+        self.assertTrue(all(len(self.hit(x, y)) > 0 for x, y in points))
+
+        self.check_points(points)
+        self.check_points(self.random_point() for _ in range(500))
+
+    def test_long_segments(self):
+        self.add_segment('long', long=True)
+        x1, y1, x2, y2, pad = self.segments['long']
+
+        self.assertEqual(self.grid.itemsAt((x1 + x2) / 2, (y1 + y2) / 2), {'long'})
+        # Well away from the segment, beyond its end
+        self.assertEqual(self.grid.itemsAt(x2 + (x2 - x1), y2 + (y2 - y1)), set())
+
+    def test_remove_and_reinsert(self):
+        for i in range(30):
+            self.add_rect(('rect', i))
+            self.add_segment(('short', i))
+            self.add_segment(('long', i), long=True)
+
+        points = self.points_on_items()
+
+        removed = set(list(self.rects)[::2] + list(self.segments)[::2])
+        for item in removed:
+            self.grid.remove(item)
+            self.rects.pop(item, None)
+            self.segments.pop(item, None)
+
+        for x, y in points:
+            self.assertFalse(self.grid.itemsAt(x, y) & removed)
+        self.check_points(points)
+
+        # Put back somewhere else, short segments becoming long and the other way around
+        for i in range(30):
+            self.add_rect(('rect', i))
+            self.add_segment(('short', i), long=True)
+            self.add_segment(('long', i))
+
+        self.check_points(self.points_on_items())
+        self.check_points(points)
+
+    def test_move(self):
+        self.grid.insertRect('item', 0, 0, 10, 10)
+        self.grid.insertRect('item', 500, 500, 510, 510)
+
+        self.assertEqual(self.grid.itemsAt(5, 5), set())
+        self.assertEqual(self.grid.itemsAt(505, 505), {'item'})
+
+    def test_clear(self):
+        self.add_rect('rect')
+        self.add_segment('long', long=True)
+        self.grid.clear()
+
+        left, top, _, _ = self.rects['rect']
+        x1, y1, x2, y2, _ = self.segments['long']
+        self.assertEqual(self.grid.itemsAt(left, top), set())
+        self.assertEqual(self.grid.itemsAt((x1 + x2) / 2, (y1 + y2) / 2), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import random
+import sys
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# The GUI is imported with src as the root, as main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import networkx as nx
+from PyQt6.QtCore import QThreadPool, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication
+
+from ui.edge import validateWeight
+from ui.runners.prims_runner import PrimsRunner
+from ui.scene import Scene
+
+
+class _Click:
+    # Stands in for the mouse event GraphScene.addEdge is called with
+    def __init__(self, pos):
+        self._pos = pos
+
+    def scenePos(self):
+        return self._pos
+
+    def accept(self):
+        pass
+
+
+class TestPrimsRunner(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+        # Directed, with many pairs of vertices joined both ways by edges of different weights
+        graph = nx.DiGraph()
+        graph.add_nodes_from(range(30))
+        for u in range(30):
+            for v in range(30):
+                if u != v and self.rng.random() < 0.15:
+                    graph.add_edge(u, v, weight=self.rng.randint(1, 20))
+
+        self.scene = Scene(0, 0, 2000, 2000, None)
+        self.graphScene = self.scene._graphScene
+        self.graphScene.importGraph(graph)
+
+        self.runner = PrimsRunner(self.scene)
+
+    def run_runner(self):
+        self.runner.run()
+        while self.runner.isRunning():
+            QThreadPool.globalInstance().waitForDone(10)
+            self.app.processEvents()
+
+    def check_tree(self):
+        # Edges drawn both ways between two vertices are one edge, as light as the lighter
+        expected = nx.Graph()
+        expected.add_nodes_from(vertex.label for vertex in self.graphScene.vertices)
+        for edge in self.graphScene.edges:
+            u, v = edge.pair
+            if not expected.has_edge(u, v) or edge.weight < expected.edges[u, v]['weight']:
+                expected.add_edge(u, v, weight=edge.weight)
+
+        tree = {frozenset(edge.pair) for edge in self.graphScene.edges
+                if QColor(edge.color) == QColor(PrimsRunner.COLOR)}
+        weight = sum(expected.edges[tuple(pair)]['weight'] for pair in tree)
+
+        spanning = nx.minimum_spanning_tree(expected)
+        self.assertEqual(len(tree), spanning.number_of_edges())
+        self.assertEqual(weight, spanning.size(weight='weight'))
+
+    def add_edge(self, origin, link, weight):
+        validateWeight(str(weight))
+        for label in (origin, link):
+            self.graphScene.addEdge(_Click(self.graphScene.vertex(label).sceneBoundingRect().center()))
+
+    def test_opposite_edges(self):
+        self.assertTrue(any(self.graphScene.edge(v, u) is not None for u, v in
+                            (edge.pair for edge in self.graphScene.edges)))
+
+        self.run_runner()
+        self.check_tree()
+
+    def test_edits(self):
+        self.run_runner()
+
+        labels = [vertex.label for vertex in self.graphScene.vertices]
+        for _ in range(60):
+            if self.rng.random() < 0.5:
+                self.rng.choice(list(self.graphScene.edges)).remove()
+            else:
+                u, v = self.rng.sample(labels, 2)
+                if self.graphScene.edge(u, v) is None:
+                    self.add_edge(u, v, self.rng.randint(1, 20))
+
+            self.check_tree()
+
+    def test_edits_while_running(self):
+        self.runner.run()
+        for edge in list(self.graphScene.edges)[:10]:
+            edge.remove()
+
+        while self.runner.isRunning():
+            QThreadPool.globalInstance().waitForDone(10)
+            self.app.processEvents()
+
+        self.check_tree()
+
+
+if __name__ == '__main__':
+    unittest.main()
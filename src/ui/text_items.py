@@ -1,6 +1,10 @@
 import math
 from PyQt6.QtCore import QPointF
-from PyQt6.QtWidgets import QGraphicsSimpleTextItem
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsSimpleTextItem
+
+
+# Text shorter than this many pixels on screen is unreadable, so it isn't drawn at all
+MIN_TEXT_HEIGHT = 6
 
 
 class TextItems(QGraphicsSimpleTextItem):
@@ -10,6 +14,16 @@ class TextItems(QGraphicsSimpleTextItem):
 
         self.setPos(self.determinePosition())
 
+        # The text never changes, so it is rendered once per zoom level and then blitted
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+    def paint(self, painter, option, widget):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if self.boundingRect().height() * lod < MIN_TEXT_HEIGHT:
+            return
+
+        super().paint(painter, option, widget)
+
     def determinePosition(self) -> QPointF:
         # By default, pos would be the top-left corner
         # of the textbox, so it needs to be corrected.
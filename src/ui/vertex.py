@@ -1,6 +1,6 @@
 import math
 from PyQt6.QtCore import Qt, QPointF
-from PyQt6.QtWidgets import QGraphicsEllipseItem
+from PyQt6.QtWidgets import QGraphicsEllipseItem, QGraphicsItem
 from PyQt6.QtGui import QBrush, QPen
 
 from ui.text_items import TextItems
@@ -23,7 +23,10 @@ class Vertex(QGraphicsEllipseItem):
         cx = x - d/2
         cy = y - d/2
 
-        self._edges = []
+        # Used as an insertion ordered set, so edges can be removed in constant time
+        self._edges = {}
+        # The vertices at the other end of the edges leaving this one
+        self._outNeighbors = set()
 
         super().__init__(cx, cy, d, d)
 
@@ -47,6 +50,9 @@ class Vertex(QGraphicsEllipseItem):
 
         self.setPen(self._circlePen)
         self.setBrush(self._circleBrush)
+
+        # Needed for itemChange to hear about moves
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
     
     @property
     def outerColor(self) -> Qt.GlobalColor:
@@ -101,11 +107,16 @@ class Vertex(QGraphicsEllipseItem):
         return QPointF(self.x - xOffs, self.y - yOffs)
 
     def addEdge(self, edge):
-        self._edges.append(edge)
+        self._edges[edge] = None
+
+        if edge._originVertex is self:
+            self._outNeighbors.add(edge._linkVertex)
+
+    def removeEdge(self, edge):
+        self._edges.pop(edge, None)
 
-    def updateEdges(self):
-        for edge in self._edges:
-            edge.updatePosition()
+        if edge._originVertex is self:
+            self._outNeighbors.discard(edge._linkVertex)
 
     def isSelectable(self) -> Qt.CursorShape:
         return self.cursor() == Vertex.CUR_SELECTABLE
@@ -114,15 +125,8 @@ class Vertex(QGraphicsEllipseItem):
         return self.cursor() == Vertex.CUR_DRAG
 
     def remove(self):
-        group = self.parentItem()
-
-        self.scene().removeItem(self)
-        group.removeFromGroup(self)
-
-        for edge in self._edges:
-            # need to specify that this object is removing the edge
-            # so this edge list isn't modified
-            edge.remove(False, self)
+        # Takes the vertex's edges with it
+        self.parentItem().removeMany([self])
 
     def mousePressEvent(self, e):
         if (self.isSelectable() and
@@ -134,10 +138,15 @@ class Vertex(QGraphicsEllipseItem):
         else:
             e.ignore()
 
-    def mouseMoveEvent(self, e):
-        super().mouseMoveEvent(e)
+    def itemChange(self, change, value):
+        # However the vertex was moved (dragged on its own or as part of a selection, or placed
+        # by a layout), let the graph know so the edges follow
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            group = self.parentItem()
+            if group is not None:
+                group.vertexMoved(self)
 
-        self.scene()._graphScene.verticesMoved()
+        return super().itemChange(change, value)
 
     def mouseReleaseEvent(self, e):
         if (self.isDrag() and  # If currently dragging in select mode
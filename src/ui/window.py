@@ -11,11 +11,15 @@ from PyQt6.QtWidgets import (
     QWidget,
     QLineEdit,
     QCheckBox,
+    QLabel,
+    QProgressBar,
     QPushButton,
 )
 
 from ui.graphgen import GraphGenPopup
 from ui.runalg import RunAlgPopup
+from ui.runners.graph_gen_runner import GraphGenRunner
+from ui.runners.layout_runner import LayoutRunner
 from ui.scene import Scene
 from ui.edge import validateWeight
 
@@ -33,7 +37,9 @@ class Window(QWidget):
         vbox = QVBoxLayout()
 
         self.initRunAlgButton(vbox)
+        self.initRunnerStatus(vbox)
         self.initGraphGenButton(vbox)
+        self.initRelayoutButton(vbox)
         self.initGraphTypeButtons(vbox)
         self.initStateButtons(vbox)
 
@@ -69,6 +75,17 @@ class Window(QWidget):
         self.graph_gen_button.clicked.connect(self.showGraphGenPopup)
         vbox.addWidget(self.graph_gen_button)
 
+        self.graph_gen_runner = GraphGenRunner(self.scene)
+        self.trackRunner(self.graph_gen_runner)
+
+    def initRelayoutButton(self, vbox):
+        self.relayout_button = QPushButton("Re-layout")
+        vbox.addWidget(self.relayout_button)
+
+        self.relayout_runner = LayoutRunner(self.scene)
+        self.relayout_button.clicked.connect(self.relayout_runner.run)
+        self.trackRunner(self.relayout_runner)
+
     def showGraphGenPopup(self):
         self.graph_gen_popup = GraphGenPopup(self)
         if self.graph_gen_popup.exec_():
@@ -84,6 +101,59 @@ class Window(QWidget):
         if self.run_alg_popup.exec_():
             print("Running Algorithm!")
     
+    def initRunnerStatus(self, vbox):
+        self.runner_label = QLabel()
+        self.runner_label.setWordWrap(True)
+        self.runner_label.setVisible(False)
+        vbox.addWidget(self.runner_label)
+
+        self.runner_progress = QProgressBar()
+        self.runner_progress.setVisible(False)
+        vbox.addWidget(self.runner_progress)
+
+        self.runner_cancel = QPushButton("Cancel")
+        self.runner_cancel.setVisible(False)
+        self.runner_cancel.clicked.connect(self.cancelRunner)
+        vbox.addWidget(self.runner_cancel)
+
+        self._activeRunner = None
+
+    def trackRunner(self, runner):
+        runner.started.connect(lambda name: self.runnerStarted(runner, name))
+        runner.progress.connect(self.runnerProgress)
+        runner.stopped.connect(self.runnerStopped)
+
+    def runnerStarted(self, runner, name):
+        self._activeRunner = runner
+
+        self.runner_label.setText(f"Running {name}...")
+        self.runner_label.setVisible(True)
+        # Busy indicator until the first progress report says otherwise
+        self.runner_progress.setRange(0, 0)
+        self.runner_progress.setVisible(True)
+        self.runner_cancel.setVisible(True)
+
+    def runnerProgress(self, fraction):
+        if fraction is None:
+            self.runner_progress.setRange(0, 0)
+        else:
+            self.runner_progress.setRange(0, 100)
+            self.runner_progress.setValue(int(fraction * 100))
+
+    def runnerStopped(self, error):
+        self._activeRunner = None
+
+        self.runner_progress.setVisible(False)
+        self.runner_cancel.setVisible(False)
+
+        # Leave errors on screen, otherwise hide the status entirely
+        self.runner_label.setText(error)
+        self.runner_label.setVisible(len(error) > 0)
+
+    def cancelRunner(self):
+        if self._activeRunner is not None:
+            self._activeRunner.cancel()
+
     def initGraphTypeButtons(self, vbox):
         vbox_top = QVBoxLayout()
 
@@ -91,7 +161,7 @@ class Window(QWidget):
 
         vbox_top.addWidget(self.directed_toggle)
 
-        self.directed_toggle.setChecked(True)  # Default to undirected mode
+        self.directed_toggle.setChecked(self.scene._graphScene.isDirected)
 
         self.directed_toggle.clicked.connect(self.confirmGraphType)
 